@@ -1,8 +1,12 @@
 """xivapy, an async Python client for XIVAPI for Final Fantasy XIV."""
 
-from xivapy.client import Client, SearchResult
-from xivapy.query import Query, QueryBuilder, Group
+from xivapy.client import Client, RowDiff, SearchResult
+from xivapy.query import Query, QueryBuilder, Group, CompiledQuery
 from xivapy.model import QueryField, FieldMapping, Model
+from xivapy.cache import Cache, MemoryCache, SQLiteCache, AssetCache
+from xivapy.local import LocalSheet
+from xivapy.mirror import SheetMirror, SyncResult
+from xivapy.table import SheetTable, TableRow
 
 # TODO: maybe scope this so people can xivapi.types.Format?
 # For now the api surface is small, so we don't have conflicts anyway
@@ -12,12 +16,23 @@ import xivapy.exceptions as exceptions
 __all__ = [
     'Client',
     'SearchResult',
+    'RowDiff',
     'Query',
     'QueryBuilder',
     'Group',
+    'CompiledQuery',
     'QueryField',
     'FieldMapping',
     'Model',
+    'Cache',
+    'MemoryCache',
+    'SQLiteCache',
+    'AssetCache',
+    'LocalSheet',
+    'SheetMirror',
+    'SyncResult',
+    'SheetTable',
+    'TableRow',
     'LangDict',
     'Format',
     'exceptions',
@@ -0,0 +1,448 @@
+"""Caches for xivapi responses."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, Optional
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import tempfile
+import time
+
+__all__ = [
+    'Cache',
+    'MemoryCache',
+    'SQLiteCache',
+    'AssetCache',
+]
+
+# Where a cache keeps the game versions it was last checked against, for caches
+# that don't keep them anywhere else; untagged, so invalidating a version never
+# drops it
+_VERSIONS_KEY = 'xivapy:versions'
+
+
+class Cache(ABC):
+    """Interface for storing raw xivapi response bodies.
+
+    Entries are raw response bytes keyed by a string that describes the request
+    (endpoint, version, schema, fields, rows, etc). Every entry carries a tag
+    (the game version it was fetched for) so that all entries for a version can
+    be dropped at once, and may carry a time-to-live.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached value for key, or None if missing or expired."""
+
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        ttl: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Stores a value.
+
+        Args:
+            key: The key to store the value under
+            value: The raw bytes to store
+            ttl: Seconds until the entry expires; None never expires
+            tag: A tag (usually the game version) that can be invalidated later
+        """
+
+    @abstractmethod
+    def invalidate(self, tag: str) -> None:
+        """Removes every entry stored with the given tag."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every entry."""
+
+    def seen_versions(self) -> Optional[list[str]]:
+        """Returns the game versions the cache was last checked against, if ever.
+
+        The client compares these with the versions xivapi reports, and drops
+        `latest` entries when a new one appears. By default they're stored as an
+        untagged entry of the cache itself; caches that evict entries on their own
+        should keep them somewhere they won't be evicted from.
+        """
+        stored = self.get(_VERSIONS_KEY)
+        return json.loads(stored) if stored is not None else None
+
+    def see_versions(self, names: list[str]) -> None:
+        """Records the game versions the cache was last checked against."""
+        self.set(_VERSIONS_KEY, json.dumps(names).encode())
+
+
+@dataclass
+class _MemoryEntry:
+    value: bytes
+    expires: Optional[float]
+    tag: Optional[str]
+
+
+class MemoryCache(Cache):
+    """An in-memory least-recently-used cache.
+
+    Args:
+        max_entries: The most entries to hold before evicting the least recently used
+        max_bytes: The most bytes of values to hold before evicting the least recently used
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """Initializes an empty MemoryCache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._size = 0
+        # Kept apart from the entries, so evicting them can't forget the versions
+        self._versions: Optional[list[str]] = None
+
+    def __len__(self) -> int:
+        """Returns the number of entries held (including any not yet purged as expired)."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        ttl: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Stores a value, evicting least recently used entries to stay in bounds."""
+        if key in self._entries:
+            self._remove(key)
+        if len(value) > self.max_bytes:
+            return
+
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _MemoryEntry(value, expires, tag)
+        self._size += len(value)
+
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tag: str) -> None:
+        """Removes every entry stored with the given tag."""
+        for key in [key for key, entry in self._entries.items() if entry.tag == tag]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._entries.clear()
+        self._size = 0
+
+    def seen_versions(self) -> Optional[list[str]]:
+        """Returns the game versions the cache was last checked against, if ever."""
+        return self._versions
+
+    def see_versions(self, names: list[str]) -> None:
+        """Records the game versions the cache was last checked against."""
+        self._versions = list(names)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= len(entry.value)
+
+
+class SQLiteCache(Cache):
+    """A persistent cache stored in a SQLite database.
+
+    Reads and writes are synchronous, but are small enough in practice not to
+    matter next to the network requests they save.
+
+    Args:
+        path: Path to the database file; created if it doesn't exist
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Opens (or creates) the cache database."""
+        self.path = Path(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, tag TEXT)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_tag ON responses(tag)')
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached value for key, or None if missing or expired."""
+        row = self._db.execute(
+            'SELECT value, expires FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        # wall-clock time, since entries outlive the process
+        if expires is not None and expires <= time.time():
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._db.commit()
+            return None
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        ttl: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Stores a value."""
+        expires = time.time() + ttl if ttl is not None else None
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses (key, value, expires, tag) VALUES (?, ?, ?, ?)',
+            (key, value, expires, tag),
+        )
+        self._db.commit()
+
+    def invalidate(self, tag: str) -> None:
+        """Removes every entry stored with the given tag."""
+        self._db.execute('DELETE FROM responses WHERE tag = ?', (tag,))
+        self._db.commit()
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._db.execute('DELETE FROM responses')
+        self._db.commit()
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        self._db.close()
+
+
+class AssetCache:
+    """A persistent, size-bounded cache for assets (icons, maps, etc) on disk.
+
+    Asset files are stored by the sha256 of their contents, so identical images
+    fetched under different paths or versions are only stored once. An index in
+    a SQLite database maps each asset key to its file and tracks when it was last
+    used, and the least recently used assets are evicted when the cache grows past
+    `max_bytes`. When an asset was last used is written to the index along with
+    the next write (or on close), rather than on every read.
+
+    Args:
+        directory: Where to store assets; created if it doesn't exist
+        max_bytes: The most bytes of asset files to keep on disk
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 1024 * 1024 * 1024):
+        """Opens (or creates) the asset cache in `directory`."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        (self.directory / 'objects').mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.directory / 'index.db')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS assets ('
+            'key TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, '
+            'accessed REAL NOT NULL, tag TEXT)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS assets_digest ON assets(digest)')
+        # The game versions last seen by a client using the cache
+        self._db.execute('CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY)')
+        self._db.commit()
+        # When keys were read since the index was last written to
+        self._accessed: dict[str, float] = {}
+
+    @staticmethod
+    def key(path: str, format: str, version: str) -> str:
+        """Builds the cache key for an asset path in a given format and game version."""
+        return f'{path}|{format}|{version}'
+
+    def path(self, key: str) -> Optional[Path]:
+        """Returns the file holding the asset for key, or None if it isn't cached."""
+        row = self._db.execute(
+            'SELECT digest FROM assets WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        file = self._object_path(row[0])
+        if not file.exists():
+            # Removed from under us; forget about it
+            self._db.execute('DELETE FROM assets WHERE key = ?', (key,))
+            self._db.commit()
+            self._accessed.pop(key, None)
+            return None
+        self._accessed[key] = time.time()
+        return file
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the contents of the asset for key, or None if it isn't cached."""
+        file = self.path(key)
+        return file.read_bytes() if file is not None else None
+
+    def mmap(self, key: str) -> Optional[mmap.mmap]:
+        """Returns a read-only memory map of the asset for key, or None if it isn't cached."""
+        file = self.path(key)
+        if file is None:
+            return None
+        with open(file, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    async def write(
+        self, key: str, chunks: AsyncIterable[bytes], *, tag: Optional[str] = None
+    ) -> Path:
+        """Streams an asset to disk and records it under key.
+
+        Args:
+            key: The key to store the asset under
+            chunks: The asset's contents, as they arrive
+            tag: A tag (usually the game version) that can be invalidated later
+
+        Returns:
+            The path of the stored asset file.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            file = self._object_path(digest.hexdigest())
+            if file.exists():
+                # Same contents as something we already have
+                os.unlink(temp_name)
+            else:
+                file.parent.mkdir(exist_ok=True)
+                os.replace(temp_name, file)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+            raise
+
+        previous = self._db.execute(
+            'SELECT digest FROM assets WHERE key = ?', (key,)
+        ).fetchone()
+        self._accessed.pop(key, None)
+        self._write_accessed()
+        self._db.execute(
+            'INSERT OR REPLACE INTO assets (key, digest, size, accessed, tag) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (key, digest.hexdigest(), size, time.time(), tag),
+        )
+        self._db.commit()
+        if previous is not None and previous[0] != digest.hexdigest():
+            # The key used to point at other contents, which may now be orphaned
+            self._release(previous[0])
+        self._evict(keep=key)
+        return file
+
+    def size(self) -> int:
+        """Returns the total bytes of asset files stored."""
+        row = self._db.execute(
+            'SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM assets)'
+        ).fetchone()
+        return row[0] or 0
+
+    def invalidate(self, tag: str) -> None:
+        """Removes every asset stored with the given tag."""
+        self._db.execute('DELETE FROM assets WHERE tag = ?', (tag,))
+        self._db.commit()
+        self._remove_unreferenced()
+
+    def clear(self) -> None:
+        """Removes every asset."""
+        self._db.execute('DELETE FROM assets')
+        self._db.commit()
+        self._remove_unreferenced()
+
+    def close(self) -> None:
+        """Closes the underlying index database."""
+        self._write_accessed()
+        self._db.commit()
+        self._db.close()
+
+    def seen_versions(self) -> Optional[list[str]]:
+        """Returns the game versions the cache was last checked against, if ever."""
+        names = [name for (name,) in self._db.execute('SELECT name FROM versions')]
+        return names or None
+
+    def _write_accessed(self) -> None:
+        """Writes when keys were last read to the index, leaving the commit to the caller."""
+        if self._accessed:
+            self._db.executemany(
+                'UPDATE assets SET accessed = ? WHERE key = ?',
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def see_versions(self, names: list[str]) -> None:
+        """Records the game versions the cache was last checked against."""
+        self._db.execute('DELETE FROM versions')
+        self._db.executemany(
+            'INSERT OR IGNORE INTO versions (name) VALUES (?)',
+            [(name,) for name in names],
+        )
+        self._db.commit()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.directory / 'objects' / digest[:2] / digest
+
+    def _evict(self, keep: str) -> None:
+        """Drops least recently used assets (other than `keep`) until we're within max_bytes."""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        # A file's bytes are only freed once the last key pointing to it is dropped
+        references = dict(
+            self._db.execute('SELECT digest, COUNT(*) FROM assets GROUP BY digest')
+        )
+        dropped: list[tuple[str]] = []
+        released: list[str] = []
+        for key, digest, size in self._db.execute(
+            'SELECT key, digest, size FROM assets WHERE key != ? ORDER BY accessed',
+            (keep,),
+        ):
+            dropped.append((key,))
+            references[digest] -= 1
+            if references[digest] == 0:
+                released.append(digest)
+                excess -= size
+                if excess <= 0:
+                    break
+        self._db.executemany('DELETE FROM assets WHERE key = ?', dropped)
+        self._db.commit()
+        for digest in released:
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def _release(self, digest: str) -> None:
+        """Deletes the file for digest if no key points to it anymore."""
+        row = self._db.execute(
+            'SELECT 1 FROM assets WHERE digest = ? LIMIT 1', (digest,)
+        ).fetchone()
+        if row is None:
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def _remove_unreferenced(self) -> None:
+        """Deletes asset files that no key points to anymore."""
+        referenced = {
+            digest for (digest,) in self._db.execute('SELECT digest FROM assets')
+        }
+        for file in (self.directory / 'objects').glob('*/*'):
+            if file.name not in referenced:
+                file.unlink(missing_ok=True)
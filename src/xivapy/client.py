@@ -2,24 +2,46 @@
 
 from __future__ import annotations
 
-from typing import AsyncIterable, Any, Self, Coroutine, cast, Sequence
+from typing import AsyncGenerator, AsyncIterable, Any, Self, Coroutine, cast, Sequence
+from typing import Awaitable, Callable
 from collections.abc import Iterable
-from typing import Optional, AsyncIterator, overload
+from typing import Optional, AsyncIterator, Iterator, TYPE_CHECKING, overload
 from itertools import batched
+from collections import deque
+from contextlib import aclosing, nullcontext
+from functools import partial
 from dataclasses import dataclass
+from pathlib import Path
 from re import match
+from urllib.parse import urlencode
+from weakref import WeakValueDictionary
+import asyncio
+import json
 
 import httpx
 from aiostream.stream import chunks
 from pydantic import ValidationError
 
+from xivapy.cache import AssetCache, Cache
+from xivapy.concurrency import (
+    BatchLoader,
+    SingleFlight,
+    buffered,
+    merge,
+    merge_sorted,
+    windowed,
+)
 from xivapy.model import Model
 from xivapy.query import QueryBuilder
-from xivapy.types import Format
+from xivapy.streaming import JSONArrayStream
+from xivapy.types import DiffKind, Format, ValidationMode
 from xivapy.exceptions import XIVAPIHTTPError, ModelValidationError
 from xivapy.version import VERSION
 
-__all__ = ['Client', 'SearchResult']
+if TYPE_CHECKING:
+    from xivapy.table import SheetTable
+
+__all__ = ['Client', 'SearchResult', 'RowDiff']
 
 
 @dataclass
@@ -32,6 +54,216 @@ class SearchResult[T]:
     data: T
 
 
+@dataclass
+class RowDiff[T]:
+    """Returned as part of using `xivapy.Client`'s diff() method.
+
+    `before` is None for added rows and `after` is None for removed rows. For
+    changed rows, `changes` maps each model field that differs to its (before,
+    after) values; it's empty for added and removed rows. `subrow_id` is only set
+    for sheets with subrows, where each subrow is compared on its own.
+    """
+
+    row_id: int
+    kind: DiffKind
+    before: Optional[T]
+    after: Optional[T]
+    changes: dict[str, tuple[Any, Any]]
+    subrow_id: Optional[int] = None
+
+
+# How many pages per connection an ordered, partitioned dump may fetch ahead of
+# the partition being read
+_ORDERED_PAGES_AHEAD = 16
+
+# The most requests a partitioned dump makes, one after another, to find the
+# sheet's row id range before fetching any rows
+_PARTITION_PROBES = 10
+
+
+def _row_key(data: dict) -> tuple[int, int]:
+    """Returns the (row id, subrow id) a row is ordered by; rows without subrows use 0."""
+    return data['row_id'], data.get('subrow_id', 0)
+
+
+def _search_page_params(
+    search_params: dict, cursor: Optional[str], remaining: Optional[int]
+) -> dict:
+    """Returns the request parameters for the next page of a search."""
+    params = search_params.copy()
+    if cursor:
+        params['cursor'] = cursor
+        params.pop('query', None)
+    if remaining is not None:
+        # Don't have the API send more than we're going to use
+        params['limit'] = remaining
+    return params
+
+
+def _read_raw_search_page(content: bytes) -> tuple[list[dict], None, Optional[str]]:
+    """Reads a page of search results as raw dicts, with the cursor for the next page."""
+    data = json.loads(content)
+    results = [
+        result for result in data.get('results', []) if result and 'row_id' in result
+    ]
+    return results, None, data.get('next')
+
+
+def _row_reader(
+    pages: AsyncIterator[list[dict]],
+) -> Callable[[], Awaitable[Optional[dict]]]:
+    """Returns a function reading rows one at a time from pages of rows, or None at the end."""
+    rows: deque[dict] = deque()
+
+    async def read() -> Optional[dict]:
+        while not rows:
+            page = await anext(pages, None)
+            if page is None:
+                return None
+            rows.extend(page)
+        return rows.popleft()
+
+    return read
+
+
+def _pack_pages(pages: list[bytes]) -> bytes:
+    """Packs several response bodies into one cache entry."""
+    return b''.join(b'%d\n%s' % (len(page), page) for page in pages)
+
+
+def _unpack_pages(packed: bytes) -> list[bytes]:
+    """Unpacks response bodies stored by _pack_pages."""
+    pages = []
+    position = 0
+    while position < len(packed):
+        newline = packed.index(b'\n', position)
+        start = newline + 1
+        end = start + int(packed[position:newline])
+        pages.append(packed[start:end])
+        position = end
+    return pages
+
+
+def _check_concurrency(concurrency: Optional[int]) -> None:
+    """Raises ValueError for a concurrency that can't be used; None means the default."""
+    if concurrency is not None and concurrency < 1:
+        raise ValueError(f'concurrency must be at least 1, got {concurrency}')
+
+
+def _canonical_query(query: QueryBuilder | str) -> str:
+    """Returns a query string that's the same for equivalent queries.
+
+    QueryBuilder queries use their canonical form; plain strings are taken as they are.
+    """
+    if isinstance(query, QueryBuilder):
+        return query.canonical()
+    return str(query).strip()
+
+
+class _RowValidator:
+    """Turns flattened row data into models, according to a validation mode.
+
+    * 'full' validates every row with pydantic
+    * 'trusted' builds every row without validation (see Model._construct_from_xivapi)
+    * 'sample' validates every `sample_every`th row (starting with the first),
+      building the rest without validation
+    """
+
+    def __init__(self, mode: ValidationMode = 'full', sample_every: int = 100) -> None:
+        if mode not in ('full', 'trusted', 'sample'):
+            raise ValueError(
+                f"validate must be one of 'full', 'trusted' or 'sample', got {mode!r}"
+            )
+        if sample_every < 1:
+            raise ValueError(f'sample_every must be at least 1, got {sample_every}')
+        self.mode = mode
+        self.sample_every = sample_every
+        self._count = 0
+
+    def __call__[T: Model](self, model_class: type[T], data: dict) -> T:
+        index = self._count
+        self._count += 1
+        if self.mode == 'trusted' or (
+            self.mode == 'sample' and index % self.sample_every
+        ):
+            return model_class._construct_from_xivapi(data)
+
+        try:
+            return model_class.model_validate(data)
+        except ValidationError as e:
+            raise ModelValidationError(model_class, e, data)
+
+    def page[T: Model](
+        self, model_class: type[T], rows: list[dict]
+    ) -> tuple[list[T], Optional[ModelValidationError]]:
+        """Turns a page of rows into models.
+
+        In full mode the whole page is validated in one call. Rather than raising,
+        a row that fails is returned as an error alongside the models for every row
+        before it, so callers can hand those out before raising.
+        """
+        if self.mode != 'full':
+            # Build the whole page without validation in one go, then swap in fully
+            # validated models for the sampled rows
+            first = -self._count % self.sample_every
+            self._count += len(rows)
+            models = model_class._construct_many_from_xivapi(rows)
+            if self.mode == 'trusted':
+                return models, None
+            for index in range(first, len(rows), self.sample_every):
+                try:
+                    models[index] = model_class.model_validate(rows[index])
+                except ValidationError as e:
+                    return models[:index], ModelValidationError(
+                        model_class, e, rows[index], index
+                    )
+            return models, None
+
+        adapter = model_class._get_list_adapter()
+        try:
+            return adapter.validate_python(rows), None
+        except ValidationError as e:
+            failed = min(
+                (
+                    error['loc'][0]
+                    for error in e.errors()
+                    if error['loc'] and isinstance(error['loc'][0], int)
+                ),
+                default=0,
+            )
+
+        # Everything before the first failure is fine; find the exact row (and its
+        # own error) from there
+        models = adapter.validate_python(rows[:failed]) if failed else []
+        for index in range(failed, len(rows)):
+            try:
+                models.append(model_class.model_validate(rows[index]))
+            except ValidationError as e:
+                return models, ModelValidationError(model_class, e, rows[index], index)
+        return models, None
+
+    def mixed_page(
+        self, rows: list[tuple[type[Model], dict]]
+    ) -> tuple[list[Model], Optional[ModelValidationError]]:
+        """Like page(), but for a page where each row may belong to a different model."""
+        by_model: dict[type[Model], list[int]] = {}
+        for position, (model_class, _) in enumerate(rows):
+            by_model.setdefault(model_class, []).append(position)
+
+        results: dict[int, Model] = {}
+        first_error: Optional[ModelValidationError] = None
+        for model_class, positions in by_model.items():
+            models, error = self.page(model_class, [rows[p][1] for p in positions])
+            results.update(zip(positions, models))
+            if error is not None:
+                error.index = positions[cast(int, error.index)]
+                if first_error is None or error.index < cast(int, first_error.index):
+                    first_error = error
+
+        stop = first_error.index if first_error is not None else len(rows)
+        return [results[p] for p in range(cast(int, stop))], first_error
+
+
 class Client:
     """Async client for gathering data from xivapi rest api.
 
@@ -44,6 +276,20 @@ class Client:
         game_version: Default game version for requests; defaults to 'latest'
         schema_version: Default schema version to use for requests
         batch_size: For the sheets endpoint, it will fetch in batches of that size
+        concurrency: For the sheets endpoint, how many batches may be requested at once
+        coalesce_window: If set, single-row sheet fetches made within this many seconds
+            of each other are combined into one batched request (up to `batch_size` rows)
+        cache: A response cache for sheet data; responses for pinned game versions
+            never expire, while `latest` responses expire after `cache_ttl`
+        cache_ttl: How long (in seconds) cached `latest` responses are kept
+        asset_cache: An on-disk cache for assets, icons and maps
+        validate_json: If True, fully-validated sheet batches and single-model searches
+            are validated straight from the response bytes by pydantic-core, rather
+            than being decoded to Python first and then validated; models with
+            language or nested field mappings are validated the usual way
+        stream: If True, sheet batches and search pages are parsed as the response
+            arrives, and each row is handed out as soon as it's complete rather than
+            once the whole body has been read; streamed responses skip `cache`
 
     Example:
         ```python
@@ -63,22 +309,48 @@ class Client:
         game_version: str = 'latest',
         schema_version: Optional[str] = None,
         batch_size: int = 100,
+        concurrency: int = 1,
+        coalesce_window: Optional[float] = None,
+        cache: Optional[Cache] = None,
+        cache_ttl: float = 300.0,
+        asset_cache: Optional[AssetCache] = None,
+        validate_json: bool = False,
+        stream: bool = False,
     ) -> None:
         """Initialize the Client with the given parameters."""
+        _check_concurrency(concurrency)
         self.base_url = base_url
         self.base_api_path = base_api_path
         transport = httpx.AsyncHTTPTransport(retries=3)
+        self._max_connections = 10
         self._client = httpx.AsyncClient(
             base_url=base_url,
             timeout=30.0,
             transport=transport,
             # TODO: let people set their own UA for this
             headers={'User-Agent': f'xivapi/{VERSION}'},
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            limits=httpx.Limits(
+                max_keepalive_connections=5, max_connections=self._max_connections
+            ),
         )
         self.game_version = game_version
         self.schema_version = schema_version
         self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.coalesce_window = coalesce_window
+        # Loaders are only kept while someone is waiting on them, so a long-lived
+        # client doesn't collect one for every set of params it has ever seen
+        self._row_loaders: WeakValueDictionary[tuple, BatchLoader[int, dict]] = (
+            WeakValueDictionary()
+        )
+        self._in_flight: SingleFlight[tuple, httpx.Response] = SingleFlight()
+        # Asset downloads streamed into the asset cache, keyed by asset cache key
+        self._assets_in_flight: SingleFlight[str, Optional[bytes]] = SingleFlight()
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.asset_cache = asset_cache
+        self.validate_json = validate_json
+        self.stream = stream
 
     async def close(self) -> None:
         """Close the interior HTTP client."""
@@ -92,6 +364,71 @@ class Client:
         if 'schema' not in params and self.schema_version:
             params['schema'] = self.schema_version
 
+    async def _get(
+        self, path: str, params: Optional[dict] = None, cacheable: bool = False
+    ) -> httpx.Response:
+        """Send a GET request to xivapi, sharing it with identical requests in flight.
+
+        If `cacheable` is set and the client has a cache, successful responses are
+        stored in (and later served from) that cache.
+        """
+        params = params or {}
+        normalized = sorted((k, str(v)) for k, v in params.items())
+
+        if not cacheable or self.cache is None:
+            return await self._in_flight.do(
+                ('GET', path, tuple(normalized)),
+                partial(self._client.get, path, params=params),
+            )
+
+        key = f'{path}?{urlencode(normalized)}'
+        if (content := self.cache.get(key)) is not None:
+            return httpx.Response(
+                200,
+                content=content,
+                request=self._client.build_request('GET', path, params=params),
+            )
+
+        return await self._in_flight.do(
+            ('GET', path, tuple(normalized)),
+            partial(self._get_and_cache, key, path, params),
+        )
+
+    async def _get_and_cache(self, key: str, path: str, params: dict) -> httpx.Response:
+        """Send a GET request and store a successful response in the cache."""
+        response = await self._client.get(path, params=params)
+        if response.status_code == 200:
+            self._cache_set(key, response.content, params)
+        return response
+
+    def _cache_set(self, key: str, value: bytes, params: dict) -> None:
+        """Store a value in the cache, tagged with the version it was fetched for."""
+        if self.cache is None:
+            return
+        version = str(params.get('version', self.game_version))
+        self.cache.set(
+            key,
+            value,
+            # pinned versions never change, so only latest needs to expire
+            ttl=self.cache_ttl if version == 'latest' else None,
+            tag=version,
+        )
+
+    async def _stream_items(
+        self, path: str, params: dict, parser: JSONArrayStream
+    ) -> AsyncGenerator[Any, None]:
+        """Send a GET request, yielding each item of `parser`'s array as it arrives.
+
+        Raises httpx.HTTPStatusError for unsuccessful responses, like raise_for_status.
+        """
+        async with self._client.stream('GET', path, params=params) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+
     def _flatten_item_data(self, data: dict) -> dict:
         """Extract and flatten row data from API response."""
         if not data or 'row_id' not in data:
@@ -101,6 +438,8 @@ class Client:
 
         processed_data = data.get('fields', {})
         processed_data['row_id'] = data['row_id']
+        if 'subrow_id' in data:
+            processed_data['subrow_id'] = data['subrow_id']
 
         return processed_data
 
@@ -119,7 +458,7 @@ class Client:
     async def versions(self) -> list[str]:
         """Retrieve a list of available game versions supported by the API."""
         try:
-            response = await self._client.get(f'{self.base_api_path}/version')
+            response = await self._get(f'{self.base_api_path}/version')
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
             raise XIVAPIHTTPError(
@@ -135,6 +474,17 @@ class Client:
         for version in data.get('versions', []):
             version_names.extend(version.get('names', []))
 
+        # A new version means whatever we cached for `latest` is out of date. Each
+        # cache remembers the versions it last saw, so this works across processes
+        for cache in (self.cache, self.asset_cache):
+            if cache is None:
+                continue
+            seen = cache.seen_versions()
+            if seen is not None and set(seen) != set(version_names):
+                cache.invalidate('latest')
+            if seen is None or set(seen) != set(version_names):
+                cache.see_versions(version_names)
+
         return version_names
 
     # TODO: I wonder if index could just be a number that we 0-pad
@@ -163,21 +513,12 @@ class Client:
             params['version'] = version
         self._add_version_params(params)
 
-        try:
-            response = await self._client.get(
-                f'{self.base_api_path}/asset/map/{territory}/{index}', params=params
-            )
-            response.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return None
-            raise XIVAPIHTTPError(
-                f'Failed to get map {territory}/{index}: {e}',
-                status_code=e.response.status_code,
-                response=e.response,
-            )
-
-        return response.content
+        return await self._get_asset(
+            f'{self.base_api_path}/asset/map/{territory}/{index}',
+            params,
+            AssetCache.key(f'map/{territory}/{index}', 'jpg', params['version']),
+            f'map {territory}/{index}',
+        )
 
     async def sheets(self, version: Optional[str] = None) -> list[str]:
         """Gets a list of all sheets supported by the api."""
@@ -186,8 +527,8 @@ class Client:
             params['version'] = version
         self._add_version_params(params)
         try:
-            response = await self._client.get(
-                f'{self.base_api_path}/sheet', params=params
+            response = await self._get(
+                f'{self.base_api_path}/sheet', params=params, cacheable=True
             )
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
@@ -212,6 +553,14 @@ class Client:
         self,
         model_spec: type[T],
         query: QueryBuilder | str,
+        *,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        fan_out: bool = False,
+        ordered: bool = True,
+        cache: bool = False,
         **params,
     ) -> AsyncIterator[SearchResult[T]]: ...
     @overload
@@ -219,6 +568,14 @@ class Client:
         self,
         model_spec: tuple[type[T1], type[T2]],
         query: QueryBuilder | str,
+        *,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        fan_out: bool = False,
+        ordered: bool = True,
+        cache: bool = False,
         **params,
     ) -> AsyncIterator[SearchResult[T1 | T2]]: ...
     @overload
@@ -226,12 +583,28 @@ class Client:
         self,
         model_spec: tuple[type[T1], type[T2], type[T3]],
         query: QueryBuilder | str,
+        *,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        fan_out: bool = False,
+        ordered: bool = True,
+        cache: bool = False,
         **params,
     ) -> AsyncIterator[SearchResult[T1 | T2 | T3]]: ...
     def search(
         self,
         model_spec: type[Model] | tuple[type[Model], ...],
         query: QueryBuilder | str,
+        *,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        fan_out: bool = False,
+        ordered: bool = True,
+        cache: bool = False,
         **params,
     ) -> Any:
         """Search XIVAPI for data using a query.
@@ -239,6 +612,23 @@ class Client:
         Args:
             model_spec: Model class or tuple of model classes to search the sheets for.
             query: A QueryBuilder search or a plain string with the search terms
+            validate: 'full' validates every result against its model; 'trusted' skips
+                validation entirely (no type coercion); 'sample' fully validates only
+                every `sample_every`th result
+            sample_every: How often to validate results when `validate='sample'`
+            prefetch: How many pages to fetch in the background, ahead of the page
+                being consumed; 0 fetches each page only once the last is used up.
+                Has no effect if the client streams responses.
+            limit: The most results to return; the API is asked for no more than
+                that, and no further pages are requested once it's reached
+            fan_out: When searching several models, send each sheet its own search
+                (asking only for its own model's fields), all at once, rather than
+                one combined search across every sheet
+            ordered: When fanning out, merge the results by score (True) or yield
+                them as each sheet's results arrive (False)
+            cache: Store the complete results in (and serve repeats of this search
+                from) the client's cache; equivalent QueryBuilder queries share an
+                entry however their clauses are ordered. Ignored when streaming.
             **params: Additional search parameters
 
         Returns:
@@ -258,12 +648,86 @@ class Client:
                 # result.data is still properly typed
             ```
         """
-        return self._search_impl(model_spec, query, **params)
+        if prefetch < 0:
+            raise ValueError(f'prefetch must not be negative, got {prefetch}')
+        if limit is not None and limit < 0:
+            raise ValueError(f'limit must not be negative, got {limit}')
+        if cache and self.cache is None:
+            raise ValueError('cache=True needs the client to have a cache')
+
+        validator = _RowValidator(validate, sample_every)
+        if fan_out and not isinstance(model_spec, type) and len(model_spec) > 1:
+            return self._fan_out_search(
+                model_spec,
+                query,
+                validator,
+                ordered=ordered,
+                prefetch=prefetch,
+                limit=limit,
+                cache=cache,
+                **params,
+            )
+
+        return self._search_impl(
+            model_spec,
+            query,
+            validator,
+            prefetch=prefetch,
+            limit=limit,
+            cache=cache,
+            **params,
+        )
+
+    async def _fan_out_search(
+        self,
+        models: tuple[type[Model], ...],
+        query: QueryBuilder | str,
+        validator: _RowValidator,
+        ordered: bool = True,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        cache: bool = False,
+        **params,
+    ) -> AsyncIterator[SearchResult[Model]]:
+        """Search each model's sheet separately and at the same time, merging the results."""
+        # One search per sheet; like a combined search, the last model for a sheet wins
+        by_sheet = {model.get_sheet_name(): model for model in models}
+        sources = [
+            self._search_impl(
+                model,
+                query,
+                validator,
+                prefetch=prefetch,
+                limit=limit,
+                cache=cache,
+                **params,
+            )
+            for model in by_sheet.values()
+        ]
+
+        # Each sheet's results already come best-first, so a k-way merge keeps that
+        results: AsyncGenerator[SearchResult[Model], None]
+        if ordered:
+            results = merge_sorted(sources, key=lambda result: -result.score)
+        else:
+            results = merge(sources, ordered=False)
+
+        count = 0
+        async with aclosing(results):
+            async for result in results:
+                yield result
+                count += 1
+                if limit is not None and count >= limit:
+                    return
 
     async def _search_impl(
         self,
         model_spec: type[Model] | tuple[type[Model], ...],
         query: QueryBuilder | str,
+        validator: _RowValidator,
+        prefetch: int = 0,
+        limit: Optional[int] = None,
+        cache: bool = False,
         **params,
     ) -> AsyncIterator[SearchResult[Model]]:
         """The underlying search implementation method."""
@@ -274,6 +738,36 @@ class Client:
         else:
             models = model_spec
 
+        search_params = self._search_params(models, query, **params)
+
+        # Create model lookup table
+        model_lut = {model.get_sheet_name(): model for model in models}
+
+        cache_key = None
+        if cache and self.cache is not None and not self.stream:
+            cache_key = self._search_cache_key(search_params, query)
+
+        pages = self._search_pages(
+            search_params,
+            models,
+            model_lut,
+            validator,
+            limit=limit,
+            cache_key=cache_key,
+        )
+        if prefetch and not self.stream:
+            pages = buffered(pages, prefetch)
+
+        # Close explicitly, so a consumer stopping early stops any prefetching too
+        async with aclosing(pages):
+            async for page in pages:
+                for result in page:
+                    yield result
+
+    def _search_params(
+        self, models: tuple[type[Model], ...], query: QueryBuilder | str, **params
+    ) -> dict:
+        """Build the request parameters for searching the given models' sheets."""
         sheets = {model.get_sheet_name() for model in models}
 
         if 'fields' not in params:
@@ -287,58 +781,265 @@ class Client:
 
         search_params = {'sheets': ','.join(sheets), 'query': query_str, **params}
         self._add_version_params(search_params)
+        return search_params
 
-        # Create model lookup table
-        model_lut = {model.get_sheet_name(): model for model in models}
+    def _raw_search_pages(
+        self, search_params: dict, limit: Optional[int] = None
+    ) -> AsyncGenerator[list[dict], None]:
+        """Follow a search's cursor chain, yielding each page's results as raw dicts.
+
+        If `limit` is given, no more than that many results are requested or yielded.
+        """
+        return self._search_page_chain(search_params, _read_raw_search_page, limit)
+
+    def _search_cache_key(self, search_params: dict, query: QueryBuilder | str) -> str:
+        """Build the cache key for a search, shared by equivalent searches."""
+        params = {
+            **search_params,
+            'sheets': ','.join(sorted(search_params['sheets'].split(','))),
+            'query': _canonical_query(query),
+            'fields': ','.join(sorted(set(str(search_params['fields']).split(',')))),
+        }
+        normalized = sorted((k, str(v)) for k, v in params.items())
+        return f'{self.base_api_path}/search?{urlencode(normalized)}'
 
+    def _search_pages(
+        self,
+        search_params: dict,
+        models: tuple[type[Model], ...],
+        model_lut: dict[str, type[Model]],
+        validator: _RowValidator,
+        limit: Optional[int] = None,
+        cache_key: Optional[str] = None,
+    ) -> AsyncGenerator[list[SearchResult[Model]], None]:
+        """Follow a search's cursor chain, yielding each page of results as it's read.
+
+        When streaming, each result is yielded (as a page of one) as soon as it arrives.
+        If `limit` is given, no more than that many results are requested or yielded.
+        If `cache_key` is given, the pages are served from the cache if they're there,
+        and otherwise stored once the last page has been fetched.
+        """
+        if self.stream:
+            return self._streamed_search_pages(
+                search_params, model_lut, validator, limit
+            )
+        return self._search_page_chain(
+            search_params,
+            partial(
+                self._read_search_page,
+                models=models,
+                model_lut=model_lut,
+                validator=validator,
+            ),
+            limit,
+            cache_key,
+        )
+
+    async def _search_page_chain[R](
+        self,
+        search_params: dict,
+        read: Callable[[bytes], tuple[list[R], Optional[Exception], Optional[str]]],
+        limit: Optional[int] = None,
+        cache_key: Optional[str] = None,
+    ) -> AsyncGenerator[list[R], None]:
+        """Follow a search's cursor chain, turning each page's body into results with `read`.
+
+        `read` returns a page's results, the error to raise once they've been yielded
+        (if any), and the cursor for the next page. If `limit` is given, no more than
+        that many results are requested or yielded. If `cache_key` is given, the pages
+        are served from the cache if they're there, and otherwise stored once the last
+        page has been fetched.
+        """
         cursor = None
+        remaining = limit
+
+        cached: Optional[list[bytes]] = None
+        chain: list[bytes] = []
+        if cache_key is not None and self.cache is not None:
+            if (packed := self.cache.get(cache_key)) is not None:
+                cached = _unpack_pages(packed)
+
+        while remaining is None or remaining > 0:
+            if cached is not None:
+                if not cached:
+                    break
+                content = cached.pop(0)
+            else:
+                try:
+                    response = await self._get(
+                        f'{self.base_api_path}/search',
+                        params=_search_page_params(search_params, cursor, remaining),
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    raise XIVAPIHTTPError(
+                        f'Search failed: {e}',
+                        status_code=e.response.status_code,
+                        response=e.response,
+                    )
+                content = response.content
 
-        while True:
-            current_params = search_params.copy()
-            if cursor:
-                current_params['cursor'] = cursor
-                current_params.pop('query', None)
+            results, error, cursor = read(content)
 
-            try:
-                response = await self._client.get(
-                    f'{self.base_api_path}/search', params=current_params
-                )
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                raise XIVAPIHTTPError(
-                    f'Search failed: {e}',
-                    status_code=e.response.status_code,
-                    response=e.response,
-                )
+            if cache_key is not None and cached is None:
+                chain.append(content)
+                # Only whole chains are stored; the cursors in a partial one expire
+                if not cursor:
+                    self._cache_set(cache_key, _pack_pages(chain), search_params)
 
-            data = response.json()
+            if remaining is not None:
+                if len(results) >= remaining:
+                    # Anything past the limit doesn't matter, valid or not
+                    results, error, cursor = results[:remaining], None, None
+                remaining -= len(results)
+            yield results
+            if error is not None:
+                raise error
+
+            # Are there more pages?
+            if not cursor:
+                break
 
-            for result in data.get('results', []):
-                sheet_name = result.get('sheet')
-                if sheet_name in model_lut:
-                    model_class = model_lut[sheet_name]
+    async def _streamed_search_pages(
+        self,
+        search_params: dict,
+        model_lut: dict[str, type[Model]],
+        validator: _RowValidator,
+        limit: Optional[int] = None,
+    ) -> AsyncGenerator[list[SearchResult[Model]], None]:
+        """Follow a search's cursor chain, yielding each result (as a page of one) as it arrives."""
+        cursor = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            parser = JSONArrayStream('results')
+            # Closing the stream as soon as we have enough drops the response
+            async with aclosing(
+                self._stream_search_page(
+                    _search_page_params(search_params, cursor, remaining),
+                    parser,
+                    model_lut,
+                    validator,
+                )
+            ) as streamed:
+                async for result in streamed:
+                    yield [result]
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining == 0:
+                            return
+            cursor = parser.envelope.get('next')
+            if not cursor:
+                break
 
-                    processed_data = self._flatten_item_data(
+    def _read_search_page(
+        self,
+        content: bytes,
+        models: tuple[type[Model], ...],
+        model_lut: dict[str, type[Model]],
+        validator: _RowValidator,
+    ) -> tuple[
+        list[SearchResult[Model]], Optional[ModelValidationError], Optional[str]
+    ]:
+        """Turn the body of a page of search results into models.
+
+        Returns the results (up to any that failed validation), the validation error
+        if there was one, and the cursor for the next page.
+        """
+        envelope_validator = (
+            models[0]._get_search_envelope()
+            if self.validate_json and validator.mode == 'full' and len(models) == 1
+            else None
+        )
+        if envelope_validator is not None:
+            try:
+                envelope = envelope_validator.validate_json(content)
+            except ValidationError:
+                # Go the long way round to find (and report) the exact bad row
+                pass
+            else:
+                return (
+                    [
+                        SearchResult(
+                            score=score, sheet=sheet_name, row_id=row_id, data=instance
+                        )
+                        for score, sheet_name, row_id, instance in models[
+                            0
+                        ]._from_validated_results(envelope.get('results', []))
+                    ],
+                    None,
+                    envelope.get('next'),
+                )
+
+        data = json.loads(content)
+
+        page = [
+            (result, model_lut[result.get('sheet')])
+            for result in data.get('results', [])
+            if result.get('sheet') in model_lut
+        ]
+        instances, error = validator.mixed_page(
+            [
+                (
+                    model_class,
+                    self._flatten_item_data(
                         {
                             'row_id': result['row_id'],
                             'fields': result.get('fields', {}),
                         }
-                    )
+                    ),
+                )
+                for result, model_class in page
+            ]
+        )
+        results: list[SearchResult[Model]] = [
+            SearchResult(
+                score=result.get('score', 0.0),
+                sheet=result['sheet'],
+                row_id=result['row_id'],
+                data=model_instance,
+            )
+            for (result, _), model_instance in zip(page, instances)
+        ]
+        return results, error, data.get('next')
 
+    async def _stream_search_page(
+        self,
+        params: dict,
+        parser: JSONArrayStream,
+        model_lut: dict[str, type[Model]],
+        validator: _RowValidator,
+    ) -> AsyncGenerator[SearchResult[Model], None]:
+        """Stream one page of search results, validating each as it arrives."""
+        index = 0
+        try:
+            async with aclosing(
+                self._stream_items(f'{self.base_api_path}/search', params, parser)
+            ) as items:
+                async for result in items:
+                    model_class = model_lut.get(result.get('sheet'))
+                    if model_class is None:
+                        continue
+                    data = self._flatten_item_data(
+                        {'row_id': result['row_id'], 'fields': result.get('fields', {})}
+                    )
                     try:
-                        model_instance = model_class.model_validate(processed_data)
-                    except ValidationError as e:
-                        raise ModelValidationError(model_class, e, processed_data)
+                        model_instance = validator(model_class, data)
+                    except ModelValidationError as e:
+                        e.index = index
+                        raise
+                    index += 1
                     yield SearchResult(
                         score=result.get('score', 0.0),
-                        sheet=sheet_name,
+                        sheet=result['sheet'],
                         row_id=result['row_id'],
                         data=model_instance,
                     )
-            # Are there more pages?
-            cursor = data.get('next')
-            if not cursor:
-                break
+        except httpx.HTTPStatusError as e:
+            raise XIVAPIHTTPError(
+                f'Search failed: {e}',
+                status_code=e.response.status_code,
+                response=e.response,
+            )
 
     async def asset(
         self, path: str, format: Format = 'png', version: Optional[str] = None
@@ -360,22 +1061,61 @@ class Client:
         if version is not None:
             params['version'] = version
         self._add_version_params(params)
+        return await self._get_asset(
+            f'{self.base_api_path}/asset',
+            params,
+            AssetCache.key(path, format, params['version']),
+            f'asset {path}',
+        )
+
+    async def _get_asset(
+        self, url: str, params: dict, key: str, description: str
+    ) -> Optional[bytes]:
+        """Fetch an asset's bytes, going through the asset cache if there is one."""
+        if self.asset_cache is None:
+            try:
+                response = await self._get(url, params=params)
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return None
+                raise XIVAPIHTTPError(
+                    f'Failed to get {description}: {e}',
+                    status_code=e.response.status_code,
+                    response=e.response,
+                )
+            return response.content
+
+        if (content := self.asset_cache.get(key)) is not None:
+            return content
+
+        return await self._assets_in_flight.do(
+            key, partial(self._stream_asset, url, params, key, description)
+        )
+
+    async def _stream_asset(
+        self, url: str, params: dict, key: str, description: str
+    ) -> Optional[bytes]:
+        """Stream an asset straight into the asset cache, returning its contents."""
+        asset_cache = cast(AssetCache, self.asset_cache)
         try:
-            response = await self._client.get(
-                f'{self.base_api_path}/asset', params=params
-            )
-            response.raise_for_status()
+            async with self._client.stream('GET', url, params=params) as response:
+                response.raise_for_status()
+                file = await asset_cache.write(
+                    key, response.aiter_bytes(), tag=params['version']
+                )
+                # Read before awaiting anything else, as another asset's write
+                # could evict this one's file
+                return file.read_bytes()
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
             raise XIVAPIHTTPError(
-                f'Failed to get asset {path}: {e}',
+                f'Failed to get {description}: {e}',
                 status_code=e.response.status_code,
                 response=e.response,
             )
 
-        return response.content
-
     async def icon(
         self, icon_id: int, format: Format = 'jpg', version: Optional[str] = None
     ) -> Optional[bytes]:
@@ -389,16 +1129,127 @@ class Client:
         Returns:
             A bytes object of the icon in the selected format, or None if not found.
         """
-        folder = f'{icon_id // 1000 * 1000:06d}'
-        path = f'ui/icon/{folder}/{icon_id:06d}_hr1.tex'
+        path = self._icon_path(icon_id)
         return await self.asset(path, format=format, version=version)
 
+    @staticmethod
+    def _icon_path(icon_id: int) -> str:
+        """Returns the game path of an icon by id."""
+        folder = f'{icon_id // 1000 * 1000:06d}'
+        return f'ui/icon/{folder}/{icon_id:06d}_hr1.tex'
+
+    def assets(
+        self,
+        paths: Iterable[str],
+        format: Format = 'png',
+        version: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        directory: Optional[str | Path] = None,
+    ) -> AsyncIterator[tuple[str, Optional[bytes]]]:
+        """Fetches many assets at once, yielding each as soon as it arrives.
+
+        Args:
+            paths: The paths to fetch; repeated paths are only fetched once
+            format: The format for the resources to be formatted as ('jpg', 'png', 'webp')
+            version: A game version to fetch from
+            concurrency: How many assets to fetch at once; defaults to (and is
+                capped at) the size of the client's connection pool
+            directory: If given, each asset found is also written into this directory,
+                keeping its game path (e.g. `ui/icon/000000/000001_hr1.png`)
+
+        Returns:
+            An AsyncIterator of (path, bytes) tuples in the order they complete, where
+            bytes is None if the asset wasn't found.
+        """
+        _check_concurrency(concurrency)
+
+        def target(path: str) -> Path:
+            return Path(path).with_suffix(f'.{format}')
+
+        return self._bulk_assets(
+            ((path, path, target(path)) for path in paths),
+            format=format,
+            version=version,
+            concurrency=concurrency,
+            directory=directory,
+        )
+
+    def icons(
+        self,
+        icon_ids: Iterable[int],
+        format: Format = 'jpg',
+        version: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        directory: Optional[str | Path] = None,
+    ) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+        """Fetches many icons at once, yielding each as soon as it arrives.
+
+        Args:
+            icon_ids: The icon ids in game data; repeated ids are only fetched once
+            format: The format for the icons to be in (defaults to 'jpg')
+            version: A game version to fetch from
+            concurrency: How many icons to fetch at once; defaults to (and is
+                capped at) the size of the client's connection pool
+            directory: If given, each icon found is also written into this directory
+                as `{icon_id:06d}.{format}`
+
+        Returns:
+            An AsyncIterator of (icon_id, bytes) tuples in the order they complete,
+            where bytes is None if the icon wasn't found.
+        """
+        _check_concurrency(concurrency)
+        return self._bulk_assets(
+            (
+                (icon_id, self._icon_path(icon_id), Path(f'{icon_id:06d}.{format}'))
+                for icon_id in icon_ids
+            ),
+            format=format,
+            version=version,
+            concurrency=concurrency,
+            directory=directory,
+        )
+
+    async def _bulk_assets[K](
+        self,
+        items: Iterable[tuple[K, str, Path]],
+        format: Format,
+        version: Optional[str],
+        concurrency: Optional[int],
+        directory: Optional[str | Path],
+    ) -> AsyncIterator[tuple[K, Optional[bytes]]]:
+        """Fetch (key, game path, file name) items concurrently for assets() and icons()."""
+        if concurrency is None:
+            concurrency = self._max_connections
+        concurrency = min(concurrency, self._max_connections)
+
+        async def fetch(key: K, path: str, file: Path) -> tuple[K, Optional[bytes]]:
+            content = await self.asset(path, format=format, version=version)
+            if content is not None and directory is not None:
+                file = Path(directory) / file
+                file.parent.mkdir(parents=True, exist_ok=True)
+                file.write_bytes(content)
+            return key, content
+
+        async def jobs() -> AsyncGenerator[
+            Coroutine[Any, Any, tuple[K, Optional[bytes]]], None
+        ]:
+            seen = set()
+            for key, path, file in items:
+                if key not in seen:
+                    seen.add(key)
+                    yield fetch(key, path, file)
+
+        async with aclosing(windowed(jobs(), concurrency, ordered=False)) as results:
+            async for result in results:
+                yield result
+
     @overload
     def sheet[T: Model](
         self,
         model_class: type[T],
         *,
         row: int,
+        validate: ValidationMode = 'full',
         **params,
     ) -> Coroutine[Any, Any, Optional[T]]: ...
     @overload
@@ -407,6 +1258,10 @@ class Client:
         model_class: type[T],
         *,
         rows: Iterable[int] | AsyncIterable[int],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
         **params,
     ) -> AsyncIterator[T]: ...
     def sheet[T: Model](
@@ -415,6 +1270,10 @@ class Client:
         *,
         row: Optional[int] = None,
         rows: Optional[Iterable[int] | AsyncIterable[int]] = None,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
         **params,
     ) -> Coroutine[Any, Any, Optional[T]] | AsyncIterator[T]:
         """Fetch one or more rows from a sheet.
@@ -423,6 +1282,14 @@ class Client:
             model_class: An xivapy.Model class for the results to be coerced to
             row: A single row id to fetch
             rows: Multiple row ids to fetch
+            concurrency: How many batches of `rows` to have in flight at once;
+                defaults to the client's `concurrency`
+            ordered: When fetching batches concurrently, yield rows in the order
+                they were requested (True) or as each batch arrives (False)
+            validate: 'full' validates every row against the model; 'trusted' skips
+                validation entirely (no type coercion), for data already known to be
+                good; 'sample' fully validates only every `sample_every`th row
+            sample_every: How often to validate rows when `validate='sample'`
             **params: Extra parameters which are passed to the sheets endpoint
 
         Returns:
@@ -433,18 +1300,317 @@ class Client:
         """
         if row is not None and rows is not None:
             raise ValueError("Cannot specify both 'row' and 'rows'")
+        _check_concurrency(concurrency)
 
+        validator = _RowValidator(validate, sample_every)
         if row is not None:
-            return self._get_single_row(model_class, row, **params)
+            return self._get_single_row(model_class, row, validator, **params)
         elif rows is not None:
-            return self._get_multiple_rows(model_class, rows, **params)
+            return self._get_multiple_rows(
+                model_class,
+                rows,
+                validator,
+                concurrency=concurrency,
+                ordered=ordered,
+                **params,
+            )
         else:
             raise ValueError("Must specify either 'row' or 'rows'")
 
+    def sheet_all[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        after: Optional[int | str] = None,
+        partitions: int = 1,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        **params,
+    ) -> AsyncIterator[T]:
+        """Fetch every row of a sheet, in row id order.
+
+        Rather than needing to know the row ids up front, this pages through the
+        sheet `batch_size` rows at a time, so gaps in the ids cost nothing and no
+        rows are missed.
+
+        With `partitions` above 1, up to ten requests are first made one after
+        another to find roughly where the sheet's row ids start and end; that range
+        is then split into `partitions` equal ranges which are paged through at the
+        same time. That start-up cost is only worth paying for big sheets: a sheet
+        whose rows fit in one page is paged through as usual after two requests.
+
+        Args:
+            model_class: An xivapy.Model class for the results to be coerced to
+            after: Only fetch rows after this row id; pass the last row id you saw
+                to resume an interrupted dump
+            partitions: How many row id ranges to page through at once
+            concurrency: The most requests to have in flight at once across every
+                partition; defaults to `partitions` (capped at the size of the
+                client's connection pool)
+            ordered: When partitioned, yield rows in row id order (True) or as each
+                page arrives (False)
+            validate: How to validate rows; see `sheet`
+            sample_every: How often to validate rows when `validate='sample'`
+            **params: Extra parameters which are passed to the sheets endpoint
+
+        Returns:
+            An AsyncIterator of every row (after `after`) in the sheet.
+
+        Example:
+            ```python
+            async for item in client.sheet_all(Item):
+                print(item)
+
+            # Pick up where a previous run left off
+            async for item in client.sheet_all(Item, after=last_seen_id):
+                ...
+            ```
+        """
+        if partitions < 1:
+            raise ValueError(f'partitions must be at least 1, got {partitions}')
+        _check_concurrency(concurrency)
+
+        return self._get_all_rows(
+            model_class,
+            after,
+            _RowValidator(validate, sample_every),
+            partitions=partitions,
+            concurrency=concurrency,
+            ordered=ordered,
+            **params,
+        )
+
+    def diff[T: Model](
+        self,
+        model_class: type[T],
+        from_version: str,
+        to_version: str,
+        *,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        **params,
+    ) -> AsyncIterator[RowDiff[T]]:
+        """Compare a sheet between two game versions, row by row.
+
+        Both versions are paged through at the same time, in row (and subrow) id
+        order, and compared as the pages arrive, so only a page or two of each is held at
+        once however big the sheet is. Rows are compared on the model's fields;
+        rows whose fields are all the same in both versions aren't yielded.
+
+        Args:
+            model_class: An xivapy.Model class for the rows to be coerced to, and
+                whose fields are compared
+            from_version: The game version to compare from
+            to_version: The game version to compare to
+            validate: How to validate rows; see `sheet`
+            sample_every: How often to validate rows when `validate='sample'`
+            **params: Extra parameters which are passed to the sheets endpoint
+
+        Returns:
+            An AsyncIterator of RowDiffs, in row (and subrow) id order.
+
+        Example:
+            ```python
+            async for change in client.diff(Item, '7.1', '7.2'):
+                if change.kind == 'changed':
+                    print(change.row_id, change.changes)
+            ```
+        """
+        return self._diff_rows(
+            model_class,
+            from_version,
+            to_version,
+            _RowValidator(validate, sample_every),
+            **params,
+        )
+
+    async def sheet_table[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        rows: Optional[Iterable[int] | AsyncIterable[int]] = None,
+        after: Optional[int | str] = None,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+        **params,
+    ) -> SheetTable[T]:
+        """Fetch rows of a sheet into a columnar SheetTable.
+
+        Each page of rows is validated into models as usual, which are then taken
+        apart into the table's columns, so only a page of models is ever held at
+        once. Suits big, mostly numeric sheets that would take a lot of memory as
+        a model per row.
+
+        Args:
+            model_class: An xivapy.Model class whose fields make the table's columns
+            rows: The row ids to fetch, like `sheet(rows=...)`; every row of the
+                sheet (like `sheet_all`) if not given
+            after: When fetching every row, only fetch rows after this row id
+            validate: How to validate rows; see `sheet`
+            sample_every: How often to validate rows when `validate='sample'`
+            **params: Extra parameters which are passed to the sheets endpoint
+
+        Returns:
+            A SheetTable of the rows, in the order they were fetched.
+
+        Example:
+            ```python
+            items = await client.sheet_table(Item)
+            high_level = items.filter(Item.level >= 600)
+            ```
+        """
+        # xivapy.table builds on xivapy.local, which imports this module
+        from xivapy.table import SheetTable
+
+        validator = _RowValidator(validate, sample_every)
+        self._add_version_params(params)
+        if 'fields' not in params:
+            params['fields'] = model_class.get_fields_str()
+        sheet_name = model_class.get_sheet_name()
+
+        table = SheetTable(model_class)
+
+        def add_page(page: list[dict]) -> None:
+            row_ids = [data['row_id'] for data in page]
+            for row_id, model in zip(
+                row_ids, self._validate_page(model_class, page, validator)
+            ):
+                table.append(model, row_id=row_id)
+
+        if rows is None:
+            async with aclosing(
+                self._sheet_pages(sheet_name, after, **params)
+            ) as pages:
+                async for page in pages:
+                    add_page(page)
+        else:
+            async for batch in self._iter_batches(rows):
+                add_page(await self._get_rows_data(sheet_name, batch, **params))
+        return table
+
+    async def _diff_rows[T: Model](
+        self,
+        model_class: type[T],
+        from_version: str,
+        to_version: str,
+        validator: _RowValidator,
+        **params,
+    ) -> AsyncIterator[RowDiff[T]]:
+        """An internal method for comparing a sheet between two versions."""
+        self._add_version_params(params)
+        if 'fields' not in params:
+            params['fields'] = model_class.get_fields_str()
+        sheet_name = model_class.get_sheet_name()
+
+        # Each version's pages are fetched in the background, a page ahead
+        old_pages = buffered(
+            self._sheet_pages(sheet_name, **{**params, 'version': from_version}), 1
+        )
+        new_pages = buffered(
+            self._sheet_pages(sheet_name, **{**params, 'version': to_version}), 1
+        )
+        async with aclosing(old_pages), aclosing(new_pages):
+            next_old = _row_reader(old_pages)
+            next_new = _row_reader(new_pages)
+            old, new = await next_old(), await next_new()
+            while old is not None or new is not None:
+                if new is None or (old is not None and _row_key(old) < _row_key(new)):
+                    assert old is not None
+                    before = validator(model_class, old)
+                    yield RowDiff(
+                        old['row_id'],
+                        'removed',
+                        before,
+                        None,
+                        {},
+                        old.get('subrow_id'),
+                    )
+                    old = await next_old()
+                elif old is None or _row_key(new) < _row_key(old):
+                    after = validator(model_class, new)
+                    yield RowDiff(
+                        new['row_id'], 'added', None, after, {}, new.get('subrow_id')
+                    )
+                    new = await next_new()
+                else:
+                    # Identical row data can't validate differently, so skip it
+                    if old != new:
+                        before = validator(model_class, old)
+                        after = validator(model_class, new)
+                        changes = {
+                            name: (getattr(before, name), getattr(after, name))
+                            for name in model_class.model_fields
+                            if getattr(before, name) != getattr(after, name)
+                        }
+                        if changes:
+                            yield RowDiff(
+                                new['row_id'],
+                                'changed',
+                                before,
+                                after,
+                                changes,
+                                new.get('subrow_id'),
+                            )
+                    old, new = await next_old(), await next_new()
+
+    def _raw_sheet_pages(
+        self,
+        model_class: type[Model],
+        after: Optional[int | str] = None,
+        *,
+        partitions: int = 1,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        **params,
+    ) -> AsyncGenerator[list[dict], None]:
+        """Page through every row of a model's sheet, yielding flattened row data.
+
+        The paging behind `sheet_all`, also used by xivapy.export and SheetMirror,
+        which build their own rows from the data. The version, schema and fields
+        params default to the client's and the model's, as for `sheet_all`.
+        """
+        self._add_version_params(params)
+        if 'fields' not in params:
+            params['fields'] = model_class.get_fields_str()
+
+        sheet_name = model_class.get_sheet_name()
+        if partitions > 1:
+            return self._partitioned_sheet_pages(
+                sheet_name, after, partitions, concurrency, ordered, **params
+            )
+        return self._sheet_pages(sheet_name, after, **params)
+
+    async def _get_all_rows[T: Model](
+        self,
+        model_class: type[T],
+        after: Optional[int | str],
+        validator: _RowValidator,
+        partitions: int = 1,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        **params,
+    ) -> AsyncIterator[T]:
+        """An internal method for fetching every row of a sheet."""
+        pages = self._raw_sheet_pages(
+            model_class,
+            after,
+            partitions=partitions,
+            concurrency=concurrency,
+            ordered=ordered,
+            **params,
+        )
+        async with aclosing(pages):
+            async for page in pages:
+                for model in self._validate_page(model_class, page, validator):
+                    yield model
+
     async def _get_single_row[T: Model](
         self,
         model_class: type[T],
         row: int,
+        validator: _RowValidator,
         **params,
     ) -> Optional[T]:
         """An internal method for fetching a single row."""
@@ -452,35 +1618,68 @@ class Client:
         if 'fields' not in params:
             params['fields'] = model_class.get_fields_str()
 
-        try:
-            response = await self._client.get(
-                f'{self.base_api_path}/sheet/{model_class.get_sheet_name()}/{row}',
-                params=params,
-            )
-            response.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
+        if self.coalesce_window is not None:
+            processed_data = await self._load_coalesced_row(model_class, row, params)
+            if processed_data is None:
                 return None
-            raise XIVAPIHTTPError(
-                f'Failed to get sheet rows for {model_class.get_sheet_name()}: {e}',
-                status_code=e.response.status_code,
-                response=e.response,
+        else:
+            try:
+                response = await self._get(
+                    f'{self.base_api_path}/sheet/{model_class.get_sheet_name()}/{row}',
+                    params=params,
+                    cacheable=True,
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return None
+                raise XIVAPIHTTPError(
+                    f'Failed to get sheet rows for {model_class.get_sheet_name()}: {e}',
+                    status_code=e.response.status_code,
+                    response=e.response,
+                )
+
+            data = response.json()
+            if not data or 'row_id' not in data:
+                return None
+            processed_data = self._flatten_item_data(data)
+
+        return validator(model_class, processed_data)
+
+    async def _load_coalesced_row(
+        self, model_class: type[Model], row: int, params: dict
+    ) -> Optional[dict]:
+        """Fetch a single row's data as part of a batch shared with other callers."""
+        sheet_name = model_class.get_sheet_name()
+        key = (sheet_name, tuple(sorted((k, str(v)) for k, v in params.items())))
+        loader = self._row_loaders.get(key)
+        if loader is None:
+            loader = BatchLoader(
+                partial(self._load_rows_by_id, sheet_name, params),
+                max_batch=self.batch_size,
+                window=cast(float, self.coalesce_window),
             )
+            self._row_loaders[key] = loader
 
-        data = response.json()
-        if not data or 'row_id' not in data:
-            return None
-        processed_data = self._flatten_item_data(data)
+        data = await loader.load(row)
+        # Every caller for the same row shares the same dict; don't let validation
+        # of one leak into another
+        return dict(data) if data is not None else None
 
-        try:
-            return model_class.model_validate(processed_data)
-        except ValidationError as e:
-            raise ModelValidationError(model_class, e, processed_data)
+    async def _load_rows_by_id(
+        self, sheet_name: str, params: dict, rows: list[int]
+    ) -> dict[int, dict]:
+        """Fetch a batch of rows, keyed by row id."""
+        rows_data = await self._get_rows_data(sheet_name, rows, **params)
+        return {data['row_id']: data for data in rows_data}
 
     async def _get_multiple_rows[T: Model](
         self,
         model_class: type[T],
         rows: Iterable[int] | AsyncIterable[int],
+        validator: _RowValidator,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
         **params,
     ) -> AsyncIterator[T]:
         """An internal method for fetching multiple rows."""
@@ -488,31 +1687,66 @@ class Client:
         if 'fields' not in params:
             params['fields'] = model_class.get_fields_str()
 
+        if concurrency is None:
+            concurrency = self.concurrency
+        if concurrency > 1:
+            jobs = (
+                self._fetch_batch(model_class, batch, validator, **params)
+                async for batch in self._iter_batches(rows)
+            )
+            async with aclosing(windowed(jobs, concurrency, ordered=ordered)) as pages:
+                async for page in pages:
+                    for item in page:
+                        yield item
+        else:
+            async for batch in self._iter_batches(rows):
+                async with aclosing(
+                    self._process_batch(model_class, batch, validator, **params)
+                ) as items:
+                    async for item in items:
+                        yield item
+
+    async def _iter_batches(
+        self, rows: Iterable[int] | AsyncIterable[int]
+    ) -> AsyncIterator[Sequence[int]]:
+        """Split row ids (sync or async) into batches of `batch_size`."""
         if hasattr(rows, '__aiter__'):
             # mypy can't resolve aiostream types correctly in some cases - see upstream issue:
             # https://github.com/vxgmichel/aiostream/issues/105
             async with chunks(rows, self.batch_size).stream() as streamer:  # pyright: ignore[reportArgumentType]
                 async for batch in streamer:
-                    batch_seq = cast(Sequence[int], batch)
-                    async for item in self._process_batch(
-                        model_class, batch_seq, **params
-                    ):
-                        yield item
+                    yield cast(Sequence[int], batch)
         else:
             for batch in batched(rows, self.batch_size):  # pyright: ignore[reportArgumentType]
-                async for item in self._process_batch(model_class, batch, **params):
-                    yield item
+                yield batch
 
-    async def _process_batch[T: Model](
-        self, model_class: type[T], batch: Sequence[int], **params
-    ) -> AsyncIterator[T]:
+    async def _fetch_batch[T: Model](
+        self,
+        model_class: type[T],
+        batch: Sequence[int],
+        validator: _RowValidator,
+        **params,
+    ) -> list[T]:
+        """Fetch a whole batch of rows at once, for use with concurrent fetching."""
+        return [
+            item
+            async for item in self._process_batch(
+                model_class, batch, validator, **params
+            )
+        ]
+
+    async def _get_rows_response(
+        self, sheet_name: str, batch: Sequence[int], **params
+    ) -> httpx.Response:
+        """Fetch a batch of rows from a sheet."""
         # TODO: allow overriding batch-size in sheet
         rows_param = ','.join(str(id) for id in batch)
 
         try:
-            response = await self._client.get(
-                f'{self.base_api_path}/sheet/{model_class.get_sheet_name()}',
+            response = await self._get(
+                f'{self.base_api_path}/sheet/{sheet_name}',
                 params={**params, 'rows': rows_param},
+                cacheable=True,
             )
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
@@ -520,14 +1754,257 @@ class Client:
                 '', status_code=e.response.status_code, response=e.response
             )
 
+        return response
+
+    def _parse_rows(self, response: httpx.Response) -> list[dict]:
+        """Decode a batch of rows into flattened row data."""
         data = response.json()
 
-        for item_data in data.get('rows', []):
-            if not item_data or 'row_id' not in item_data:
-                continue
+        return [
+            self._flatten_item_data(item_data)
+            for item_data in data.get('rows', [])
+            if item_data and 'row_id' in item_data
+        ]
+
+    async def _get_rows_data(
+        self, sheet_name: str, batch: Sequence[int], **params
+    ) -> list[dict]:
+        """Fetch a batch of rows from a sheet as flattened row data."""
+        return self._parse_rows(
+            await self._get_rows_response(sheet_name, batch, **params)
+        )
+
+    async def _stream_rows(
+        self, sheet_name: str, batch: Sequence[int], **params
+    ) -> AsyncGenerator[dict, None]:
+        """Stream a batch of rows from a sheet, yielding flattened row data as it arrives."""
+        rows_param = ','.join(str(id) for id in batch)
 
-            processed_data = self._flatten_item_data(item_data)
+        try:
+            async with aclosing(
+                self._stream_items(
+                    f'{self.base_api_path}/sheet/{sheet_name}',
+                    {**params, 'rows': rows_param},
+                    JSONArrayStream('rows'),
+                )
+            ) as items:
+                async for item_data in items:
+                    if item_data and 'row_id' in item_data:
+                        yield self._flatten_item_data(item_data)
+        except httpx.HTTPStatusError as e:
+            raise XIVAPIHTTPError(
+                '', status_code=e.response.status_code, response=e.response
+            )
+
+    async def _sheet_pages(
+        self,
+        sheet_name: str,
+        after: Optional[int | str] = None,
+        until: Optional[int] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+        **params,
+    ) -> AsyncGenerator[list[dict], None]:
+        """Page through a sheet's rows in row id order, yielding flattened row data.
+
+        Paging stops at the first empty page, or after row id `until` if given. A
+        short page isn't taken as the end, since the API may cap `limit` below
+        `batch_size`. If `limiter` is given, each request waits for it first.
+        """
+        while True:
+            items = await self._list_rows(
+                sheet_name, after, self.batch_size, limiter, **params
+            )
+            exhausted = False
+            if until is not None and items and items[-1]['row_id'] > until:
+                items = [item for item in items if item['row_id'] <= until]
+                exhausted = True
+            if not items:
+                return
+
+            last = items[-1]
+            # Sheets with subrows page by row:subrow, or we'd never get past a row
+            # with more subrows than fit in a page
+            if 'subrow_id' in last:
+                cursor: int | str = f'{last["row_id"]}:{last["subrow_id"]}'
+            else:
+                cursor = last['row_id']
+            # Guard against a page that doesn't move us forward
+            exhausted = exhausted or cursor == after
+            after = cursor
+
+            yield [self._flatten_item_data(item) for item in items]
+
+            if exhausted:
+                return
+
+    async def _list_rows(
+        self,
+        sheet_name: str,
+        after: Optional[int | str],
+        limit: int,
+        limiter: Optional[asyncio.Semaphore] = None,
+        **params,
+    ) -> list[dict]:
+        """Fetch up to `limit` raw rows of a sheet following row `after`."""
+        list_params = {**params, 'limit': limit}
+        if after is not None:
+            list_params['after'] = after
+
+        try:
+            async with limiter if limiter is not None else nullcontext():
+                response = await self._get(
+                    f'{self.base_api_path}/sheet/{sheet_name}',
+                    params=list_params,
+                    cacheable=True,
+                )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise XIVAPIHTTPError(
+                f'Failed to get sheet rows for {sheet_name}: {e}',
+                status_code=e.response.status_code,
+                response=e.response,
+            )
+
+        return [
+            item
+            for item in response.json().get('rows', [])
+            if item and 'row_id' in item
+        ]
+
+    async def _partitioned_sheet_pages(
+        self,
+        sheet_name: str,
+        after: Optional[int | str],
+        partitions: int,
+        concurrency: Optional[int],
+        ordered: bool,
+        **params,
+    ) -> AsyncGenerator[list[dict], None]:
+        """Page through several row id ranges of a sheet at once."""
+        bounds = await self._partition_bounds(sheet_name, after, partitions, **params)
+        if bounds is None:
+            return
+
+        # One limit shared by every partition, so adding partitions doesn't add requests
+        limit = min(
+            concurrency if concurrency is not None else partitions,
+            self._max_connections,
+        )
+        limiter = asyncio.Semaphore(limit)
+        starts: list[Optional[int | str]] = [after, *bounds]
+        ends: list[Optional[int]] = [*bounds, None]
+        sources = [
+            self._sheet_pages(sheet_name, start, end, limiter, **params)
+            for start, end in zip(starts, ends)
+        ]
+        # When ordered, later partitions hold their pages until it's their turn; give
+        # them enough room to keep every connection busy for a while meanwhile
+        lookahead = limit * _ORDERED_PAGES_AHEAD
+        async with aclosing(
+            merge(sources, ordered=ordered, lookahead=lookahead)
+        ) as pages:
+            async for page in pages:
+                yield page
+
+    async def _partition_bounds(
+        self, sheet_name: str, after: Optional[int | str], partitions: int, **params
+    ) -> Optional[list[int]]:
+        """Split a sheet's row ids (after `after`) into roughly equal ranges.
+
+        Returns the row ids each range ends on (the last range is open-ended; no
+        ids at all if the rows fit in one page), or None if there are no rows at all.
+        At most `_PARTITION_PROBES` requests are made, one after another.
+        """
+
+        async def first_after(row: Optional[int | str]) -> Optional[int]:
+            items = await self._list_rows(sheet_name, row, 1, **params)
+            return items[0]['row_id'] if items else None
+
+        page = await self._list_rows(sheet_name, after, self.batch_size, **params)
+        if not page:
+            return None
+        first = page[0]['row_id']
+        # A sheet that fits in one page isn't worth splitting
+        if (row := await first_after(page[-1]['row_id'])) is None:
+            return []
+
+        # Quadruple until we're past the last row, then narrow that down, all
+        # within a fixed number of requests; the last range is open-ended, so it
+        # only has to be close enough to split evenly
+        probes = _PARTITION_PROBES - 2
+        low, high = row, max(row, 1) * 4
+        while probes:
+            probes -= 1
+            if (row := await first_after(high)) is None:
+                break
+            low, high = row, row * 4
+        tolerance = max(1, (high - first) // (partitions * 4))
+        while probes and high - low > tolerance:
+            probes -= 1
+            middle = (low + high) // 2
+            if (row := await first_after(middle)) is None:
+                high = middle
+            else:
+                low = row
+
+        span = high - first + 1
+        bounds = sorted(
+            {first - 1 + span * index // partitions for index in range(1, partitions)}
+        )
+        return [bound for bound in bounds if bound >= first]
+
+    def _validate_page[T: Model](
+        self, model_class: type[T], rows: list[dict], validator: _RowValidator
+    ) -> Iterator[T]:
+        """Yield models for a page of row data, raising once past any row that failed."""
+        models, error = validator.page(model_class, rows)
+        yield from models
+        if error is not None:
+            raise error
+
+    async def _process_batch[T: Model](
+        self,
+        model_class: type[T],
+        batch: Sequence[int],
+        validator: _RowValidator,
+        **params,
+    ) -> AsyncGenerator[T, None]:
+        if self.stream:
+            index = 0
+            async with aclosing(
+                self._stream_rows(model_class.get_sheet_name(), batch, **params)
+            ) as rows:
+                async for data in rows:
+                    try:
+                        model = validator(model_class, data)
+                    except ModelValidationError as e:
+                        e.index = index
+                        raise
+                    index += 1
+                    yield model
+            return
+
+        response = await self._get_rows_response(
+            model_class.get_sheet_name(), batch, **params
+        )
+
+        envelope_validator = (
+            model_class._get_rows_envelope()
+            if self.validate_json and validator.mode == 'full'
+            else None
+        )
+        if envelope_validator is not None:
             try:
-                yield model_class.model_validate(processed_data)
-            except ValidationError as e:
-                raise ModelValidationError(model_class, e, processed_data)
+                envelope = envelope_validator.validate_json(response.content)
+            except ValidationError:
+                # Go the long way round to find (and report) the exact bad row
+                pass
+            else:
+                for model in model_class._from_validated_rows(envelope.get('rows', [])):
+                    yield model
+                return
+
+        for model in self._validate_page(
+            model_class, self._parse_rows(response), validator
+        ):
+            yield model
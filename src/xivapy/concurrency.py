@@ -0,0 +1,418 @@
+"""Helpers for running several xivapi requests at the same time."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import deque
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+__all__ = [
+    'windowed',
+    'merge',
+    'merge_sorted',
+    'buffered',
+    'BatchLoader',
+    'SingleFlight',
+]
+
+
+async def windowed[T](
+    jobs: AsyncIterable[Awaitable[T]], size: int, *, ordered: bool = True
+) -> AsyncGenerator[T, None]:
+    """Run awaitables from an async iterable with at most `size` in flight.
+
+    Jobs are only pulled from `jobs` when there is room in the window, so a lazy
+    source (like a generator of request coroutines) never runs ahead of the window.
+
+    Args:
+        jobs: An async iterable of awaitables to run
+        size: The maximum number of awaitables running at the same time
+        ordered: If True, results are yielded in the order the jobs were pulled,
+            buffering any that finish early; otherwise results are yielded as
+            soon as they complete.
+
+    Returns:
+        An async generator of the results of each job.
+    """
+    if size < 1:
+        raise ValueError(f'Window size must be at least 1, got {size}')
+
+    iterator = aiter(jobs)
+    pending: deque[asyncio.Future[T]] = deque()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < size:
+                try:
+                    job = await anext(iterator)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.append(asyncio.ensure_future(job))
+
+            if not pending:
+                return
+
+            if ordered:
+                task = pending.popleft()
+                yield await task
+            else:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Keep submission order amongst tasks that finished together
+                for task in [task for task in pending if task in done]:
+                    pending.remove(task)
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await _aclose(iterator)
+
+
+async def merge[T](
+    sources: Sequence[AsyncIterable[T]],
+    *,
+    ordered: bool = True,
+    buffer: int = 1,
+    lookahead: Optional[int] = None,
+) -> AsyncGenerator[T, None]:
+    """Run several async iterables at the same time, merging their items into one.
+
+    Every source runs in its own task from the start, but can only get `buffer`
+    items ahead of the consumer before it has to wait. Once the merged iterator is
+    closed (or raises), any sources still running are cancelled.
+
+    Args:
+        sources: The async iterables to run
+        ordered: If True, every item of the first source is yielded, then every item
+            of the second, and so on (later sources fill their buffers meanwhile);
+            otherwise items are yielded as soon as any source produces them.
+        buffer: How many items each source may get ahead of the consumer
+        lookahead: When ordered, lets sources waiting for their turn hold up to this
+            many items between them, rather than `buffer` items each
+
+    Returns:
+        An AsyncIterator of the items of every source.
+    """
+    if buffer < 1:
+        raise ValueError(f'Buffer size must be at least 1, got {buffer}')
+    if lookahead is not None and lookahead < 1:
+        raise ValueError(f'Lookahead must be at least 1, got {lookahead}')
+
+    if ordered:
+        merged = _merge_ordered(sources, buffer, lookahead)
+        try:
+            async for item in merged:
+                yield item
+        finally:
+            await merged.aclose()
+        return
+
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(buffer * max(len(sources), 1))
+
+    async def pump(source: AsyncIterable[T]) -> None:
+        iterator = aiter(source)
+        try:
+            async for item in iterator:
+                await queue.put(('item', item))
+        except Exception as e:
+            await queue.put(('error', e))
+        else:
+            await queue.put(('done', None))
+        finally:
+            await _aclose(iterator)
+
+    tasks = [asyncio.ensure_future(pump(source)) for source in sources]
+    try:
+        remaining = len(sources)
+        while remaining:
+            kind, value = await queue.get()
+            if kind == 'error':
+                raise value
+            if kind == 'done':
+                remaining -= 1
+                continue
+            yield value
+    finally:
+        await _cancel_all(tasks)
+
+
+async def _merge_ordered[T](
+    sources: Sequence[AsyncIterable[T]], buffer: int, lookahead: Optional[int]
+) -> AsyncGenerator[T, None]:
+    """The ordered half of merge: each source's items in turn, with the rest running ahead."""
+    queues: list[deque[tuple[str, Any]]] = [deque() for _ in sources]
+    changed = asyncio.Condition()
+    # The source being yielded from, and how many items are queued across every source
+    current = 0
+    held = 0
+
+    def has_room(index: int) -> bool:
+        if index == current or lookahead is None:
+            return len(queues[index]) < buffer
+        return held - len(queues[current]) < lookahead
+
+    async def put(index: int, entry: tuple[str, Any]) -> None:
+        nonlocal held
+        async with changed:
+            if entry[0] == 'item':
+                await changed.wait_for(lambda: has_room(index))
+                held += 1
+            queues[index].append(entry)
+            changed.notify_all()
+
+    async def pump(index: int, source: AsyncIterable[T]) -> None:
+        iterator = aiter(source)
+        try:
+            async for item in iterator:
+                await put(index, ('item', item))
+        except Exception as e:
+            await put(index, ('error', e))
+        else:
+            await put(index, ('done', None))
+        finally:
+            await _aclose(iterator)
+
+    tasks = [
+        asyncio.ensure_future(pump(index, source))
+        for index, source in enumerate(sources)
+    ]
+    try:
+        for index in range(len(sources)):
+            async with changed:
+                current = index
+                changed.notify_all()
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: bool(queues[index]))
+                    kind, value = queues[index].popleft()
+                    if kind == 'item':
+                        held -= 1
+                    changed.notify_all()
+                if kind == 'error':
+                    raise value
+                if kind == 'done':
+                    break
+                yield value
+    finally:
+        await _cancel_all(tasks)
+
+
+async def _aclose(iterator: AsyncIterator[Any]) -> None:
+    """Closes an async iterator if it can be closed, like an async generator."""
+    aclose = getattr(iterator, 'aclose', None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _cancel_all(tasks: Sequence[asyncio.Future[None]]) -> None:
+    """Cancel tasks and wait for them to finish."""
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def merge_sorted[T](
+    sources: Sequence[AsyncIterable[T]], *, key: Callable[[T], Any]
+) -> AsyncGenerator[T, None]:
+    """Merge async iterables that are each already sorted into one sorted iterator.
+
+    The first item of every source is awaited at the same time; after that, only
+    the source whose item was just yielded is advanced. Items with equal keys come
+    out in the order of their sources.
+
+    Args:
+        sources: The async iterables to merge, each sorted by `key`
+        key: Returns the value to sort an item by (smallest first)
+
+    Returns:
+        An AsyncIterator of the items of every source, sorted by `key`.
+    """
+    iterators = [aiter(source) for source in sources]
+    heap: list[tuple[Any, int, T]] = []
+
+    async def advance(index: int) -> None:
+        try:
+            item = await anext(iterators[index])
+        except StopAsyncIteration:
+            return
+        heapq.heappush(heap, (key(item), index, item))
+
+    try:
+        tasks = [
+            asyncio.ensure_future(advance(index)) for index in range(len(iterators))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        while heap:
+            _, index, item = heapq.heappop(heap)
+            yield item
+            await advance(index)
+    finally:
+        for iterator in iterators:
+            await _aclose(iterator)
+
+
+def buffered[T](source: AsyncIterable[T], size: int) -> AsyncGenerator[T, None]:
+    """Run an async iterable in the background, up to `size` items ahead of the consumer.
+
+    The source is started on first iteration and cancelled once the returned
+    iterator is closed, so nothing is left running if the consumer stops early.
+    """
+    return merge([source], buffer=size)
+
+
+class BatchLoader[K, V]:
+    """Coalesce individual loads into batched calls, in the style of DataLoader.
+
+    Keys requested within `window` seconds of each other (or until `max_batch`
+    keys are waiting) are handed to `load_batch` in one call; each caller then
+    receives the value for its own key, or None if the batch didn't return it.
+    Requesting a key that is already waiting shares the pending result.
+
+    Args:
+        load_batch: Coroutine function taking a list of keys and returning a
+            mapping of key to value for every key that was found
+        max_batch: The most keys to send to a single `load_batch` call
+        window: How long (in seconds) to wait for more keys before loading
+    """
+
+    def __init__(
+        self,
+        load_batch: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        *,
+        max_batch: int,
+        window: float,
+    ) -> None:
+        """Initializes an empty BatchLoader."""
+        self.load_batch = load_batch
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: dict[K, asyncio.Future[Optional[V]]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """Queue up a key to be loaded with the next batch and wait for its value."""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # shield so one cancelled caller doesn't cancel the result for everyone
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Hand everything waiting off to a background load."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[K, asyncio.Future[Optional[V]]]) -> None:
+        """Load a batch and resolve the futures waiting on it."""
+        try:
+            results = await self.load_batch(list(pending))
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark as retrieved; callers that went away shouldn't warn
+                    future.exception()
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+class SingleFlight[K, V]:
+    """Share a single in-flight call between everyone asking for the same key.
+
+    While a call for a key is running, further callers with that key wait on the
+    same result instead of starting their own. Once it finishes the key is
+    forgotten, so the next caller starts a fresh call.
+
+    Cancelling a waiter only cancels that waiter; the underlying call is only
+    cancelled once every waiter for it has gone away.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty SingleFlight."""
+        self._calls: dict[K, _Call[V]] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """Await `fn()`, or the result of an identical call that's already running.
+
+        Args:
+            key: Identifies calls that can share a result
+            fn: Called to start the call if one isn't already running for `key`
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Last one out cancels the underlying call
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: K, call: _Call[V]) -> None:
+        """Stop sharing `call` for `key`, if it's still the current one."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class _Call[V]:
+    """Bookkeeping for one shared call in SingleFlight."""
+
+    def __init__(self, task: asyncio.Future[V]) -> None:
+        self.task = task
+        self.waiters = 0
@@ -60,6 +60,7 @@ class ModelValidationError(XIVAPIError):
         model_class: type,
         validation_error: ValidationError,
         raw_data: Optional[dict] = None,
+        index: Optional[int] = None,
     ) -> None:
         """Raised when xivapy.Model fails to validate.
 
@@ -71,12 +72,14 @@ class ModelValidationError(XIVAPIError):
             model_class: The model that failed validation
             validation_error: A pydantic validation error explaining what failed to validate
             raw_data: The data that failed to validate
+            index: Where the row that failed sits in the page of results it came from, if any
         """
         message = f'Failed to validate data for model {model_class.__name__}: {validation_error}'
         super().__init__(message)
         self.model_class = model_class
         self.validation_error = validation_error
         self.raw_data = raw_data
+        self.index = index
 
 
 class QueryBuildError(XIVAPIError):
@@ -0,0 +1,284 @@
+"""Exporting sheet rows and search results to Arrow and Parquet.
+
+Needs pyarrow, which isn't installed with xivapy by default; install it with
+`pip install xivapy[arrow]`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, Iterable
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional, get_args, get_origin
+from typing import is_typeddict
+import json
+
+from pydantic import BaseModel
+
+from xivapy.client import Client
+from xivapy.model import Model, _field_type
+from xivapy.query import QueryBuilder
+
+__all__ = ['arrow_schema', 'sheet_batches', 'search_batches', 'write_parquet']
+
+
+def _pyarrow() -> Any:
+    """Imports pyarrow, explaining how to install it if it's missing."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            'Exporting to Arrow needs pyarrow; install it with `pip install xivapy[arrow]`'
+        ) from e
+    return pyarrow
+
+
+def _arrow_type(annotation: Any) -> tuple[Any, bool]:
+    """Returns the Arrow type for a field annotation, and whether values go in as JSON."""
+    pa = _pyarrow()
+    annotation = _field_type(annotation)
+    origin = get_origin(annotation)
+
+    # bool first, as it's also an int
+    if annotation is bool:
+        return pa.bool_(), False
+    if annotation is int:
+        return pa.int64(), False
+    if annotation is float:
+        return pa.float64(), False
+    if annotation is str:
+        return pa.string(), False
+    if is_typeddict(annotation):
+        # LangDict and friends become a struct with a column per key
+        fields = []
+        for key, value in annotation.__annotations__.items():
+            value_type, as_json = _arrow_type(value)
+            if as_json:
+                return pa.string(), True
+            fields.append(pa.field(key, value_type))
+        return pa.struct(fields), False
+    if origin in (list, tuple) and get_args(annotation):
+        item_type, as_json = _arrow_type(get_args(annotation)[0])
+        if not as_json:
+            return pa.list_(item_type), False
+    # Anything else (nested models, dicts, Any) is kept as its JSON text
+    return pa.string(), True
+
+
+def arrow_schema(model_class: type[Model], *, search: bool = False) -> Any:
+    """Builds the Arrow schema rows of a model are exported with.
+
+    There's a column per model field, typed from the field's annotation: ints,
+    floats, bools and strings map to their Arrow types, LangDicts (and other
+    TypedDicts) to structs, and lists to lists. Anything else, like a nested
+    model, is a string column holding the value as JSON. A `row_id` column comes
+    first if the model has no field mapped to it.
+
+    Args:
+        model_class: The model to build the schema for
+        search: Add `score` and `sheet` columns first, for search results
+
+    Returns:
+        A pyarrow.Schema.
+    """
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            pa.field(name, arrow_type)
+            for name, (arrow_type, _) in _columns(model_class, search).items()
+        ]
+    )
+
+
+def _columns(model_class: type[Model], search: bool) -> dict[str, tuple[Any, bool]]:
+    """Returns each column's Arrow type and whether its values go in as JSON."""
+    pa = _pyarrow()
+    columns: dict[str, tuple[Any, bool]] = {}
+    if search:
+        columns['score'] = (pa.float64(), False)
+        columns['sheet'] = (pa.string(), False)
+    row_id_mapped = any(
+        (mapping := model_class._get_field_mapping(info)) is not None
+        and mapping.base_field == 'row_id'
+        for info in model_class.model_fields.values()
+    )
+    if not row_id_mapped and 'row_id' not in model_class.model_fields:
+        columns['row_id'] = (pa.int64(), False)
+    for name, info in model_class.model_fields.items():
+        columns[name] = _arrow_type(info.annotation)
+    return columns
+
+
+class _BatchBuilder:
+    """Turns pages of flattened row data straight into Arrow record batches."""
+
+    def __init__(self, model_class: type[Model], search: bool) -> None:
+        pa = _pyarrow()
+        self.model_class = model_class
+        self.schema = arrow_schema(model_class, search=search)
+        self._columns = _columns(model_class, search)
+        self._from_array = pa.array
+        self._record_batch = pa.RecordBatch.from_arrays
+
+    def build(
+        self, rows: Iterable[dict], extra: Optional[dict[str, list]] = None
+    ) -> Any:
+        """Builds a record batch from flattened rows, plus any ready-made columns."""
+        values: dict[str, list] = {name: [] for name in self._columns}
+        if extra:
+            values.update(extra)
+        fill = [name for name in self._columns if not extra or name not in extra]
+        process: Callable[[dict], dict] = self.model_class.process_xivapi_response
+        for data in rows:
+            # The field mapping works on plain dicts, so no model is ever built
+            mapped = process(data)
+            for name in fill:
+                values[name].append(mapped.get(name))
+
+        arrays = []
+        for name, (arrow_type, as_json) in self._columns.items():
+            column = values[name]
+            if as_json:
+                column = [
+                    None if value is None else json.dumps(value, default=_json_default)
+                    for value in column
+                ]
+            arrays.append(self._from_array(column, type=arrow_type))
+        return self._record_batch(arrays, schema=self.schema)
+
+
+def _json_default(value: Any) -> Any:
+    """Encodes values json can't, such as models built by a custom field."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    return str(value)
+
+
+async def sheet_batches(
+    client: Client,
+    model_class: type[Model],
+    *,
+    rows: Optional[Iterable[int] | AsyncIterable[int]] = None,
+    after: Optional[int | str] = None,
+    **params,
+) -> AsyncIterator[Any]:
+    """Fetches sheet rows as Arrow record batches, one per page (or batch) of rows.
+
+    Rows go from the response into columns without a model being built for each
+    one. The field mapping is applied as usual, but values are used as xivapi
+    sent them, with no validation (like `validate='trusted'`).
+
+    Args:
+        client: The client to fetch rows with
+        model_class: The model whose fields (and mappings) make the columns
+        rows: The row ids to fetch, like `Client.sheet(rows=...)`; every row of
+            the sheet (like `Client.sheet_all`) if not given
+        after: When fetching every row, only fetch rows after this row id
+        **params: Extra parameters which are passed to the sheets endpoint
+
+    Returns:
+        An AsyncIterator of pyarrow.RecordBatches, all with `arrow_schema(model_class)`.
+    """
+    builder = _BatchBuilder(model_class, search=False)
+    if rows is None:
+        pages = client._raw_sheet_pages(model_class, after, **params)
+        async with aclosing(pages):
+            async for page in pages:
+                yield builder.build(page)
+        return
+
+    client._add_version_params(params)
+    if 'fields' not in params:
+        params['fields'] = model_class.get_fields_str()
+    sheet_name = model_class.get_sheet_name()
+    async for batch in client._iter_batches(rows):
+        yield builder.build(await client._get_rows_data(sheet_name, batch, **params))
+
+
+async def search_batches(
+    client: Client,
+    model_class: type[Model],
+    query: QueryBuilder | str,
+    *,
+    limit: Optional[int] = None,
+    **params,
+) -> AsyncIterator[Any]:
+    """Searches a model's sheet, yielding the results as Arrow record batches.
+
+    One batch is made per page of results, with `score`, `sheet` and `row_id`
+    columns ahead of the model's fields; like `sheet_batches`, no model is built
+    for each result.
+
+    Args:
+        client: The client to search with
+        model_class: The model whose sheet to search, and whose fields make the columns
+        query: A QueryBuilder search or a plain string with the search terms
+        limit: The most results to return
+        **params: Additional search parameters
+
+    Returns:
+        An AsyncIterator of pyarrow.RecordBatches, all with
+        `arrow_schema(model_class, search=True)`.
+    """
+    if limit is not None and limit < 0:
+        raise ValueError(f'limit must not be negative, got {limit}')
+    builder = _BatchBuilder(model_class, search=True)
+    search_params = client._search_params((model_class,), query, **params)
+
+    async with aclosing(client._raw_search_pages(search_params, limit)) as pages:
+        async for page in pages:
+            extra = {
+                'score': [result.get('score', 0.0) for result in page],
+                'sheet': [result['sheet'] for result in page],
+            }
+            yield builder.build(
+                (
+                    {**result.get('fields', {}), 'row_id': result['row_id']}
+                    for result in page
+                ),
+                extra,
+            )
+
+
+async def write_parquet(
+    batches: AsyncIterable[Any], path: str | Path, *, schema: Any = None, **options
+) -> int:
+    """Writes record batches to a Parquet file as they arrive.
+
+    Each batch is written out (as its own row group) before the next is read, so
+    only one batch is held in memory at a time.
+
+    Args:
+        batches: Record batches, as made by `sheet_batches` or `search_batches`
+        path: The Parquet file to write
+        schema: The file's schema; defaults to the first batch's schema. Pass one
+            to write an empty file when there are no batches.
+        **options: Passed to pyarrow.parquet.ParquetWriter, e.g. `compression='zstd'`
+
+    Returns:
+        The number of rows written.
+
+    Example:
+        ```python
+        from xivapy.export import sheet_batches, write_parquet
+
+        await write_parquet(sheet_batches(client, Item), 'items.parquet')
+        ```
+    """
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    writer = None
+    written = 0
+    try:
+        async for batch in batches:
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema or batch.schema, **options)
+            writer.write_batch(batch)
+            written += batch.num_rows
+        if writer is None and schema is not None:
+            writer = pq.ParquetWriter(path, schema, **options)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
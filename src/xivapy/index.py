@@ -0,0 +1,310 @@
+"""Secondary indexes over sheet rows held locally."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, ClassVar, Iterator, Optional
+
+from xivapy.query import Query, QueryDescriptor
+
+__all__ = ['Index', 'HashIndex', 'SortedIndex', 'NgramIndex']
+
+
+class Index(ABC):
+    """Interface for an index over one xivapi field of some locally held rows.
+
+    Indexes map field values to row ids, and answer a `Query` on their field with
+    the ids of exactly the rows matching it, using the same comparison rules as
+    `LocalSheet.search`. Queries made by comparing `QueryField`s
+    (`Item.level >= 600`) work directly as probes.
+
+    Args:
+        field: The xivapi field (as used in queries) to index, or a QueryField
+    """
+
+    operations: ClassVar[frozenset[str]] = frozenset()
+
+    def __init__(self, field: str | QueryDescriptor) -> None:
+        """Initializes an empty index."""
+        self.field = field.xivapi_field if isinstance(field, QueryDescriptor) else field
+
+    def __len__(self) -> int:
+        """Returns the number of rows indexed."""
+        return len(self._rows())
+
+    def supports(self, query: Query) -> bool:
+        """Returns whether this index can answer the query."""
+        return query.field == self.field and query.operation in self.operations
+
+    def probe(self, query: Query) -> Optional[set[int]]:
+        """Finds the rows matching a query on this index's field.
+
+        The query's required/excluded flags are ignored; it's treated as a plain
+        comparison.
+
+        Args:
+            query: The query to answer, e.g. `Item.level >= 600`
+
+        Returns:
+            The ids of the matching rows, or None if the index can't answer the
+            query (say, a range over strings in a SortedIndex).
+
+        Raises:
+            ValueError: If the query is for another field, or an operation this
+                kind of index doesn't handle
+        """
+        if query.field != self.field:
+            raise ValueError(
+                f'{type(self).__name__} on {self.field!r} cannot answer a query on {query.field!r}'
+            )
+        if query.operation not in self.operations:
+            raise ValueError(
+                f'{type(self).__name__} cannot answer {query.operation!r} queries'
+            )
+        return self._probe(query)
+
+    @abstractmethod
+    def add(self, row_id: int, value: Any) -> None:
+        """Indexes a row's value for the field, replacing anything indexed for it before.
+
+        LangDict, dict and list values are indexed by each of the values they hold.
+        """
+
+    @abstractmethod
+    def remove(self, row_id: int) -> None:
+        """Removes a row from the index, if it's there."""
+
+    @abstractmethod
+    def _rows(self) -> dict[int, Any]:
+        """Returns what's indexed for each row."""
+
+    @abstractmethod
+    def _probe(self, query: Query) -> Optional[set[int]]:
+        """Answers a query already known to be on this field and operation."""
+
+
+class HashIndex(Index):
+    """Answers `=` queries with one dictionary lookup.
+
+    Strings are compared ignoring case, as xivapi does.
+
+    Example:
+        >>> index = HashIndex(Item.name)
+        >>> index.add(1, 'Iron Sword')
+        >>> index.probe(Item.name == 'iron sword')
+        {1}
+    """
+
+    operations = frozenset({'='})
+
+    def __init__(self, field: str | QueryDescriptor) -> None:
+        """Initializes an empty hash index."""
+        super().__init__(field)
+        self._postings: dict[Any, set[int]] = {}
+        self._keys: dict[int, set[Any]] = {}
+
+    def add(self, row_id: int, value: Any) -> None:
+        """Indexes a row's value for the field."""
+        self.remove(row_id)
+        keys = set()
+        for item in _scalars(value):
+            try:
+                keys.add(_hash_key(item))
+            except TypeError:
+                # Unhashable values (like nested models) never equal a query value
+                continue
+        self._keys[row_id] = keys
+        for key in keys:
+            self._postings.setdefault(key, set()).add(row_id)
+
+    def remove(self, row_id: int) -> None:
+        """Removes a row from the index, if it's there."""
+        for key in self._keys.pop(row_id, ()):
+            posting = self._postings[key]
+            posting.discard(row_id)
+            if not posting:
+                del self._postings[key]
+
+    def _rows(self) -> dict[int, Any]:
+        return self._keys
+
+    def _probe(self, query: Query) -> Optional[set[int]]:
+        try:
+            return set(self._postings.get(_hash_key(query.value), ()))
+        except TypeError:
+            return None
+
+
+class SortedIndex(Index):
+    """Answers `<`, `<=`, `>` and `>=` queries on numbers with a binary search.
+
+    Values are kept in a sorted array alongside an array of row ids, which is
+    rebuilt on the first probe after rows change; best suited to rows that are
+    loaded once and then searched many times. Values that aren't numbers are left
+    out, as they never match a numeric comparison.
+
+    Example:
+        >>> index = SortedIndex(Item.level)
+        >>> for row_id, level in [(1, 10), (2, 30), (3, 50)]:
+        ...     index.add(row_id, level)
+        >>> index.probe(Item.level >= 30)
+        {2, 3}
+    """
+
+    operations = frozenset({'<', '<=', '>', '>='})
+
+    def __init__(self, field: str | QueryDescriptor) -> None:
+        """Initializes an empty sorted index."""
+        super().__init__(field)
+        self._values: dict[int, list[float]] = {}
+        self._sorted_values = array('d')
+        self._sorted_ids = array('q')
+        self._stale = False
+
+    def add(self, row_id: int, value: Any) -> None:
+        """Indexes a row's value for the field."""
+        self._values[row_id] = [
+            item for item in _scalars(value) if isinstance(item, (int, float))
+        ]
+        self._stale = True
+
+    def remove(self, row_id: int) -> None:
+        """Removes a row from the index, if it's there."""
+        if self._values.pop(row_id, None) is not None:
+            self._stale = True
+
+    def _rows(self) -> dict[int, Any]:
+        return self._values
+
+    def _rebuild(self) -> None:
+        """Sorts every indexed value into the search arrays."""
+        pairs = sorted(
+            (value, row_id)
+            for row_id, values in self._values.items()
+            for value in values
+        )
+        self._sorted_values = array('d', (value for value, _ in pairs))
+        self._sorted_ids = array('q', (row_id for _, row_id in pairs))
+        self._stale = False
+
+    def _probe(self, query: Query) -> Optional[set[int]]:
+        target = query.value
+        if not isinstance(target, (int, float)):
+            return None
+        if self._stale:
+            self._rebuild()
+
+        values = self._sorted_values
+        if query.operation == '<':
+            ids = self._sorted_ids[: bisect_left(values, target)]
+        elif query.operation == '<=':
+            ids = self._sorted_ids[: bisect_right(values, target)]
+        elif query.operation == '>':
+            ids = self._sorted_ids[bisect_right(values, target) :]
+        else:
+            ids = self._sorted_ids[bisect_left(values, target) :]
+        return set(ids)
+
+
+class NgramIndex(Index):
+    """Answers `~` (contains) queries on strings through an inverted index of n-grams.
+
+    Every string is split into its overlapping n-character pieces (ignoring case),
+    each mapped to the rows containing it. A search looks up the pieces of the
+    text searched for, keeps the rows having all of them, then checks those few
+    rows properly, so results are exact. LangDict fields are indexed in every
+    language they hold.
+
+    Args:
+        field: The xivapi field (as used in queries) to index, or a QueryField
+        n: The length of the pieces strings are split into
+
+    Example:
+        >>> index = NgramIndex(Item.name)
+        >>> index.add(1, 'Iron Sword')
+        >>> index.add(2, 'Iron Shield')
+        >>> index.probe(Item.name.contains('SWOR'))
+        {1}
+    """
+
+    operations = frozenset({'~'})
+
+    def __init__(self, field: str | QueryDescriptor, n: int = 3) -> None:
+        """Initializes an empty n-gram index."""
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        super().__init__(field)
+        self.n = n
+        self._postings: dict[str, set[int]] = {}
+        self._strings: dict[int, list[str]] = {}
+
+    def add(self, row_id: int, value: Any) -> None:
+        """Indexes a row's value for the field."""
+        self.remove(row_id)
+        strings = [item.casefold() for item in _scalars(value) if isinstance(item, str)]
+        self._strings[row_id] = strings
+        for gram in {gram for string in strings for gram in self._grams(string)}:
+            self._postings.setdefault(gram, set()).add(row_id)
+
+    def remove(self, row_id: int) -> None:
+        """Removes a row from the index, if it's there."""
+        strings = self._strings.pop(row_id, None)
+        if strings is None:
+            return
+        for gram in {gram for string in strings for gram in self._grams(string)}:
+            posting = self._postings[gram]
+            posting.discard(row_id)
+            if not posting:
+                del self._postings[gram]
+
+    def _rows(self) -> dict[int, Any]:
+        return self._strings
+
+    def _grams(self, string: str) -> Iterator[str]:
+        """Splits a string into its n-grams; shorter strings are kept whole."""
+        if len(string) <= self.n:
+            yield string
+            return
+        for start in range(len(string) - self.n + 1):
+            yield string[start : start + self.n]
+
+    def _probe(self, query: Query) -> Optional[set[int]]:
+        needle = str(query.value).casefold()
+        if len(needle) >= self.n:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in set(self._grams(needle))),
+                key=len,
+            )
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            # Too short to have n-grams of its own; any gram containing it will do
+            candidates = set()
+            for gram, posting in self._postings.items():
+                if needle in gram:
+                    candidates |= posting
+        return {
+            row_id
+            for row_id in candidates
+            if any(needle in string for string in self._strings[row_id])
+        }
+
+
+def _scalars(value: Any) -> Iterator[Any]:
+    """Yields the plain values inside a field value, looking inside dicts and lists."""
+    if value is None:
+        return
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _scalars(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _scalars(item)
+    else:
+        yield value
+
+
+def _hash_key(value: Any) -> Any:
+    """Returns the key a value is filed under in a HashIndex."""
+    return value.casefold() if isinstance(value, str) else value
@@ -0,0 +1,366 @@
+"""Searching sheet rows held locally, without a round trip to xivapi."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, cast
+import operator
+
+from pydantic import BaseModel
+
+from xivapy.client import SearchResult
+from xivapy.exceptions import QueryBuildError
+from xivapy.index import HashIndex, Index, NgramIndex, SortedIndex
+from xivapy.model import Model
+from xivapy.query import Group, Query, QueryBuilder, QueryDescriptor
+from xivapy.types import IndexKind
+
+__all__ = ['LocalSheet']
+
+type _Row[T] = tuple[int, T]
+type _Matcher = Callable[[Any], bool]
+
+_INDEX_KINDS: dict[str, type[Index]] = {
+    'hash': HashIndex,
+    'sorted': SortedIndex,
+    'ngram': NgramIndex,
+}
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class LocalSheet[T: Model]:
+    """Rows of one sheet held in memory, searchable with the same queries as `Client.search`.
+
+    Queries are interpreted the way xivapi interprets them: every required (`+`)
+    clause has to match, no excluded (`-`) clause may match, and when there are no
+    required clauses at least one of the others has to. Groups match when their
+    items would match as a query of their own. Fields are named as they are in
+    xivapi (`Name`, `ContentType.Name`, `Name@lang(ja)`), and are looked up through
+    the model's field mappings, so the model needs a field for anything queried.
+
+    Comparisons follow xivapi too: `=` and `~` ignore case for strings, `~` matches
+    anywhere in the string, and a `LangDict` (or list) field matches when any of
+    its values does. Scores are the fraction of non-excluded clauses a row
+    matched, so they're comparable within a search but not to xivapi's.
+
+    Without indexes every search checks every row. Indexes made with
+    `create_index` let searches go straight to the rows matching their required
+    clauses (or, with none, their optional ones) and check only those.
+
+    Args:
+        model_class: The model the rows are instances of
+        rows: Rows to start with, either as a mapping of row id to row, or as rows
+            whose model has a `row_id` field
+
+    Example:
+        >>> items = LocalSheet(Item, [item async for item in client.sheet_all(Item)])
+        >>> query = QueryBuilder().contains(Name='Sword').gte(LevelItem=600).required()
+        >>> for result in items.search(query):
+        ...     print(result.row_id, result.data.name)
+    """
+
+    def __init__(self, model_class: type[T], rows: Mapping[int, T] | Iterable[T] = ()):
+        """Initializes a local sheet, optionally with some rows."""
+        self.model_class = model_class
+        self._rows: dict[int, T] = {}
+        self._fields = _xivapi_fields(model_class)
+        self._row_id_field = self._fields.get('row_id', (None,))[0]
+        self._indexes: dict[str, list[tuple[Index, Callable[[_Row[T]], Any]]]] = {}
+        if isinstance(rows, Mapping):
+            for row_id, row in cast(Mapping[int, T], rows).items():
+                self.add(row, row_id=row_id)
+        else:
+            for row in rows:
+                self.add(row)
+
+    def __len__(self) -> int:
+        """Returns the number of rows held."""
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterates over the rows, in row id order."""
+        return (self._rows[row_id] for row_id in sorted(self._rows))
+
+    def __contains__(self, row_id: object) -> bool:
+        """Returns whether a row with this id is held."""
+        return row_id in self._rows
+
+    def add(self, row: T, row_id: Optional[int] = None) -> None:
+        """Adds a row, replacing any row with the same id.
+
+        Args:
+            row: The row to add
+            row_id: The row's id; taken from the row's `row_id` field if not given
+
+        Raises:
+            ValueError: If no row id was given and the row doesn't have one
+        """
+        if row_id is None:
+            if self._row_id_field is not None:
+                row_id = getattr(row, self._row_id_field, None)
+            if row_id is None:
+                raise ValueError(
+                    f'{self.model_class.__name__} rows need a row_id field, or row_id passed in'
+                )
+        self._rows[row_id] = row
+        for indexes in self._indexes.values():
+            for index, getter in indexes:
+                index.add(row_id, getter((row_id, row)))
+
+    def create_index(
+        self, field: str | QueryDescriptor, kind: IndexKind = 'hash'
+    ) -> Index:
+        """Indexes a field, so searches on it don't have to check every row.
+
+        The index is kept up to date as rows are added.
+
+        Args:
+            field: The xivapi field (as used in queries) to index, or a QueryField
+            kind: 'hash' for `=`, 'sorted' for `<`, `<=`, `>` and `>=` on numbers,
+                or 'ngram' for `~` on strings (and LangDicts)
+
+        Returns:
+            The new index, which can also be probed directly.
+
+        Raises:
+            QueryBuildError: If the model has no field for it
+            ValueError: If kind isn't a known kind of index
+        """
+        if kind not in _INDEX_KINDS:
+            raise ValueError(f'Unknown index kind {kind!r}')
+        index = _INDEX_KINDS[kind](field)
+        getter = self._getter(index.field)
+        for row_id, row in self._rows.items():
+            index.add(row_id, getter((row_id, row)))
+        self._indexes.setdefault(index.field, []).append((index, getter))
+        return index
+
+    def get(self, row_id: int) -> Optional[T]:
+        """Returns the row with this id, or None if it isn't held."""
+        return self._rows.get(row_id)
+
+    def search(
+        self, query: QueryBuilder | Query | Group, *, limit: Optional[int] = None
+    ) -> list[SearchResult[T]]:
+        """Searches the rows held, like `Client.search` does for a sheet in xivapi.
+
+        Args:
+            query: The query to match rows against
+            limit: The most results to return, if any
+
+        Returns:
+            SearchResults for the matching rows, best score first (then by row id).
+
+        Raises:
+            QueryBuildError: If the query uses a field the model doesn't have, or
+                marks a clause as both required and excluded
+            ValueError: If limit is negative
+        """
+        if limit is not None and limit < 0:
+            raise ValueError('limit must not be negative')
+        clauses = query.clauses if isinstance(query, QueryBuilder) else [query]
+        score = self._compile(clauses)
+        candidates = self._candidates(clauses)
+        if candidates is None:
+            rows: Iterable[_Row[T]] = self._rows.items()
+        else:
+            rows = ((row_id, self._rows[row_id]) for row_id in candidates)
+
+        sheet = self.model_class.get_sheet_name()
+        results = []
+        for row_id, row in rows:
+            row_score = score((row_id, row))
+            if row_score is not None:
+                results.append(
+                    SearchResult(score=row_score, sheet=sheet, row_id=row_id, data=row)
+                )
+        results.sort(key=lambda result: (-result.score, result.row_id))
+        return results if limit is None else results[:limit]
+
+    def _candidates(self, clauses: Iterable[Query | Group]) -> Optional[set[int]]:
+        """Uses indexes to narrow down the rows clauses could match, or None if they can't."""
+        required = []
+        optional = []
+        for clause in clauses:
+            if clause.excluded:
+                continue
+            found = self._clause_candidates(clause)
+            if clause.required:
+                if found is not None:
+                    required.append(found)
+            else:
+                optional.append(found)
+
+        if required:
+            required.sort(key=len)
+            return required[0].intersection(*required[1:])
+        if any(clause.required for clause in clauses if not clause.excluded):
+            return None
+        # With nothing required, a match has to match one of the optional clauses
+        found_sets = [found for found in optional if found is not None]
+        if not optional or len(found_sets) < len(optional):
+            return None
+        return set().union(*found_sets)
+
+    def _clause_candidates(self, clause: Query | Group) -> Optional[set[int]]:
+        """Returns the rows one clause could match, if an index can tell."""
+        if isinstance(clause, Group):
+            return self._candidates(_group_clauses(clause))
+        for index, _ in self._indexes.get(clause.field, ()):
+            if index.supports(clause):
+                found = index.probe(clause)
+                if found is not None:
+                    return found
+        return None
+
+    def _compile(
+        self, clauses: Iterable[Query | Group]
+    ) -> Callable[[_Row[T]], Optional[float]]:
+        """Turns clauses into a function returning a row's score, or None if it doesn't match."""
+        required: list[_Matcher] = []
+        optional: list[_Matcher] = []
+        excluded: list[_Matcher] = []
+        for clause in clauses:
+            if clause.required and clause.excluded:
+                raise QueryBuildError(
+                    'Query cannot be set to both required and excluded', [str(clause)]
+                )
+            matcher = self._compile_clause(clause)
+            if clause.required:
+                required.append(matcher)
+            elif clause.excluded:
+                excluded.append(matcher)
+            else:
+                optional.append(matcher)
+        total = len(required) + len(optional)
+
+        def score(row: _Row[T]) -> Optional[float]:
+            if any(match(row) for match in excluded):
+                return None
+            if not all(match(row) for match in required):
+                return None
+            hits = sum(1 for match in optional if match(row))
+            if not required and not hits:
+                return None
+            return (len(required) + hits) / total
+
+        return score
+
+    def _compile_clause(self, clause: Query | Group) -> _Matcher:
+        """Turns one clause into a function testing whether a row matches it."""
+        if isinstance(clause, Group):
+            score = self._compile(_group_clauses(clause))
+            return lambda row: score(row) is not None
+
+        getter = self._getter(clause.field)
+        operation = clause.operation
+        target = clause.value
+        if operation not in ('=', '~') and operation not in _COMPARISONS:
+            raise QueryBuildError(
+                f'Unknown query operation {operation!r}', [str(clause)]
+            )
+        return lambda row: _matches(getter(row), operation, target)
+
+    def _getter(self, field: str) -> Callable[[_Row[T]], Any]:
+        """Returns a function reading an xivapi field (as used in queries) from a row."""
+        base, _, decoration = field.partition('@')
+        language = None
+        if decoration:
+            if not (decoration.startswith('lang(') and decoration.endswith(')')):
+                raise QueryBuildError(
+                    f'Cannot search {field!r} locally; only @lang() is understood',
+                    [field],
+                )
+            language = decoration[len('lang(') : -1]
+
+        if base == 'row_id' and self._row_id_field is None:
+            return lambda row: row[0]
+
+        # The longest mapped prefix names the model fields, the rest is walked
+        parts = base.split('.')
+        for split in range(len(parts), 0, -1):
+            field_names = self._fields.get('.'.join(parts[:split]))
+            if field_names is not None:
+                break
+        else:
+            raise QueryBuildError(
+                f'{self.model_class.__name__} has no field for {field!r}', [field]
+            )
+        rest = parts[split:]
+
+        def get_one(row: _Row[T], field_name: str) -> Any:
+            value = getattr(row[1], field_name, None)
+            for part in rest:
+                value = _walk(value, part)
+            if language is not None:
+                value = value.get(language) if isinstance(value, dict) else None
+            return value
+
+        if len(field_names) == 1:
+            return lambda row: get_one(row, field_names[0])
+        # Several model fields can map the same xivapi field (say, a plain and a
+        # LangDict Name); a row matches if any of them does
+        return lambda row: [get_one(row, field_name) for field_name in field_names]
+
+
+def _group_clauses(group: Group) -> list[Query | Group]:
+    """Returns a group's items as clauses, with nested builders' clauses inlined."""
+    clauses: list[Query | Group] = []
+    for item in group.items:
+        if isinstance(item, QueryBuilder):
+            clauses.extend(item.clauses)
+        else:
+            clauses.append(item)
+    return clauses
+
+
+def _xivapi_fields(model_class: type[Model]) -> dict[str, tuple[str, ...]]:
+    """Maps the xivapi name of each of a model's fields to the model fields holding it."""
+    fields: dict[str, tuple[str, ...]] = {}
+    for field_name, field_info in model_class.model_fields.items():
+        mapping = model_class._get_field_mapping(field_info)
+        xivapi_field = mapping.base_field if mapping else field_info.alias or field_name
+        fields[xivapi_field] = fields.get(xivapi_field, ()) + (field_name,)
+    for field_name in model_class.model_fields:
+        fields.setdefault(field_name, (field_name,))
+    return fields
+
+
+def _walk(value: Any, part: str) -> Any:
+    """Steps one level into a nested value, the way xivapi steps into linked rows."""
+    part = part.removesuffix('[]')
+    if isinstance(value, (list, tuple)):
+        return [_walk(item, part) for item in value]
+    if isinstance(value, dict):
+        if part in value:
+            return value[part]
+        fields = value.get('fields')
+        return fields.get(part) if isinstance(fields, dict) else None
+    if isinstance(value, BaseModel):
+        return getattr(value, part, None)
+    return None
+
+
+def _matches(value: Any, operation: str, target: Any) -> bool:
+    """Tests a field's value against one query comparison."""
+    if value is None:
+        return False
+    if isinstance(value, dict):
+        return any(_matches(item, operation, target) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_matches(item, operation, target) for item in value)
+    if operation == '~':
+        return isinstance(value, str) and str(target).casefold() in value.casefold()
+    if operation == '=':
+        if isinstance(value, str) and isinstance(target, str):
+            return value.casefold() == target.casefold()
+        return value == target
+    try:
+        return _COMPARISONS[operation](value, target)
+    except TypeError:
+        return False
@@ -0,0 +1,472 @@
+"""A persistent local copy of sheet rows, kept up to date between game versions."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncGenerator, AsyncIterator, Coroutine, Optional, overload
+from contextlib import aclosing
+from itertools import batched
+import hashlib
+import json
+import sqlite3
+
+# The mirror stores raw row data and validates it on the way back out, so it
+# pages and validates through Client internals (_raw_sheet_pages, _RowValidator
+# and _validate_page) rather than the public methods, which only yield models
+from xivapy.client import Client, _RowValidator
+from xivapy.exceptions import XIVAPIError
+from xivapy.local import LocalSheet
+from xivapy.model import Model
+from xivapy.types import ValidationMode
+
+__all__ = ['SheetMirror', 'SyncResult']
+
+_SCHEMA = (
+    # Row data, stored once however many snapshots share it
+    'CREATE TABLE IF NOT EXISTS row_data (hash TEXT PRIMARY KEY, data BLOB NOT NULL)',
+    # The rows of a sheet for a version, fields and schema; a resync writes a new
+    # snapshot, which replaces the old one once complete
+    'CREATE TABLE IF NOT EXISTS snapshots ('
+    'id INTEGER PRIMARY KEY, sheet TEXT NOT NULL, version TEXT NOT NULL, '
+    'fields TEXT NOT NULL, schema TEXT NOT NULL, complete INTEGER NOT NULL DEFAULT 0)',
+    'CREATE INDEX IF NOT EXISTS snapshots_key ON snapshots (sheet, fields, schema, version)',
+    # Rows of sheets without subrows are stored with a subrow_id of 0
+    'CREATE TABLE IF NOT EXISTS snapshot_rows ('
+    'snapshot INTEGER NOT NULL, row_id INTEGER NOT NULL, '
+    'subrow_id INTEGER NOT NULL DEFAULT 0, hash TEXT NOT NULL, '
+    'PRIMARY KEY (snapshot, row_id, subrow_id))',
+    'CREATE TABLE IF NOT EXISTS known_versions (name TEXT PRIMARY KEY)',
+)
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """What changed in a sheet when a `SheetMirror` synced it."""
+
+    sheet: str
+    version: str
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    skipped: bool = False
+    """True if the version was already mirrored and nothing was fetched."""
+
+
+def _encode_row(data: dict) -> tuple[str, bytes]:
+    """Returns the canonical encoding of a row's data, along with its content hash."""
+    encoded = json.dumps(
+        data, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    ).encode()
+    return hashlib.sha256(encoded).hexdigest(), encoded
+
+
+class SheetMirror:
+    """A local copy of sheets' rows, stored in a SQLite database.
+
+    Rows are kept per sheet, game version and set of fields (so two models reading
+    different fields from one sheet are mirrored separately), and read back with
+    the same calls as `Client.sheet` and `Client.sheet_all`, without any requests.
+
+    Each row's data is stored under a hash of its contents, shared by every
+    version the row is unchanged in. xivapi can't say which rows a new version
+    changed, so syncing a version still pages through the whole sheet (a
+    `batch_size` rows per request), but only rows whose hash differs from the
+    last synced version are written.
+
+    Args:
+        client: The client used to fetch rows while syncing; reads default to its
+            `game_version`
+        path: Path to the database file (created if it doesn't exist), or
+            ':memory:' for a mirror that lasts as long as the process
+
+    Example:
+        ```python
+        mirror = xivapy.SheetMirror(client, 'mirror.db')
+        await mirror.update(Item, Quest)  # syncs whenever xivapi has a new version
+
+        item = await mirror.sheet(Item, row=4570)
+        async for quest in mirror.sheet(Quest, rows=[65536, 65537]):
+            ...
+        ```
+    """
+
+    def __init__(self, client: Client, path: str | Path = ':memory:') -> None:
+        """Opens (or creates) the mirror database."""
+        self.client = client
+        self.path = path
+        self._db = sqlite3.connect(path)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        self._db.close()
+
+    def versions(self, model_class: type[Model]) -> list[str]:
+        """Returns the versions a model's rows have been fully mirrored for."""
+        sheet, _, fields, schema = self._snapshot_key(model_class)
+        return [
+            version
+            for (version,) in self._db.execute(
+                'SELECT version FROM snapshots '
+                'WHERE sheet = ? AND fields = ? AND schema = ? AND complete ORDER BY id',
+                (sheet, fields, schema),
+            )
+        ]
+
+    async def update(
+        self, *model_classes: type[Model], partitions: int = 1
+    ) -> list[SyncResult]:
+        """Syncs models to the client's game version when xivapi has a new version.
+
+        Checks `Client.versions()` against the versions seen on the last update.
+        If any are new (or a model hasn't been mirrored for the client's game
+        version yet), the models are synced; otherwise nothing is fetched.
+
+        Args:
+            *model_classes: The models whose rows to keep mirrored
+            partitions: How many row id ranges to page through at once while syncing
+
+        Returns:
+            A SyncResult for every model synced.
+        """
+        versions = await self.client.versions()
+        known = {
+            name for (name,) in self._db.execute('SELECT name FROM known_versions')
+        }
+        new_version = bool(set(versions) - known)
+
+        results = []
+        for model_class in model_classes:
+            if new_version or self.client.game_version not in self.versions(
+                model_class
+            ):
+                results.append(await self.sync(model_class, partitions=partitions))
+
+        self._db.executemany(
+            'INSERT OR IGNORE INTO known_versions (name) VALUES (?)',
+            [(name,) for name in versions],
+        )
+        self._db.commit()
+        return results
+
+    async def sync(
+        self,
+        model_class: type[Model],
+        version: Optional[str] = None,
+        *,
+        partitions: int = 1,
+    ) -> SyncResult:
+        """Mirrors a model's rows for a version.
+
+        A pinned version that's already fully mirrored never changes, so it's
+        skipped. Anything else (including 'latest') is paged through, writing only
+        rows whose contents differ from the last version synced. The new rows only
+        replace the old ones once every row is in, so reads carry on being served
+        from the old rows while syncing (or if syncing fails).
+
+        Args:
+            model_class: The model whose sheet (and fields) to mirror
+            version: The game version to mirror; defaults to the client's
+            partitions: How many row id ranges to page through at once
+
+        Returns:
+            How many rows were added, changed, removed or unchanged since the last
+            version synced.
+        """
+        version = version or self.client.game_version
+        key = self._snapshot_key(model_class, version)
+        sheet, _, fields, schema = key
+        current = self._snapshot(key)
+        if current is not None and version != 'latest':
+            return SyncResult(sheet, version, skipped=True)
+
+        # Compare against this version's rows if we have them, or the last version synced
+        base = current
+        if base is None:
+            found = self._db.execute(
+                'SELECT id FROM snapshots WHERE sheet = ? AND fields = ? AND schema = ? '
+                'AND complete ORDER BY id DESC LIMIT 1',
+                (sheet, fields, schema),
+            ).fetchone()
+            base = found[0] if found is not None else None
+        previous: dict[tuple[int, int], str] = {}
+        if base is not None:
+            previous = {
+                (row_id, subrow_id): row_hash
+                for row_id, subrow_id, row_hash in self._db.execute(
+                    'SELECT row_id, subrow_id, hash FROM snapshot_rows WHERE snapshot = ?',
+                    (base,),
+                )
+            }
+
+        # Throw away anything left over from a sync that didn't finish
+        self._drop_snapshots(key, complete=False)
+        snapshot = self._db.execute(
+            'INSERT INTO snapshots (sheet, version, fields, schema) VALUES (?, ?, ?, ?)',
+            key,
+        ).lastrowid
+        self._db.commit()
+
+        added = changed = unchanged = 0
+        seen: set[tuple[int, int]] = set()
+        pages = self._pages(model_class, version, partitions)
+        async with aclosing(pages):
+            async for page in pages:
+                entries = []
+                for data in page:
+                    ids = (data['row_id'], data.get('subrow_id', 0))
+                    row_hash, encoded = _encode_row(data)
+                    old_hash = previous.get(ids)
+                    if old_hash is None:
+                        added += 1
+                    elif old_hash != row_hash:
+                        changed += 1
+                    else:
+                        unchanged += 1
+                    if old_hash != row_hash:
+                        self._db.execute(
+                            'INSERT OR IGNORE INTO row_data (hash, data) VALUES (?, ?)',
+                            (row_hash, encoded),
+                        )
+                    seen.add(ids)
+                    entries.append((snapshot, *ids, row_hash))
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO snapshot_rows '
+                    '(snapshot, row_id, subrow_id, hash) VALUES (?, ?, ?, ?)',
+                    entries,
+                )
+                self._db.commit()
+
+        if current is not None:
+            self._drop_snapshots(key, complete=True)
+        self._db.execute('UPDATE snapshots SET complete = 1 WHERE id = ?', (snapshot,))
+        self._db.commit()
+
+        return SyncResult(
+            sheet,
+            version,
+            added=added,
+            changed=changed,
+            removed=len(previous.keys() - seen),
+            unchanged=unchanged,
+        )
+
+    @overload
+    def sheet[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        row: int,
+        version: Optional[str] = None,
+        validate: ValidationMode = 'full',
+    ) -> Coroutine[Any, Any, Optional[T]]: ...
+    @overload
+    def sheet[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        rows: Iterable[int] | AsyncIterable[int],
+        version: Optional[str] = None,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+    ) -> AsyncIterator[T]: ...
+    def sheet[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        row: Optional[int] = None,
+        rows: Optional[Iterable[int] | AsyncIterable[int]] = None,
+        version: Optional[str] = None,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+    ) -> Coroutine[Any, Any, Optional[T]] | AsyncIterator[T]:
+        """Reads one or more mirrored rows, like `Client.sheet`.
+
+        Args:
+            model_class: An xivapy.Model class for the results to be coerced to
+            row: A single row id to read (for sheets with subrows, its first subrow)
+            rows: Multiple row ids to read; ids that aren't in the sheet are skipped,
+                and for sheets with subrows every subrow of each row is read
+            version: The mirrored version to read; defaults to the client's
+            validate: How to validate rows; see `Client.sheet`
+            sample_every: How often to validate rows when `validate='sample'`
+
+        Returns:
+            This returns either:
+            * A single row formatted by the model given
+            * An AsyncIterator of the rows requested
+            * None in the case of the row not being found
+
+        Raises:
+            XIVAPIError: If the model hasn't been fully mirrored for the version
+        """
+        if row is not None and rows is not None:
+            raise ValueError("Cannot specify both 'row' and 'rows'")
+
+        validator = _RowValidator(validate, sample_every)
+        if row is not None:
+            return self._read_row(model_class, row, version, validator)
+        elif rows is not None:
+            return self._read_rows(model_class, rows, version, validator)
+        else:
+            raise ValueError("Must specify either 'row' or 'rows'")
+
+    async def sheet_all[T: Model](
+        self,
+        model_class: type[T],
+        *,
+        version: Optional[str] = None,
+        validate: ValidationMode = 'full',
+        sample_every: int = 100,
+    ) -> AsyncIterator[T]:
+        """Reads every mirrored row of a sheet in row id order, like `Client.sheet_all`.
+
+        Raises:
+            XIVAPIError: If the model hasn't been fully mirrored for the version
+        """
+        snapshot = self._complete_snapshot(model_class, version)
+        validator = _RowValidator(validate, sample_every)
+        cursor = self._db.execute(
+            'SELECT d.data FROM snapshot_rows s JOIN row_data d ON d.hash = s.hash '
+            'WHERE s.snapshot = ? ORDER BY s.row_id, s.subrow_id',
+            (snapshot,),
+        )
+        while page := cursor.fetchmany(self.client.batch_size):
+            for model in self.client._validate_page(
+                model_class, [json.loads(data) for (data,) in page], validator
+            ):
+                yield model
+
+    def local[T: Model](
+        self, model_class: type[T], version: Optional[str] = None
+    ) -> LocalSheet[T]:
+        """Loads every mirrored row of a sheet into a `LocalSheet` for searching.
+
+        `LocalSheet` holds one row per row id, so for sheets with subrows only the
+        first subrow of each row is loaded.
+
+        Raises:
+            XIVAPIError: If the model hasn't been fully mirrored for the version
+        """
+        snapshot = self._complete_snapshot(model_class, version)
+        rows = self._db.execute(
+            'SELECT s.row_id, d.data FROM snapshot_rows s JOIN row_data d ON d.hash = s.hash '
+            'WHERE s.snapshot = ? AND s.subrow_id = 0',
+            (snapshot,),
+        )
+        validator = _RowValidator('full')
+        return LocalSheet(
+            model_class,
+            {row_id: validator(model_class, json.loads(data)) for row_id, data in rows},
+        )
+
+    async def _read_row[T: Model](
+        self,
+        model_class: type[T],
+        row: int,
+        version: Optional[str],
+        validator: _RowValidator,
+    ) -> Optional[T]:
+        """Reads a single mirrored row."""
+        snapshot = self._complete_snapshot(model_class, version)
+        found = self._db.execute(
+            'SELECT d.data FROM snapshot_rows s JOIN row_data d ON d.hash = s.hash '
+            'WHERE s.snapshot = ? AND s.row_id = ? ORDER BY s.subrow_id LIMIT 1',
+            (snapshot, row),
+        ).fetchone()
+        if found is None:
+            return None
+        return validator(model_class, json.loads(found[0]))
+
+    async def _read_rows[T: Model](
+        self,
+        model_class: type[T],
+        rows: Iterable[int] | AsyncIterable[int],
+        version: Optional[str],
+        validator: _RowValidator,
+    ) -> AsyncIterator[T]:
+        """Reads mirrored rows (and their subrows) in the order they were asked for."""
+        snapshot = self._complete_snapshot(model_class, version)
+        if isinstance(rows, AsyncIterable):
+            rows = [row async for row in rows]
+        for batch in batched(rows, self.client.batch_size):
+            placeholders = ','.join('?' * len(batch))
+            found: dict[int, list[bytes]] = {}
+            for row_id, data in self._db.execute(
+                'SELECT s.row_id, d.data FROM snapshot_rows s '
+                'JOIN row_data d ON d.hash = s.hash '
+                f'WHERE s.snapshot = ? AND s.row_id IN ({placeholders}) '
+                'ORDER BY s.row_id, s.subrow_id',
+                (snapshot, *batch),
+            ):
+                found.setdefault(row_id, []).append(data)
+            page = [json.loads(data) for row in batch for data in found.get(row, ())]
+            for model in self.client._validate_page(model_class, page, validator):
+                yield model
+
+    def _snapshot_key(
+        self, model_class: type[Model], version: Optional[str] = None
+    ) -> tuple[str, str, str, str]:
+        """Returns the (sheet, version, fields, schema) a model's rows are stored under."""
+        return (
+            model_class.get_sheet_name(),
+            version or self.client.game_version,
+            model_class.get_fields_str(),
+            self.client.schema_version or '',
+        )
+
+    def _snapshot(self, key: tuple[str, str, str, str]) -> Optional[int]:
+        """Returns the id of the complete snapshot for a key, if there is one."""
+        found = self._db.execute(
+            'SELECT id FROM snapshots '
+            'WHERE sheet = ? AND version = ? AND fields = ? AND schema = ? AND complete '
+            'ORDER BY id DESC LIMIT 1',
+            key,
+        ).fetchone()
+        return found[0] if found is not None else None
+
+    def _complete_snapshot(
+        self, model_class: type[Model], version: Optional[str]
+    ) -> int:
+        """Returns the id of a model's complete snapshot for a version, or raises."""
+        key = self._snapshot_key(model_class, version)
+        snapshot = self._snapshot(key)
+        if snapshot is None:
+            raise XIVAPIError(
+                f'{key[0]} has not been mirrored for version {key[1]}',
+                details={'sheet': key[0], 'version': key[1], 'fields': key[2]},
+            )
+        return snapshot
+
+    def _drop_snapshots(self, key: tuple[str, str, str, str], complete: bool) -> None:
+        """Deletes the complete (or incomplete) snapshots for a key, and their rows."""
+        ids = [
+            (snapshot,)
+            for (snapshot,) in self._db.execute(
+                'SELECT id FROM snapshots WHERE sheet = ? AND version = ? AND fields = ? '
+                'AND schema = ? AND complete = ?',
+                (*key, int(complete)),
+            )
+        ]
+        if not ids:
+            return
+        self._db.executemany('DELETE FROM snapshot_rows WHERE snapshot = ?', ids)
+        self._db.executemany('DELETE FROM snapshots WHERE id = ?', ids)
+        # Row data only those snapshots used isn't needed any more
+        self._db.execute(
+            'DELETE FROM row_data WHERE hash NOT IN (SELECT hash FROM snapshot_rows)'
+        )
+
+    def _pages(
+        self, model_class: type[Model], version: str, partitions: int
+    ) -> AsyncGenerator[list[dict], None]:
+        """Pages through a model's sheet in xivapi, yielding flattened row data."""
+        # Rows are stored as they arrive, so partitions needn't wait their turn
+        return self.client._raw_sheet_pages(
+            model_class, partitions=partitions, ordered=False, version=version
+        )
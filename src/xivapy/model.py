@@ -1,11 +1,26 @@
 """xivapy Model-related classes."""
 
-from typing import Optional, Any, get_args, Union, get_origin, get_type_hints
+from typing import (
+    Optional,
+    Any,
+    Literal,
+    NamedTuple,
+    Self,
+    get_args,
+    Union,
+    cast,
+    get_origin,
+    get_type_hints,
+)
 import types
 from dataclasses import dataclass
 
-from pydantic import BaseModel, model_validator
-from pydantic_core import core_schema
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+    model_validator,
+)
+from pydantic_core import SchemaValidator, core_schema
 
 from xivapy.query import QueryDescriptor, Query
 
@@ -46,6 +61,63 @@ class FieldMapping:
         return specs
 
 
+@dataclass(frozen=True)
+class _MappingStep:
+    """One precomputed step of moving xivapi response data onto a model field."""
+
+    kind: Literal['key', 'nested', 'languages']
+    field_name: str
+    # 'key': the response key to copy from
+    source: str = ''
+    # 'nested': the dotted path, already split
+    path: tuple[str, ...] = ()
+    # 'languages': (language, response key) pairs
+    languages: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class _MappingPlan:
+    """Everything process_xivapi_response needs for a model, computed once per class."""
+
+    steps: tuple[_MappingStep, ...]
+    # QueryFields typed as optional, which default to None when missing
+    optional_fields: tuple[str, ...]
+
+
+class _ConstructField(NamedTuple):
+    """How a single model field gets its value when building a model without validation."""
+
+    name: str
+    # Response keys to take the value from, in order of preference
+    keys: tuple[str, ...]
+    # A nested or languages step to try if none of the keys are there, before
+    # falling back to the field name
+    step: Optional[_MappingStep] = None
+    # Missing optional QueryFields are set to None (and count as set)
+    optional: bool = False
+
+
+@dataclass(frozen=True)
+class _ConstructPlan:
+    """Everything needed to build a model's instances directly from flattened xivapi data."""
+
+    fields: tuple[_ConstructField, ...]
+    # (field name, response key) for the usual place each plain field's value is
+    primary: tuple[tuple[str, str], ...]
+    # (field name, FieldInfo) for fields with a default, filled in when missing
+    defaults: tuple[tuple[str, Any], ...]
+
+
+# Keys found at the top level of a row or search result, rather than in its fields
+_TOP_LEVEL_KEYS = frozenset({'row_id', 'subrow_id'})
+
+# Where a search result's details are kept while validating it along with its fields
+_SEARCH_SCORE = 'xivapy:score'
+_SEARCH_SHEET = 'xivapy:sheet'
+_SEARCH_ROW_ID = 'xivapy:row_id'
+_SEARCH_FIELDS = frozenset({_SEARCH_SCORE, _SEARCH_SHEET, _SEARCH_ROW_ID})
+
+
 class QueryField[T]:
     """Types a xivapy.Model field as both a field for xivapi and allows you to query with it."""
 
@@ -124,6 +196,18 @@ class QueryField[T]:
         return inner_schema
 
 
+def _field_type(annotation: Any) -> Any:
+    """Returns the type a field annotation holds, without Optional or QueryField."""
+    origin = get_origin(annotation)
+    if origin is QueryField:
+        return _field_type(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return _field_type(args[0])
+    return annotation
+
+
 class Model(BaseModel):
     """Base model for all xivapy queries."""
 
@@ -171,6 +255,43 @@ class Model(BaseModel):
         # as a note, this doesn't allow field shadowing - last one overwrites.
         cls.__querydescriptor_mappings__ = {**inherited_mappings, **new_mappings}
 
+        cls.__xivapi_mapping_plan__ = cls._compile_mapping_plan(annotations)
+
+    @classmethod
+    def model_rebuild(
+        cls,
+        *,
+        force: bool = False,
+        raise_errors: bool = True,
+        _parent_namespace_depth: int = 2,
+        _types_namespace: Any = None,
+    ) -> Optional[bool]:
+        """Rebuilds the pydantic model, and anything xivapy worked out from its fields."""
+        result = super().model_rebuild(
+            force=force,
+            raise_errors=raise_errors,
+            # account for this extra frame
+            _parent_namespace_depth=_parent_namespace_depth + 1,
+            _types_namespace=_types_namespace,
+        )
+        cls._clear_field_caches()
+        return result
+
+    @classmethod
+    def _clear_field_caches(cls) -> None:
+        """Forgets the field specs and mapping plan so they're worked out again."""
+        for name in (
+            '__xivapi_field_specs__',
+            '__xivapi_fields_str__',
+            '__xivapi_mapping_plan__',
+            '__xivapi_construct_plan__',
+            '__xivapi_list_adapter__',
+            '__xivapi_rows_envelope__',
+            '__xivapi_search_envelope__',
+        ):
+            if name in cls.__dict__:
+                delattr(cls, name)
+
     @classmethod
     def get_queryfield_mappings(cls) -> dict[str, QueryDescriptor]:
         """Returns a dict of all the fields and their corresponding mapping type."""
@@ -185,8 +306,15 @@ class Model(BaseModel):
 
     @classmethod
     def get_fields_str(cls) -> str:
-        """Returns all model fields as a comma-separated string list for XIVAPI queries."""
-        return ','.join(cls.get_xivapi_fields())
+        """Returns all model fields as a comma-separated string list for XIVAPI queries.
+
+        The fields are sorted, so the same model always produces the same string.
+        """
+        fields_str = cls.__dict__.get('__xivapi_fields_str__')
+        if fields_str is None:
+            fields_str = ','.join(cls._get_field_specs())
+            cls.__xivapi_fields_str__ = fields_str
+        return fields_str
 
     @classmethod
     def _get_field_mapping(cls, field_info) -> Optional[FieldMapping]:
@@ -208,6 +336,20 @@ class Model(BaseModel):
     @classmethod
     def get_xivapi_fields(cls) -> set[str]:
         """Get a set of all defined field names."""
+        return set(cls._get_field_specs())
+
+    @classmethod
+    def _get_field_specs(cls) -> tuple[str, ...]:
+        """Returns the sorted xivapi field specs for this class, working them out if needed."""
+        specs = cls.__dict__.get('__xivapi_field_specs__')
+        if specs is None:
+            specs = tuple(sorted(cls._collect_field_specs()))
+            cls.__xivapi_field_specs__ = specs
+        return specs
+
+    @classmethod
+    def _collect_field_specs(cls) -> set[str]:
+        """Works out the xivapi field specs for every field on this model."""
         fields = set()
 
         for field_name, field_info in cls.model_fields.items():
@@ -223,49 +365,88 @@ class Model(BaseModel):
         return fields
 
     @classmethod
-    def _process_mapped_field(
-        cls, data: dict[str, Any], model_field: str, mapping: FieldMapping
-    ) -> dict[str, Any]:
-        if mapping.languages:
-            # Collect lang variants
-            lang_dict = {}
-            for lang in mapping.languages:
-                field_key = f'{mapping.base_field}@lang({lang})'
-                if field_key in data:
-                    lang_dict[lang] = data[field_key]
-            if lang_dict:
-                data[model_field] = lang_dict
+    def _compile_mapping_plan(
+        cls, annotations: Optional[dict[str, Any]] = None
+    ) -> _MappingPlan:
+        """Works out how to map xivapi response data onto this model's fields.
+
+        Args:
+            annotations: Type hints for the model (including inherited ones); looked
+                up if not given
+        """
+        if annotations is None:
+            annotations = {}
+            for base in reversed(cls.__mro__[:-1]):
+                if hasattr(base, '__annotations__'):
+                    annotations.update(get_type_hints(base, include_extras=True))
+
+        steps = []
+        optional_fields = []
+        for field_name, field_info in cls.model_fields.items():
+            mapping = cls._get_field_mapping(field_info)
+            if mapping:
+                steps.append(cls._compile_mapping_step(field_name, mapping))
 
-        elif mapping.raw:
-            field_key = f'{mapping.base_field}@as(raw)'
-            if field_key in data:
-                data[model_field] = data[field_key]
+            # Inherited QueryFields have already been swapped for their descriptor
+            if isinstance(field_info.default, (QueryField, QueryDescriptor)):
+                # Is the field optional?
+                type_args = get_args(annotations.get(field_name, Any))
+                if type_args:
+                    inner_type = type_args[0]
+                    origin = get_origin(inner_type)
+                    args = get_args(inner_type)
+                    if origin in (Union, types.UnionType) and type(None) in args:
+                        optional_fields.append(field_name)
 
-        elif mapping.html:
-            field_key = f'{mapping.base_field}@as(html)'
-            if field_key in data:
-                data[model_field] = data[field_key]
+        return _MappingPlan(tuple(steps), tuple(optional_fields))
 
+    @classmethod
+    def _compile_mapping_step(
+        cls, field_name: str, mapping: FieldMapping
+    ) -> _MappingStep:
+        """Works out where in a response a single mapped field gets its value from."""
+        if mapping.languages:
+            return _MappingStep(
+                'languages',
+                field_name,
+                languages=tuple(
+                    (lang, f'{mapping.base_field}@lang({lang})')
+                    for lang in mapping.languages
+                ),
+            )
+        elif mapping.raw:
+            return _MappingStep('key', field_name, f'{mapping.base_field}@as(raw)')
+        elif mapping.html:
+            return _MappingStep('key', field_name, f'{mapping.base_field}@as(html)')
         elif mapping.custom_spec:
-            if mapping.custom_spec in data:
-                data[model_field] = data[mapping.custom_spec]
-
-        else:
+            return _MappingStep('key', field_name, mapping.custom_spec)
+        elif '.' in mapping.base_field:
             # Handle nested fields
-            if '.' in mapping.base_field:
-                value = cls._extract_nested_field(data, mapping.base_field)
-                if value is not None:
-                    data[model_field] = value
-            elif mapping.base_field in data:
-                data[model_field] = data[mapping.base_field]
+            return _MappingStep(
+                'nested', field_name, path=tuple(mapping.base_field.split('.'))
+            )
+        else:
+            return _MappingStep('key', field_name, mapping.base_field)
 
-        return data
+    @classmethod
+    def _get_mapping_plan(cls) -> _MappingPlan:
+        """Returns the mapping plan for this class, compiling it if needed."""
+        plan = cls.__dict__.get('__xivapi_mapping_plan__')
+        if plan is None:
+            plan = cls._compile_mapping_plan()
+            cls.__xivapi_mapping_plan__ = plan
+        return plan
 
     @classmethod
     def _extract_nested_field(cls, data: dict, field_path: str) -> Any:
         """Extract nested field data from xivapi response using dot notation (e.g., 'ContentType.Name')."""
-        parts = field_path.split('.')
+        return cls._extract_nested_path(data, tuple(field_path.split('.')))
+
+    @staticmethod
+    def _extract_nested_path(data: dict, parts: tuple[str, ...]) -> Any:
+        """Extract nested field data from xivapi response using an already-split path."""
         current = data
+        last = len(parts) - 1
 
         for i, part in enumerate(parts):
             if part in current:
@@ -273,19 +454,355 @@ class Model(BaseModel):
 
                 # Navigate through the dark fields
                 if isinstance(obj, dict):
-                    if 'fields' in obj and len(parts) > i + 1:
+                    if 'fields' in obj and i < last:
                         current = obj['fields']
-                    elif i == len(parts) - 1:
+                    elif i == last:
                         # we've gone to the bottom of the fields
                         return obj
                     else:
                         current = obj
                 else:
-                    return obj if i == len(parts) - 1 else None
+                    return obj if i == last else None
             else:
                 return None
         return current
 
+    @classmethod
+    def _get_list_adapter(cls) -> TypeAdapter[list[Self]]:
+        """Returns a TypeAdapter for validating a whole list of rows in one call."""
+        adapter = cls.__dict__.get('__xivapi_list_adapter__')
+        if adapter is None:
+            adapter = TypeAdapter(list[cls])  # type: ignore[valid-type]
+            cls.__xivapi_list_adapter__ = adapter
+        return adapter
+
+    @classmethod
+    def _get_rows_envelope(cls) -> Optional[SchemaValidator]:
+        """Returns a validator for a raw `/sheet/{name}?rows=` response body, if possible.
+
+        Meant for `validate_json` on the response bytes: pydantic-core parses the body
+        and validates each entry in `rows` straight from its `fields`, giving a
+        `(values, extra, fields set)` tuple per row for _from_validated_rows.
+
+        Returns None if the model needs Python to map its fields (see _compile_row_schema).
+        """
+        if '__xivapi_rows_envelope__' not in cls.__dict__:
+            validator = None
+            compiled = cls._compile_row_schema()
+            if compiled is not None:
+                row_schema, definitions, config = compiled
+                envelope = core_schema.typed_dict_schema(
+                    {
+                        'rows': core_schema.typed_dict_field(
+                            core_schema.list_schema(row_schema), required=False
+                        )
+                    }
+                )
+                if definitions:
+                    envelope = core_schema.definitions_schema(envelope, definitions)
+                validator = SchemaValidator(envelope, config)
+            cls.__xivapi_rows_envelope__ = validator
+        return cls.__xivapi_rows_envelope__
+
+    @classmethod
+    def _get_search_envelope(cls) -> Optional[SchemaValidator]:
+        """Returns a validator for a raw `/search` response body for this model, if possible.
+
+        Like _get_rows_envelope, but each entry in `results` also carries its score,
+        sheet and row_id for _from_validated_results.
+        """
+        if '__xivapi_search_envelope__' not in cls.__dict__:
+            validator = None
+            compiled = cls._compile_row_schema()
+            if compiled is not None:
+                row_schema, definitions, config = compiled
+                row_schema['fields'].update(
+                    {
+                        _SEARCH_SCORE: core_schema.model_field(
+                            core_schema.with_default_schema(
+                                core_schema.float_schema(), default=0.0
+                            ),
+                            validation_alias='score',
+                        ),
+                        _SEARCH_SHEET: core_schema.model_field(
+                            core_schema.str_schema(), validation_alias='sheet'
+                        ),
+                        _SEARCH_ROW_ID: core_schema.model_field(
+                            core_schema.int_schema(), validation_alias='row_id'
+                        ),
+                    }
+                )
+                envelope = core_schema.typed_dict_schema(
+                    {
+                        'results': core_schema.typed_dict_field(
+                            core_schema.list_schema(row_schema), required=False
+                        ),
+                        'next': core_schema.typed_dict_field(
+                            core_schema.nullable_schema(core_schema.str_schema()),
+                            required=False,
+                        ),
+                    }
+                )
+                if definitions:
+                    envelope = core_schema.definitions_schema(envelope, definitions)
+                validator = SchemaValidator(envelope, config)
+            cls.__xivapi_search_envelope__ = validator
+        return cls.__xivapi_search_envelope__
+
+    @classmethod
+    def _compile_row_schema(
+        cls,
+    ) -> Optional[
+        tuple[
+            core_schema.ModelFieldsSchema,
+            list[core_schema.CoreSchema],
+            core_schema.CoreConfig,
+        ]
+    ]:
+        """Works out a schema that validates a raw xivapi row without any Python.
+
+        This is the model's own fields schema, with each field looking its value up
+        in the row's `fields` (or `row_id`/`subrow_id`) through validation aliases, in the same
+        order of preference as process_xivapi_response.
+
+        Returns the schema, any definitions it refers to and the model's config; or
+        None if the model's fields need Python to map them (languages, nested
+        fields), or it has model validators of its own.
+        """
+        plan = cls._get_construct_plan()
+        if plan is None or any(field.step is not None for field in plan.fields):
+            return None
+
+        schema: Any = cls.__pydantic_core_schema__
+        definitions = []
+        if schema['type'] == 'definitions':
+            definitions = schema['definitions']
+            schema = schema['schema']
+        if schema['type'] != 'model' or schema['schema']['type'] != 'function-before':
+            return None
+        before = schema['schema']
+        function = before['function']['function']
+        if getattr(function, '__name__', None) != 'process_xivapi_response':
+            return None
+        fields_schema = before['schema']
+        if fields_schema['type'] != 'model-fields':
+            return None
+
+        fields = {}
+        for field in plan.fields:
+            field_schema = dict(fields_schema['fields'][field.name])
+            field_schema['validation_alias'] = [
+                [key] if key in _TOP_LEVEL_KEYS else ['fields', key]
+                for key in field.keys
+            ]
+            if field.optional:
+                inner = field_schema['schema']
+                if inner['type'] == 'default':
+                    inner = inner['schema']
+                field_schema['schema'] = core_schema.with_default_schema(
+                    inner, default=None
+                )
+            fields[field.name] = field_schema
+
+        config = core_schema.CoreConfig(
+            **{
+                **schema.get('config', {}),
+                'validate_by_alias': True,
+                'validate_by_name': False,
+            }
+        )
+        row_schema = cast(
+            core_schema.ModelFieldsSchema, {**fields_schema, 'fields': fields}
+        )
+        return row_schema, definitions, config
+
+    @classmethod
+    def _from_validated_rows(
+        cls, rows: list[tuple[dict[str, Any], Any, set[str]]]
+    ) -> list[Self]:
+        """Builds instances from rows validated by the envelope from _get_rows_envelope."""
+        new = cls.__new__
+        set_attr = object.__setattr__
+        models = []
+        for values, _, fields_set in rows:
+            model = new(cls)
+            set_attr(model, '__dict__', values)
+            set_attr(model, '__pydantic_fields_set__', fields_set)
+            set_attr(model, '__pydantic_extra__', None)
+            set_attr(model, '__pydantic_private__', None)
+            models.append(model)
+        return models
+
+    @classmethod
+    def _from_validated_results(
+        cls, results: list[tuple[dict[str, Any], Any, set[str]]]
+    ) -> list[tuple[float, str, int, Self]]:
+        """Builds (score, sheet, row_id, instance) tuples from the _get_search_envelope results.
+
+        Results from other sheets are skipped.
+        """
+        sheet_name = cls.get_sheet_name()
+        new = cls.__new__
+        set_attr = object.__setattr__
+        models = []
+        for values, _, fields_set in results:
+            score = values.pop(_SEARCH_SCORE)
+            sheet = values.pop(_SEARCH_SHEET)
+            row_id = values.pop(_SEARCH_ROW_ID)
+            if sheet != sheet_name:
+                continue
+            fields_set -= _SEARCH_FIELDS
+            model = new(cls)
+            set_attr(model, '__dict__', values)
+            set_attr(model, '__pydantic_fields_set__', fields_set)
+            set_attr(model, '__pydantic_extra__', None)
+            set_attr(model, '__pydantic_private__', None)
+            models.append((score, sheet, row_id, model))
+        return models
+
+    @classmethod
+    def _get_construct_plan(cls) -> Optional[_ConstructPlan]:
+        """Returns the plan for building instances directly, or None if the model needs pydantic.
+
+        Models with extra fields allowed, private attributes, a `model_post_init`,
+        or path/choice validation aliases are built with `model_construct` instead.
+        """
+        if '__xivapi_construct_plan__' not in cls.__dict__:
+            cls.__xivapi_construct_plan__ = cls._compile_construct_plan()
+        return cls.__xivapi_construct_plan__
+
+    @classmethod
+    def _compile_construct_plan(cls) -> Optional[_ConstructPlan]:
+        """Works out where each field's value comes from when skipping validation."""
+        if (
+            cls.model_config.get('extra') == 'allow'
+            or cls.__private_attributes__
+            or cls.__pydantic_post_init__
+        ):
+            return None
+
+        mapping_plan = cls._get_mapping_plan()
+        steps = {step.field_name: step for step in mapping_plan.steps}
+        fields = []
+        defaults = []
+        for field_name, field_info in cls.model_fields.items():
+            if field_info.validation_alias is not None and not isinstance(
+                field_info.validation_alias, str
+            ):
+                return None
+
+            # Same order of preference as model_construct after process_xivapi_response
+            keys = [
+                alias
+                for alias in (field_info.alias, field_info.validation_alias)
+                if alias is not None
+            ]
+            step = steps.get(field_name)
+            if step is not None and step.kind == 'key':
+                keys.append(step.source)
+                step = None
+            if step is None:
+                # Otherwise the field name is only looked at once the step comes up empty
+                keys.append(field_name)
+
+            fields.append(
+                _ConstructField(
+                    field_name,
+                    tuple(dict.fromkeys(keys)),
+                    step,
+                    field_name in mapping_plan.optional_fields,
+                )
+            )
+            if not field_info.is_required():
+                defaults.append((field_name, field_info))
+
+        primary = tuple(
+            (field.name, field.keys[0]) for field in fields if field.step is None
+        )
+        return _ConstructPlan(tuple(fields), primary, tuple(defaults))
+
+    @classmethod
+    def _construct_from_xivapi(cls, data: dict[str, Any]) -> Self:
+        """Builds an instance from flattened xivapi data without validating it.
+
+        The field mapping is applied as usual, but values are used as-is with no
+        type checking or coercion, so this should only be used on data that's
+        known to be good.
+        """
+        return cls._construct_many_from_xivapi([data])[0]
+
+    @classmethod
+    def _construct_many_from_xivapi(cls, rows: list[dict[str, Any]]) -> list[Self]:
+        """Builds instances from a page of flattened xivapi data without validating it.
+
+        Each instance's `__dict__` is filled straight from the construct plan, which
+        is much cheaper than going through process_xivapi_response and model_construct.
+        """
+        plan = cls._get_construct_plan()
+        if plan is None:
+            # process_xivapi_response is wrapped by model_validator, which type
+            # checkers don't see through
+            process = cast(Any, cls).process_xivapi_response
+            return [cls.model_construct(**process(data)) for data in rows]
+
+        primary = plan.primary
+        field_count = len(plan.fields)
+        new = cls.__new__
+        set_attr = object.__setattr__
+
+        models = []
+        for data in rows:
+            values = {name: data[key] for name, key in primary if key in data}
+            if len(values) < field_count:
+                # Something wasn't in its usual place (or needs more than a key lookup)
+                values = cls._construct_values(plan, data)
+            fields_set = set(values)
+            if len(values) < field_count:
+                for field_name, field_info in plan.defaults:
+                    if field_name not in values:
+                        values[field_name] = field_info.get_default(
+                            call_default_factory=True, validated_data=values
+                        )
+
+            model = new(cls)
+            set_attr(model, '__dict__', values)
+            set_attr(model, '__pydantic_fields_set__', fields_set)
+            set_attr(model, '__pydantic_extra__', None)
+            set_attr(model, '__pydantic_private__', None)
+            models.append(model)
+        return models
+
+    @classmethod
+    def _construct_values(
+        cls, plan: _ConstructPlan, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Works out the field values for one row, trying every place each can come from."""
+        values: dict[str, Any] = {}
+        for name, keys, step, optional in plan.fields:
+            for key in keys:
+                if key in data:
+                    values[name] = data[key]
+                    break
+            else:
+                if step is not None:
+                    value = cls._extract_step_value(step, data)
+                    if value is None:
+                        value = data.get(name)
+                    if value is not None or name in data:
+                        values[name] = value
+                        continue
+                if optional:
+                    values[name] = None
+        return values
+
+    @classmethod
+    def _extract_step_value(cls, step: _MappingStep, data: dict[str, Any]) -> Any:
+        """Returns the value a nested or languages step maps from data, or None."""
+        if step.kind == 'nested':
+            return cls._extract_nested_path(data, step.path)
+        lang_dict = {lang: data[key] for lang, key in step.languages if key in data}
+        return lang_dict or None
+
     @model_validator(mode='before')
     @classmethod
     def process_xivapi_response(cls, data: dict[str, Any]) -> dict[str, Any]:
@@ -293,29 +810,22 @@ class Model(BaseModel):
         if not isinstance(data, dict):
             return data
 
+        plan = cls._get_mapping_plan()
+
         # Normal field mapping process
-        for field_name, field_info in cls.model_fields.items():
-            mapping = cls._get_field_mapping(field_info)
-            if mapping:
-                data = cls._process_mapped_field(data, field_name, mapping)
+        for step in plan.steps:
+            if step.kind == 'key':
+                if step.source in data:
+                    data[step.field_name] = data[step.source]
+            else:
+                # Nested fields, or collected lang variants
+                value = cls._extract_step_value(step, data)
+                if value is not None:
+                    data[step.field_name] = value
 
         # Handle optional fields - set them to None
-        for field_name, field_info in cls.model_fields.items():
-            if hasattr(field_info, 'default') and isinstance(
-                field_info.default, QueryField
-            ):
-                if field_name not in data:
-                    # Is the field optional?
-                    annotation = cls.__annotations__.get(field_name, Any)
-                    type_args = get_args(annotation)
-                    if type_args:
-                        inner_type = type_args[0]
-                        origin = get_origin(inner_type)
-                        args = get_args(inner_type)
-                        is_optional = (
-                            origin in (Union, types.UnionType) and type(None) in args
-                        )
-                        if is_optional:
-                            data[field_name] = None
+        for field_name in plan.optional_fields:
+            if field_name not in data:
+                data[field_name] = None
 
         return data
@@ -1,6 +1,8 @@
-from typing import Optional, Any, overload
+from typing import Optional, Any, Self, overload
 from dataclasses import dataclass
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import SchemaValidator
+from pydantic.fields import FieldInfo
 from xivapy.query import QueryDescriptor, Query
 
 @dataclass
@@ -25,6 +27,9 @@ class QueryField[T](QueryDescriptor):
     @overload
     def __get__(self, instance: object, owner: Any) -> T: ...
 
+# Used by xivapy.table and xivapy.export
+def _field_type(annotation: Any) -> Any: ...
+
 class Model(BaseModel):
     __sheetname__: Optional[str]
     @classmethod
@@ -37,3 +42,25 @@ class Model(BaseModel):
     def get_xivapi_fields(cls) -> set[str]: ...
     @classmethod
     def process_xivapi_response(cls, data: dict[str, Any]) -> dict[str, Any]: ...
+
+    # Used by the client and other xivapy modules, not part of the public API
+    @classmethod
+    def _get_field_mapping(cls, field_info: FieldInfo) -> Optional[FieldMapping]: ...
+    @classmethod
+    def _get_list_adapter(cls) -> TypeAdapter[list[Self]]: ...
+    @classmethod
+    def _construct_from_xivapi(cls, data: dict[str, Any]) -> Self: ...
+    @classmethod
+    def _construct_many_from_xivapi(cls, rows: list[dict[str, Any]]) -> list[Self]: ...
+    @classmethod
+    def _get_rows_envelope(cls) -> Optional[SchemaValidator]: ...
+    @classmethod
+    def _get_search_envelope(cls) -> Optional[SchemaValidator]: ...
+    @classmethod
+    def _from_validated_rows(
+        cls, rows: list[tuple[dict[str, Any], Any, set[str]]]
+    ) -> list[Self]: ...
+    @classmethod
+    def _from_validated_results(
+        cls, results: list[tuple[dict[str, Any], Any, set[str]]]
+    ) -> list[tuple[float, str, int, Self]]: ...
@@ -13,9 +13,21 @@ __all__ = [
     'QueryBuilder',
     'QueryDescriptor',
     'Group',
+    'CompiledQuery',
 ]
 
 
+def _prefix(required: bool, excluded: bool) -> str:
+    """Returns the +/- prefix for a required or excluded clause."""
+    if required and excluded:
+        raise QueryBuildError('Query cannot be set to both required and excluded')
+    if required:
+        return '+'
+    if excluded:
+        return '-'
+    return ''
+
+
 @dataclass
 class Query:
     """Represents a composable query unit in xivapi's query interface.
@@ -43,16 +55,10 @@ class Query:
 
     def __str__(self) -> str:
         """Returns a string representation of the query."""
-        if self.required and self.excluded:
-            raise QueryBuildError('Query cannot be set to both required and excluded')
-        if self.required:
-            prefix = '+'
-        elif self.excluded:
-            prefix = '-'
-        else:
-            prefix = ''
+        prefix = _prefix(self.required, self.excluded)
         if isinstance(self.value, str) and self.operation in ['=', '~']:
-            escaped_value = f'"{self.value}"'
+            quoted = self.value.replace('\\', '\\\\').replace('"', '\\"')
+            escaped_value = f'"{quoted}"'
         elif isinstance(self.value, bool):
             escaped_value = 'true' if self.value else 'false'
         else:
@@ -258,10 +264,32 @@ class QueryBuilder:
         Returns:
             A string representation of the query.
         """
-        if not self.clauses:
-            return ''
         return ' '.join(str(clause) for clause in self.clauses)
 
+    def compile(self) -> CompiledQuery:
+        """Compiles the query into its canonical form.
+
+        Top-level clauses match independently of each other (as do the items in a
+        group), so the canonical form puts them in a fixed order and drops repeats.
+        Queries that differ only in the order their clauses were added compile to
+        equal (and equally hashed) CompiledQuery objects, which makes them usable as
+        cache keys.
+
+        Returns:
+            The canonical, hashable form of the query.
+        """
+        return CompiledQuery(
+            tuple(sorted({_canonical(clause) for clause in self.clauses}))
+        )
+
+    def canonical(self) -> str:
+        """Builds the canonical form of the query as a string (see `compile`).
+
+        Returns:
+            A string representation of the query, in canonical form.
+        """
+        return str(self.compile())
+
     def __str__(self) -> str:
         """Shows the current query as a string representation.
 
@@ -294,13 +322,49 @@ class Group:
 
     def __str__(self) -> str:
         """Returns a string representation of the grouping."""
-        if self.required and self.excluded:
-            raise QueryBuildError('Query cannot be set to both required and excluded')
-        if self.required:
-            prefix = '+'
-        elif self.excluded:
-            prefix = '-'
-        else:
-            prefix = ''
+        prefix = _prefix(self.required, self.excluded)
         inner = ' '.join(str(item) for item in self.items)
         return f'{prefix}({inner})'
+
+    def canonical(self) -> str:
+        """Returns the grouping as a string, with its items in canonical order."""
+        prefix = _prefix(self.required, self.excluded)
+        # A nested builder's clauses sit alongside the group's other items
+        clauses: set[str] = set()
+        for item in self.items:
+            if isinstance(item, QueryBuilder):
+                clauses.update(item.compile().clauses)
+            else:
+                clauses.add(str(item))
+        inner = ' '.join(sorted(clauses))
+        return f'{prefix}({inner})'
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """The canonical form of a QueryBuilder query, as made by `QueryBuilder.compile`.
+
+    Equal for queries that only differ in clause order (or repeated clauses), and
+    hashable, so it can be used as a dictionary or cache key.
+
+    Example:
+        >>> a = QueryBuilder().where(Level=50).contains(Name='Sword')
+        >>> b = QueryBuilder().contains(Name='Sword').where(Level=50)
+        >>> a.compile() == b.compile()
+        True
+        >>> print(a.compile())
+        Level=50 Name~"Sword"
+    """
+
+    clauses: tuple[str, ...]
+
+    def __str__(self) -> str:
+        """Returns the canonical query string."""
+        return ' '.join(self.clauses)
+
+
+def _canonical(clause: Query | Group) -> str:
+    """Returns a single clause in canonical form."""
+    if isinstance(clause, Group):
+        return clause.canonical()
+    return str(clause)
@@ -0,0 +1,153 @@
+"""Incremental parsing of large xivapi JSON responses."""
+
+from __future__ import annotations
+
+from typing import Any
+import codecs
+import json
+import re
+
+__all__ = ['JSONArrayStream']
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JSONArrayStream:
+    """Incrementally pulls the items of one array out of a JSON object as bytes arrive.
+
+    Feed it chunks of a response body like `{"schema": ..., "rows": [{...}, {...}]}`
+    and it hands back each item of the `rows` array as soon as that item is complete,
+    without waiting for (or holding on to) the rest of the body. Every other
+    top-level key is kept in `envelope`, with the array itself left empty.
+
+    Args:
+        key: The top-level key of the array to stream items from
+
+    Example:
+        >>> stream = JSONArrayStream('rows')
+        >>> stream.feed(b'{"rows": [{"row_id": 1}, {"ro')
+        [{'row_id': 1}]
+        >>> stream.feed(b'w_id": 2}], "next": null}')
+        [{'row_id': 2}]
+        >>> stream.close()
+        []
+        >>> stream.envelope
+        {'rows': [], 'next': None}
+    """
+
+    def __init__(self, key: str) -> None:
+        """Initializes a stream waiting for the start of a JSON object."""
+        self.key = key
+        self.envelope: dict[str, Any] = {}
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._state = 'start'
+        self._current_key = ''
+
+    @property
+    def done(self) -> bool:
+        """True once the whole JSON object has been read."""
+        return self._state == 'done'
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Adds more of the response body, returning any array items it completed."""
+        self._buffer += self._text.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> list[Any]:
+        """Signals the end of the body, returning any remaining array items.
+
+        Raises:
+            json.JSONDecodeError: If the body wasn't a complete JSON object
+        """
+        self._buffer += self._text.decode(b'', final=True)
+        items = self._drain(final=True)
+        if not self.done:
+            raise json.JSONDecodeError(
+                'Unexpected end of JSON document', self._buffer, len(self._buffer)
+            )
+        return items
+
+    def _drain(self, final: bool) -> list[Any]:
+        """Parses as far as the buffer allows, returning completed array items."""
+        items = []
+        buffer = self._buffer
+        pos = 0
+
+        while self._state != 'done':
+            pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+
+            if self._state == 'start':
+                self._expect(char, '{', buffer, pos)
+                self._state = 'key'
+                pos += 1
+            elif self._state == 'key':
+                if char == '}':
+                    self._state = 'done'
+                    pos += 1
+                    continue
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                self._current_key, pos = decoded
+                self._state = 'colon'
+            elif self._state == 'colon':
+                self._expect(char, ':', buffer, pos)
+                self._state = 'value'
+                pos += 1
+            elif self._state == 'value':
+                if self._current_key == self.key and char == '[':
+                    self.envelope[self.key] = []
+                    self._state = 'item'
+                    pos += 1
+                    continue
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                self.envelope[self._current_key], pos = decoded
+                self._state = 'next_key'
+            elif self._state == 'item':
+                if char == ']':
+                    self._state = 'next_key'
+                    pos += 1
+                    continue
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                item, pos = decoded
+                items.append(item)
+                self._state = 'next_item'
+            elif self._state == 'next_item':
+                self._expect(char, ',]', buffer, pos)
+                self._state = 'item' if char == ',' else 'next_key'
+                pos += 1
+            elif self._state == 'next_key':
+                self._expect(char, ',}', buffer, pos)
+                self._state = 'key' if char == ',' else 'done'
+                pos += 1
+
+        self._buffer = buffer[pos:]
+        return items
+
+    def _decode(self, buffer: str, pos: int, final: bool) -> tuple[Any, int] | None:
+        """Decodes one JSON value at pos, or returns None if it may not be complete yet."""
+        try:
+            value, end = self._json.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A number (or literal) that runs to the end of the buffer might continue
+        if end == len(buffer) and not final and buffer[end - 1] not in '"}]':
+            return None
+        return value, end
+
+    def _expect(self, char: str, allowed: str, buffer: str, pos: int) -> None:
+        if char not in allowed:
+            raise json.JSONDecodeError(
+                f'Expected one of {allowed!r} but found {char!r}', buffer, pos
+            )
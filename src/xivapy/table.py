@@ -0,0 +1,324 @@
+"""Sheet rows held in memory column by column, for sheets too big to keep as models."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import compress
+from typing import Any, Optional, cast, overload
+import sys
+
+from xivapy.exceptions import QueryBuildError
+from xivapy.local import _matches, _xivapi_fields
+from xivapy.model import Model, _field_type
+from xivapy.query import Query
+
+__all__ = ['SheetTable', 'TableRow']
+
+# Fields with these types are stored in typed arrays, a few bytes per value
+_TYPECODES: dict[type, str] = {bool: 'b', int: 'q', float: 'd'}
+
+
+def _intern(value: Any) -> Any:
+    """Interns the strings in a value, so repeated text is only held once."""
+    if type(value) is str:
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {key: _intern(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    return value
+
+
+class _Column:
+    """One field's values, in a typed array where the field's type allows it.
+
+    A value that doesn't fit the array (a None, or something pydantic didn't
+    coerce) turns the column into a plain list, so nothing is ever lost.
+    """
+
+    __slots__ = ('kind', 'values')
+
+    def __init__(self, kind: type, values: Optional[array | list] = None) -> None:
+        self.kind = kind
+        if values is None:
+            values = array(_TYPECODES[kind]) if kind in _TYPECODES else []
+        self.values = values
+
+    @classmethod
+    def for_annotation(cls, annotation: Any) -> _Column:
+        """Makes an empty column for a field with this annotation."""
+        field_type = _field_type(annotation)
+        return cls(field_type if field_type in _TYPECODES else object)
+
+    def append(self, value: Any) -> None:
+        values = self.values
+        if isinstance(values, array):
+            # bool is an int, and ints are fine as floats, but not the other way around
+            if type(value) is self.kind or (self.kind is float and type(value) is int):
+                try:
+                    values.append(value)
+                    return
+                except OverflowError:
+                    pass
+            self.values = values = [self[index] for index in range(len(values))]
+            self.kind = object
+        values.append(_intern(value))
+
+    def __getitem__(self, index: int) -> Any:
+        value = self.values[index]
+        if self.kind is bool and isinstance(self.values, array):
+            return bool(value)
+        return value
+
+    def select(self, mask: list[bool]) -> _Column:
+        """Returns a column of the values where the mask is true."""
+        if isinstance(self.values, array):
+            return _Column(
+                self.kind, array(self.values.typecode, compress(self.values, mask))
+            )
+        return _Column(self.kind, list(compress(self.values, mask)))
+
+
+class TableRow[T: Model]:
+    """A lazy view of one row of a `SheetTable`.
+
+    Fields are read as attributes, straight from the table's columns; nothing is
+    copied until `as_model` builds a model from them.
+
+    Example:
+        >>> row = table.get(4570)
+        >>> row.level          # read from the level column
+        >>> item = row.as_model()
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: SheetTable[T], index: int) -> None:
+        """Initializes a view of the row at a position in the table."""
+        self._table = table
+        self._index = index
+
+    @property
+    def row_id(self) -> int:
+        """The row's id."""
+        return self._table.row_ids[self._index]
+
+    def __getattr__(self, name: str) -> Any:
+        """Reads a field's value from its column."""
+        columns = self._table._columns
+        if name not in columns:
+            raise AttributeError(
+                f'{self._table.model_class.__name__} row has no field {name!r}'
+            )
+        return columns[name][self._index]
+
+    def as_model(self) -> T:
+        """Builds the row's model from its fields' values.
+
+        Values were validated (or not) when the table was filled, so the model is
+        built without validating it again.
+        """
+        return self._table.model_class.model_construct(
+            **{
+                name: column[self._index]
+                for name, column in self._table._columns.items()
+            }
+        )
+
+    def __repr__(self) -> str:
+        """Returns the row's id and field values."""
+        fields = ', '.join(
+            f'{name}={column[self._index]!r}'
+            for name, column in self._table._columns.items()
+        )
+        return f'{type(self).__name__}(row_id={self.row_id}, {fields})'
+
+
+class SheetTable[T: Model]:
+    """Rows of one sheet held in memory as columns rather than models.
+
+    Every field of the model gets a column. Fields typed `int`, `float` or `bool`
+    are stored in typed arrays (eight bytes per int or float, one per bool),
+    strings are interned so repeated text is stored once, and anything else
+    (LangDicts, lists, nested models) is kept in a plain list. Compared with a
+    model per row, which carries a pydantic object and a `__dict__` each, numeric
+    heavy sheets take a fraction of the memory.
+
+    Rows are read through `TableRow` views, which read fields from the columns
+    and only build a model when asked to. Typed columns support the buffer
+    protocol, so NumPy can wrap them without copying for vectorized filters; the
+    boolean masks those produce can be passed straight to `filter`.
+
+    Args:
+        model_class: The model whose fields make the columns
+        rows: Rows to start with, either as a mapping of row id to row, or as rows
+            whose model has a `row_id` field
+
+    Example:
+        ```python
+        table = await client.sheet_table(Item)
+
+        levels = numpy.frombuffer(table.column('level'), dtype=numpy.int64)
+        high_level = table.filter(levels >= 600)
+        for row in high_level:
+            print(row.row_id, row.name)
+        ```
+    """
+
+    def __init__(
+        self, model_class: type[T], rows: Mapping[int, T] | Iterable[T] = ()
+    ) -> None:
+        """Initializes a table, optionally with some rows."""
+        self.model_class = model_class
+        self.row_ids = array('q')
+        self._columns = {
+            name: _Column.for_annotation(info.annotation)
+            for name, info in model_class.model_fields.items()
+        }
+        self._fields = _xivapi_fields(model_class)
+        self._row_id_field = self._fields.get('row_id', (None,))[0]
+        self._positions: Optional[dict[int, int]] = None
+        if isinstance(rows, Mapping):
+            for row_id, row in cast(Mapping[int, T], rows).items():
+                self.append(row, row_id=row_id)
+        else:
+            for row in rows:
+                self.append(row)
+
+    def __len__(self) -> int:
+        """Returns the number of rows held."""
+        return len(self.row_ids)
+
+    def __iter__(self) -> Iterator[TableRow[T]]:
+        """Iterates over views of the rows, in the order they were added."""
+        return (TableRow(self, index) for index in range(len(self)))
+
+    def __contains__(self, row_id: object) -> bool:
+        """Returns whether a row with this id is held."""
+        return row_id in self._row_positions()
+
+    @overload
+    def __getitem__(self, index: int) -> TableRow[T]: ...
+    @overload
+    def __getitem__(self, index: slice) -> SheetTable[T]: ...
+    def __getitem__(self, index: int | slice) -> TableRow[T] | SheetTable[T]:
+        """Returns a view of the row at a position, or a table of a slice of rows."""
+        if isinstance(index, slice):
+            mask = [False] * len(self)
+            for position in range(*index.indices(len(self))):
+                mask[position] = True
+            return self.filter(mask)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('SheetTable index out of range')
+        return TableRow(self, index)
+
+    def append(self, row: T, row_id: Optional[int] = None) -> None:
+        """Adds a row to the end of the table, storing its fields in the columns.
+
+        The model itself isn't kept, so rows can be appended as they're fetched
+        without ever holding more than one at a time.
+
+        Args:
+            row: The row to add
+            row_id: The row's id; taken from the row's `row_id` field if not given
+
+        Raises:
+            ValueError: If no row id was given and the row doesn't have one
+        """
+        if row_id is None:
+            if self._row_id_field is not None:
+                row_id = getattr(row, self._row_id_field, None)
+            if row_id is None:
+                raise ValueError(
+                    f'{self.model_class.__name__} rows need a row_id field, or row_id passed in'
+                )
+        values = row.__dict__
+        for name, column in self._columns.items():
+            column.append(values.get(name))
+        self.row_ids.append(row_id)
+        if self._positions is not None:
+            self._positions[row_id] = len(self.row_ids) - 1
+
+    def get(self, row_id: int) -> Optional[TableRow[T]]:
+        """Returns a view of the row with this id, if it's held."""
+        index = self._row_positions().get(row_id)
+        return TableRow(self, index) if index is not None else None
+
+    def column(self, name: str) -> array | list:
+        """Returns the values of one of the model's fields, in row order.
+
+        Int, float and bool fields come back as `array.array`s ('q', 'd' and 'b'),
+        unless a value didn't fit (such as a None), in which case, like every other
+        field, they come back as a list. The column is the table's own storage,
+        so it shouldn't be changed.
+
+        Raises:
+            KeyError: If the model has no such field
+        """
+        if name not in self._columns:
+            raise KeyError(f'{self.model_class.__name__} has no field {name!r}')
+        return self._columns[name].values
+
+    def filter(self, where: Query | Iterable[bool]) -> SheetTable[T]:
+        """Returns a new table holding just the rows matching a condition.
+
+        Args:
+            where: Either a mask with a truth value per row (a list of bools, or a
+                NumPy boolean array), or a single `Query` comparison on one of the
+                model's fields, like `Item.level >= 600`. Queries compare values
+                the same way `LocalSheet.search` does; their required and
+                excluded flags are ignored.
+
+        Raises:
+            ValueError: If a mask's length isn't the number of rows
+            QueryBuildError: If a query's field isn't one of the model's
+        """
+        if isinstance(where, Query):
+            mask = self._query_mask(where)
+        else:
+            mask = [bool(keep) for keep in where]
+            if len(mask) != len(self):
+                raise ValueError(
+                    f'filter mask has {len(mask)} values for {len(self)} rows'
+                )
+
+        table = SheetTable(self.model_class)
+        table.row_ids = array('q', compress(self.row_ids, mask))
+        table._columns = {
+            name: column.select(mask) for name, column in self._columns.items()
+        }
+        return table
+
+    def _query_mask(self, query: Query) -> list[bool]:
+        """Evaluates a single comparison against every row."""
+        if query.field == 'row_id' and self._row_id_field is None:
+            values: Iterable[Any] = self.row_ids
+        else:
+            field_names = self._fields.get(query.field)
+            if field_names is None:
+                raise QueryBuildError(
+                    f'{self.model_class.__name__} has no field for {query.field!r}',
+                    [query.field],
+                )
+            columns = [self._columns[name] for name in field_names]
+            if len(columns) == 1:
+                values = columns[0].values
+                if columns[0].kind is bool and isinstance(values, array):
+                    values = map(bool, values)
+            else:
+                # Several fields map the same xivapi field; any of them may match
+                values = (
+                    [column[index] for column in columns] for index in range(len(self))
+                )
+        return [_matches(value, query.operation, query.value) for value in values]
+
+    def _row_positions(self) -> dict[int, int]:
+        """Returns where each row id is in the table, working it out if needed."""
+        if self._positions is None:
+            self._positions = {
+                row_id: index for index, row_id in enumerate(self.row_ids)
+            }
+        return self._positions
@@ -2,10 +2,20 @@
 
 from typing import Literal, TypedDict
 
-__all__ = ['Format', 'LangDict', 'QueryOperators']
+__all__ = [
+    'DiffKind',
+    'Format',
+    'IndexKind',
+    'LangDict',
+    'QueryOperators',
+    'ValidationMode',
+]
 
+DiffKind = Literal['added', 'removed', 'changed']
 Format = Literal['png', 'jpg', 'webp']
+IndexKind = Literal['hash', 'sorted', 'ngram']
 QueryOperators = Literal['=', '~', '<', '<=', '>', '>=']
+ValidationMode = Literal['full', 'trusted', 'sample']
 
 
 class LangDict(TypedDict, total=False):
@@ -0,0 +1,230 @@
+"""Tests for xivapy.cache."""
+
+import time
+
+import pytest
+
+from xivapy.cache import AssetCache, MemoryCache, SQLiteCache
+
+
+@pytest.mark.unit
+def test_memory_cache_roundtrip():
+    """Test storing and fetching a value."""
+    cache = MemoryCache()
+    cache.set('key', b'value')
+    assert cache.get('key') == b'value'
+    assert cache.get('missing') is None
+
+
+@pytest.mark.unit
+def test_memory_cache_evicts_least_recently_used():
+    """Test that the entry bound evicts the least recently used entry."""
+    cache = MemoryCache(max_entries=2)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    cache.get('a')
+    cache.set('c', b'3')
+    assert cache.get('a') == b'1'
+    assert cache.get('b') is None
+    assert cache.get('c') == b'3'
+
+
+@pytest.mark.unit
+def test_memory_cache_byte_bound():
+    """Test that the byte bound evicts entries and skips oversized values."""
+    cache = MemoryCache(max_bytes=10)
+    cache.set('a', b'12345')
+    cache.set('b', b'12345')
+    cache.set('c', b'12345')
+    assert cache.get('a') is None
+    assert len(cache) == 2
+    cache.set('huge', b'x' * 11)
+    assert cache.get('huge') is None
+
+
+@pytest.mark.unit
+def test_memory_cache_ttl(monkeypatch):
+    """Test that entries expire after their ttl."""
+    cache = MemoryCache()
+    cache.set('key', b'value', ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('key') is None
+
+
+@pytest.mark.unit
+def test_memory_cache_invalidate_tag():
+    """Test dropping every entry for a tag."""
+    cache = MemoryCache()
+    cache.set('a', b'1', tag='latest')
+    cache.set('b', b'2', tag='7.2')
+    cache.invalidate('latest')
+    assert cache.get('a') is None
+    assert cache.get('b') == b'2'
+
+
+@pytest.mark.unit
+def test_seen_versions(tmp_path):
+    """Test that every cache remembers the versions it was last checked against."""
+    caches = [MemoryCache(max_entries=1), SQLiteCache(tmp_path / 'cache.db')]
+    for cache in caches:
+        assert cache.seen_versions() is None
+        cache.see_versions(['7.2', 'latest'])
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        assert cache.seen_versions() == ['7.2', 'latest']
+
+
+@pytest.mark.unit
+def test_sqlite_cache_persists(tmp_path):
+    """Test that entries survive reopening the database."""
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    cache.set('a', b'1', tag='latest')
+    cache.set('b', b'2', tag='7.2')
+    cache.close()
+
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    assert cache.get('a') == b'1'
+    cache.invalidate('latest')
+    assert cache.get('a') is None
+    assert cache.get('b') == b'2'
+    cache.clear()
+    assert cache.get('b') is None
+    cache.close()
+
+
+@pytest.mark.unit
+def test_sqlite_cache_ttl(tmp_path, monkeypatch):
+    """Test that persistent entries expire after their ttl."""
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    cache.set('key', b'value', ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    assert cache.get('key') is None
+    cache.close()
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.unit
+async def test_asset_cache_write_and_read(tmp_path):
+    """Test streaming an asset to disk and reading it back."""
+    cache = AssetCache(tmp_path)
+    key = AssetCache.key('ui/icon/000000/000001_hr1.tex', 'png', '7.2')
+    file = await cache.write(key, _chunks(b'abc', b'def'), tag='7.2')
+    assert file.read_bytes() == b'abcdef'
+    assert cache.get(key) == b'abcdef'
+    assert cache.path(key) == file
+    mapped = cache.mmap(key)
+    assert mapped is not None and mapped[:] == b'abcdef'
+    mapped.close()
+    assert cache.get('missing') is None
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_dedupes_contents(tmp_path):
+    """Test that identical contents under different keys share one file."""
+    cache = AssetCache(tmp_path)
+    first = await cache.write('a|png|7.2', _chunks(b'same'))
+    second = await cache.write('b|png|7.2', _chunks(b'same'))
+    assert first == second
+    assert cache.size() == 4
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_evicts_least_recently_used(tmp_path):
+    """Test that going over max_bytes removes the least recently used asset."""
+    cache = AssetCache(tmp_path, max_bytes=10)
+    old = await cache.write('old', _chunks(b'12345'))
+    await cache.write('newer', _chunks(b'abcde'))
+    cache.get('old')
+    await cache.write('newest', _chunks(b'vwxyz'))
+    assert cache.get('old') == b'12345'
+    assert cache.get('newer') is None
+    assert cache.size() == 10
+    assert old.exists()
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_batches_access_times(tmp_path):
+    """Test that reads are recorded with the next write (or close), not one by one."""
+    cache = AssetCache(tmp_path, max_bytes=10)
+    await cache.write('old', _chunks(b'12345'))
+    await cache.write('newer', _chunks(b'abcde'))
+    (written,) = cache._db.execute(
+        "SELECT accessed FROM assets WHERE key = 'old'"
+    ).fetchone()
+    for _ in range(3):
+        assert cache.get('old') == b'12345'
+    assert cache._db.in_transaction is False
+    assert cache._db.execute(
+        "SELECT accessed FROM assets WHERE key = 'old'"
+    ).fetchone() == (written,)
+    cache.close()
+
+    # The reads still count once the cache is reopened
+    cache = AssetCache(tmp_path, max_bytes=10)
+    await cache.write('newest', _chunks(b'vwxyz'))
+    assert cache.get('old') == b'12345'
+    assert cache.get('newer') is None
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_evicts_shared_contents(tmp_path):
+    """Test that a shared file is only freed (and counted) once its last key is evicted."""
+    cache = AssetCache(tmp_path, max_bytes=10)
+    shared = await cache.write('a', _chunks(b'12345'))
+    await cache.write('b', _chunks(b'12345'))
+    await cache.write('c', _chunks(b'abcde'))
+    # Evicting a alone frees nothing, so b has to go as well
+    await cache.write('d', _chunks(b'vwxyz'))
+    assert cache.get('a') is None and cache.get('b') is None
+    assert not shared.exists()
+    assert cache.get('c') == b'abcde'
+    assert cache.size() == 10
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_removes_unreferenced_files(tmp_path):
+    """Test that replacing or invalidating keys only removes files nothing points to."""
+    cache = AssetCache(tmp_path)
+    old = await cache.write('a', _chunks(b'old'), tag='latest')
+    new = await cache.write('a', _chunks(b'new'), tag='latest')
+    assert not old.exists()
+    shared = await cache.write('b', _chunks(b'new'), tag='7.2')
+    assert shared == new
+
+    cache.invalidate('latest')
+    assert new.exists()
+    assert cache.get('b') == b'new'
+    cache.invalidate('7.2')
+    assert not new.exists()
+
+    await cache.write('c', _chunks(b'c'))
+    cache.clear()
+    assert list((tmp_path / 'objects').glob('*/*')) == []
+    cache.close()
+
+
+@pytest.mark.unit
+async def test_asset_cache_survives_restart(tmp_path):
+    """Test that assets are still available after reopening the cache."""
+    cache = AssetCache(tmp_path)
+    await cache.write('a', _chunks(b'1'), tag='latest')
+    await cache.write('b', _chunks(b'2'), tag='7.2')
+    cache.close()
+
+    cache = AssetCache(tmp_path)
+    assert cache.get('a') == b'1'
+    cache.invalidate('latest')
+    assert cache.get('a') is None
+    assert cache.get('b') == b'2'
+    cache.close()
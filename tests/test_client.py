@@ -1,11 +1,13 @@
 """Tests related to xivapy.Client."""
 
-from typing import Annotated
+import asyncio
+from typing import Annotated, Optional
 from pytest_httpx import HTTPXMock
 import httpx
 import pytest
 
-from xivapy.client import Client, SearchResult
+from xivapy.cache import AssetCache, MemoryCache, SQLiteCache
+from xivapy.client import Client, RowDiff, SearchResult, _RowValidator
 from xivapy.model import Model
 from xivapy.exceptions import ModelValidationError, XIVAPIHTTPError
 
@@ -22,6 +24,7 @@ from tests.fixtures.api_responses import (
 )
 from xivapy.model import FieldMapping
 from xivapy.query import QueryBuilder
+from xivapy.types import LangDict
 
 
 @pytest.mark.integration
@@ -376,6 +379,23 @@ async def test_sheet_multiple_rows(httpx_mock: HTTPXMock):
         await anext(result_iter)
 
 
+@pytest.mark.integration
+async def test_search_sends_escaped_strings(httpx_mock: HTTPXMock):
+    """Test that quotes and backslashes in string values are escaped on the wire."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_response(json=BASIC_SEARCH_RESPONSE)
+
+    query = QueryBuilder().where(Name='Say "hi"').contains(Path='a\\b')
+    async with Client() as client:
+        [result async for result in client.search(TestSheet, query=query)]
+
+    sent = httpx_mock.get_requests()[0].url.params['query']
+    assert sent == 'Name="Say \\"hi\\"" Path~"a\\\\b"'
+
+
 @pytest.mark.integration
 async def test_search_with_querybuilder(httpx_mock: HTTPXMock):
     """Test using search with QueryBuilder instead of plain strings."""
@@ -567,3 +587,1759 @@ async def test_sheet_batch_http_error(httpx_mock: HTTPXMock):
         async for _ in client.sheet(TestModel, rows=[1, 2, 3]):
             pass
     assert exc_info.value.status_code == 500
+
+
+def _echo_rows_callback(delays: dict[str, float] | None = None):
+    """Build an httpx_mock callback that answers ?rows= requests with those rows."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        rows_param = request.url.params['rows']
+        await asyncio.sleep((delays or {}).get(rows_param, 0))
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {'row_id': int(row), 'fields': {'Name': f'Item {row}'}}
+                    for row in rows_param.split(',')
+                ]
+            },
+        )
+
+    return callback
+
+
+@pytest.mark.integration
+async def test_sheet_concurrent_rows_ordered(httpx_mock: HTTPXMock):
+    """Test that concurrent batches still yield rows in the requested order."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_callback(_echo_rows_callback({'1,2': 0.05}), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        results = [
+            item.row_id
+            async for item in client.sheet(Test, rows=[1, 2, 3, 4, 5], concurrency=3)
+        ]
+
+    assert results == [1, 2, 3, 4, 5]
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.integration
+async def test_sheet_concurrent_rows_unordered(httpx_mock: HTTPXMock):
+    """Test that unordered concurrent batches yield rows as batches complete."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_callback(_echo_rows_callback({'1,2': 0.05}), is_reusable=True)
+
+    async with Client(batch_size=2, concurrency=2) as client:
+        results = [
+            item.row_id
+            async for item in client.sheet(Test, rows=[1, 2, 3, 4], ordered=False)
+        ]
+
+    assert results == [3, 4, 1, 2]
+
+
+@pytest.mark.integration
+async def test_sheet_concurrent_async_rows(httpx_mock: HTTPXMock):
+    """Test concurrent batching when the row ids come from an async iterable."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    async def row_ids():
+        for row in range(1, 6):
+            yield row
+
+    httpx_mock.add_callback(_echo_rows_callback(), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        results = [
+            item.row_id
+            async for item in client.sheet(Test, rows=row_ids(), concurrency=2)
+        ]
+
+    assert results == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('concurrency', [0, -1])
+async def test_invalid_concurrency(concurrency):
+    """Test that a concurrency below 1 raises ValueError rather than using the default."""
+
+    class Test(Model):
+        row_id: int
+
+    with pytest.raises(ValueError):
+        Client(concurrency=concurrency)
+    async with Client() as client:
+        with pytest.raises(ValueError):
+            client.sheet(Test, rows=[1, 2], concurrency=concurrency)
+        with pytest.raises(ValueError):
+            client.sheet_all(Test, concurrency=concurrency)
+        with pytest.raises(ValueError):
+            client.icons([1], concurrency=concurrency)
+        with pytest.raises(ValueError):
+            client.assets(['ui/icon/000000/000001_hr1.tex'], concurrency=concurrency)
+
+
+@pytest.mark.integration
+async def test_sheet_single_rows_coalesced(httpx_mock: HTTPXMock):
+    """Test that concurrent single-row fetches are combined into one batch request."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_response(
+        url=httpx.URL(
+            'https://v2.xivapi.com/api/sheet/Test',
+            params={
+                'rows': '1,2,3',
+                'fields': Test.get_fields_str(),
+                'version': 'latest',
+            },
+        ),
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Name': 'Item 1'}},
+                {'row_id': 2, 'fields': {'Name': 'Item 2'}},
+            ]
+        },
+    )
+
+    async with Client(coalesce_window=0.01) as client:
+        first, second, missing, again = await asyncio.gather(
+            client.sheet(Test, row=1),
+            client.sheet(Test, row=2),
+            client.sheet(Test, row=3),
+            client.sheet(Test, row=1),
+        )
+
+    assert first is not None and first.name == 'Item 1'
+    assert second is not None and second.name == 'Item 2'
+    assert missing is None
+    assert again == first
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.integration
+async def test_sheet_coalesced_loaders_released(httpx_mock: HTTPXMock):
+    """Test that coalescing loaders accept list params and aren't kept once idle."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_callback(_echo_rows_callback(), is_reusable=True)
+
+    async with Client(coalesce_window=0.01) as client:
+        first, second = await asyncio.gather(
+            client.sheet(Test, row=1, transient=['Name', 'Description']),
+            client.sheet(Test, row=2, transient=['Name', 'Description']),
+        )
+        assert first is not None and second is not None
+        assert len(client._row_loaders) == 0
+
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.integration
+async def test_identical_requests_share_response(httpx_mock: HTTPXMock):
+    """Test that identical concurrent requests only hit the api once."""
+
+    async def slow_versions(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=VERSIONS_RESPONSE)
+
+    httpx_mock.add_callback(slow_versions, url='https://v2.xivapi.com/api/version')
+
+    async with Client() as client:
+        results = await asyncio.gather(*(client.versions() for _ in range(5)))
+
+    assert all(versions == ['7.3x1', 'latest'] for versions in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.integration
+async def test_cached_pinned_version_rows(httpx_mock: HTTPXMock):
+    """Test that rows for a pinned version are served from the cache afterwards."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_response(
+        url=httpx.URL(
+            'https://v2.xivapi.com/api/sheet/Test/1',
+            params={'fields': Test.get_fields_str(), 'version': '7.2'},
+        ),
+        json={'row_id': 1, 'fields': {'Name': 'Item 1'}},
+    )
+
+    async with Client(game_version='7.2', cache=MemoryCache()) as client:
+        first = await client.sheet(Test, row=1)
+        second = await client.sheet(Test, row=1)
+
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.integration
+async def test_cached_latest_invalidated_by_new_version(httpx_mock: HTTPXMock):
+    """Test that a new game version drops cached `latest` responses."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/sheet?version=latest',
+        json=SHEETS_RESPONSE,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version', json=VERSIONS_RESPONSE
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version',
+        json={'versions': [*VERSIONS_RESPONSE['versions'], {'names': ['7.4']}]},
+    )
+
+    cache = MemoryCache()
+    async with Client(cache=cache) as client:
+        await client.versions()
+        await client.sheets()
+        await client.sheets()
+        assert (
+            len(
+                httpx_mock.get_requests(
+                    url=httpx.URL(client.base_url + '/api/sheet?version=latest')
+                )
+            )
+            == 1
+        )
+
+        await client.versions()
+        await client.sheets()
+        assert (
+            len(
+                httpx_mock.get_requests(
+                    url=httpx.URL(client.base_url + '/api/sheet?version=latest')
+                )
+            )
+            == 2
+        )
+
+
+@pytest.mark.regression
+async def test_latest_invalidated_after_cache_fills(httpx_mock: HTTPXMock):
+    """Test that filling a memory cache past capacity doesn't forget the versions seen."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version', json=VERSIONS_RESPONSE
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version',
+        json={'versions': [*VERSIONS_RESPONSE['versions'], {'names': ['7.4']}]},
+    )
+
+    cache = MemoryCache(max_entries=2)
+    async with Client(cache=cache) as client:
+        await client.versions()
+        for key in ('a', 'b', 'c'):
+            cache.set(key, b'old', tag='7.2')
+        cache.set('latest-entry', b'old', tag='latest')
+        assert len(cache) == 2
+
+        await client.versions()
+
+    assert cache.get('latest-entry') is None
+    assert cache.get('c') == b'old'
+    assert cache.seen_versions() == ['7.3x1', 'latest', '7.4']
+
+
+@pytest.mark.integration
+async def test_persistent_cache_invalidated_in_new_process(
+    httpx_mock: HTTPXMock, tmp_path
+):
+    """Test that a new version drops `latest` entries cached by an earlier process."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/sheet?version=latest',
+        json=SHEETS_RESPONSE,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/icon/000000/000001_hr1.tex&format=jpg&version=latest',
+        content=b'averysmallicon',
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version', json=VERSIONS_RESPONSE
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/version',
+        json={'versions': [*VERSIONS_RESPONSE['versions'], {'names': ['7.4']}]},
+        is_reusable=True,
+    )
+
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    asset_cache = AssetCache(tmp_path / 'assets')
+    async with Client(cache=cache, asset_cache=asset_cache) as client:
+        await client.versions()
+        await client.sheets()
+        await client.icon(1)
+    cache.close()
+    asset_cache.close()
+
+    # A fresh client and caches, as a new process would have
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    asset_cache = AssetCache(tmp_path / 'assets')
+    async with Client(cache=cache, asset_cache=asset_cache) as client:
+        await client.versions()
+        await client.sheets()
+        await client.icon(1)
+        # Unchanged versions keep what's cached
+        await client.versions()
+        await client.sheets()
+        await client.icon(1)
+    cache.close()
+    asset_cache.close()
+
+    assert (
+        len(
+            httpx_mock.get_requests(
+                url=httpx.URL(client.base_url + '/api/sheet?version=latest')
+            )
+        )
+        == 2
+    )
+    assert (
+        len(
+            httpx_mock.get_requests(
+                url=httpx.URL(
+                    client.base_url
+                    + '/api/asset?path=ui/icon/000000/000001_hr1.tex&format=jpg&version=latest'
+                )
+            )
+        )
+        == 2
+    )
+
+
+@pytest.mark.integration
+async def test_asset_cache_serves_from_disk(httpx_mock: HTTPXMock, tmp_path):
+    """Test that cached assets are read from disk instead of refetched."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/icon/000000/000001_hr1.tex&format=jpg&version=latest',
+        content=b'averysmallicon',
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/icon/000000/000002_hr1.tex&format=jpg&version=latest',
+        status_code=404,
+    )
+
+    async with Client(asset_cache=AssetCache(tmp_path)) as client:
+        assert await client.icon(1) == b'averysmallicon'
+        assert await client.icon(1) == b'averysmallicon'
+        assert await client.icon(2) is None
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.regression
+async def test_bulk_icons_with_small_asset_cache(httpx_mock: HTTPXMock, tmp_path):
+    """Test that icons are read before another icon's write can evict them."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.001)
+        return httpx.Response(200, content=request.url.params['path'].encode() * 3)
+
+    httpx_mock.add_callback(callback, is_reusable=True)
+
+    asset_cache = AssetCache(tmp_path, max_bytes=150)
+    async with Client(asset_cache=asset_cache) as client:
+        results = dict([item async for item in client.icons(range(1, 30))])
+
+    assert results == {
+        icon_id: client._icon_path(icon_id).encode() * 3 for icon_id in range(1, 30)
+    }
+    assert asset_cache.size() <= 150
+    asset_cache.close()
+
+
+@pytest.mark.integration
+async def test_bulk_icons(httpx_mock: HTTPXMock, tmp_path):
+    """Test fetching several icons at once, deduplicated, written to a directory."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/icon/020000/020650_hr1.tex&format=png&version=latest',
+        content=b'anicon',
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/icon/000000/000002_hr1.tex&format=png&version=latest',
+        status_code=404,
+    )
+
+    async with Client() as client:
+        results = {
+            icon_id: content
+            async for icon_id, content in client.icons(
+                [20650, 2, 20650], format='png', directory=tmp_path
+            )
+        }
+
+    assert results == {20650: b'anicon', 2: None}
+    assert len(httpx_mock.get_requests()) == 2
+    assert (tmp_path / '020650.png').read_bytes() == b'anicon'
+    assert not (tmp_path / '000002.png').exists()
+
+
+@pytest.mark.integration
+async def test_bulk_assets(httpx_mock: HTTPXMock, tmp_path):
+    """Test fetching several assets at once, keeping their paths in the directory."""
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/loadingimage/one_hr1.tex&format=webp&version=latest',
+        content=b'one',
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/asset?path=ui/loadingimage/two_hr1.tex&format=webp&version=latest',
+        content=b'two',
+    )
+
+    paths = ['ui/loadingimage/one_hr1.tex', 'ui/loadingimage/two_hr1.tex']
+    async with Client() as client:
+        results = dict(
+            [
+                item
+                async for item in client.assets(
+                    paths, format='webp', concurrency=50, directory=tmp_path
+                )
+            ]
+        )
+
+    assert results == {paths[0]: b'one', paths[1]: b'two'}
+    assert (tmp_path / 'ui/loadingimage/two_hr1.webp').read_bytes() == b'two'
+
+
+@pytest.mark.integration
+async def test_sheet_trusted_validation(httpx_mock: HTTPXMock):
+    """Test that trusted mode builds models without validating or coercing."""
+
+    class Test(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Name': 'Item 1', 'Level': '50'}},
+                {'row_id': 2, 'fields': {'Name': 'Item 2', 'Level': 44}},
+            ]
+        }
+    )
+
+    async with Client() as client:
+        results = [
+            item async for item in client.sheet(Test, rows=[1, 2], validate='trusted')
+        ]
+
+    assert [item.id for item in results] == [1, 2]
+    assert results[0].name == 'Item 1'
+    # Not coerced, since nothing was validated
+    assert results[0].level == '50'
+
+
+@pytest.mark.integration
+async def test_sheet_sampled_validation(httpx_mock: HTTPXMock):
+    """Test that sample mode only validates every nth row."""
+
+    class Test(Model):
+        row_id: int
+        level: Annotated[int, FieldMapping('Level')]
+
+    rows_response = {
+        'rows': [
+            {'row_id': 1, 'fields': {'Level': 1}},
+            {'row_id': 2, 'fields': {'Level': 'not a level'}},
+            {'row_id': 3, 'fields': {'Level': 'also not a level'}},
+        ]
+    }
+    httpx_mock.add_response(json=rows_response, is_reusable=True)
+
+    async with Client() as client:
+        # rows 1 and 3 are validated
+        with pytest.raises(ModelValidationError):
+            async for _ in client.sheet(
+                Test, rows=[1, 2, 3], validate='sample', sample_every=2
+            ):
+                pass
+
+        # only row 1 is validated
+        results = [
+            item
+            async for item in client.sheet(
+                Test, rows=[1, 2, 3], validate='sample', sample_every=3
+            )
+        ]
+        assert [item.row_id for item in results] == [1, 2, 3]
+
+
+@pytest.mark.unit
+def test_trusted_validation_skips_validators(monkeypatch):
+    """Test that trusted pages are built straight from the rows, never validated."""
+
+    class Test(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: Annotated[int, FieldMapping('LevelItem')] = 0
+
+    rows = [{'row_id': i, 'Name': f'Item {i}', 'LevelItem': i} for i in range(5)]
+    expected, _ = _RowValidator('full').page(Test, [dict(row) for row in rows])
+
+    built: list[int] = []
+    construct_many = Test._construct_many_from_xivapi
+
+    def spy(rows: list[dict]) -> list[Test]:
+        built.append(len(rows))
+        return construct_many(rows)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('trusted rows were validated')
+
+    monkeypatch.setattr(Test, '_construct_many_from_xivapi', spy)
+    monkeypatch.setattr(Test, 'model_validate', fail)
+    monkeypatch.setattr(Test, '_get_list_adapter', fail)
+
+    models, error = _RowValidator('trusted').page(Test, [dict(row) for row in rows])
+    assert error is None
+    assert models == expected
+    # The whole page is built in one go
+    assert built == [5]
+
+
+@pytest.mark.integration
+async def test_search_trusted_validation(httpx_mock: HTTPXMock):
+    """Test that search results can skip validation too."""
+
+    class TestSheet(Model):
+        row_id: int
+        Name: str
+
+    httpx_mock.add_response(json=BASIC_SEARCH_RESPONSE)
+
+    async with Client() as client:
+        results = [
+            result
+            async for result in client.search(
+                TestSheet, query='Name~"Test"', validate='trusted'
+            )
+        ]
+
+    assert results[0].data.Name == 'Test Item'
+
+
+@pytest.mark.unit
+def test_invalid_validation_mode():
+    """Test that unknown validation modes are rejected."""
+
+    class Test(Model):
+        row_id: int
+
+    client = Client()
+    with pytest.raises(ValueError):
+        client.sheet(Test, rows=[1], validate='sometimes')  # type: ignore[call-overload]
+
+
+@pytest.mark.integration
+async def test_sheet_batch_validation_error_index(httpx_mock: HTTPXMock):
+    """Test that a page failing validation yields rows before the bad one, then raises for it."""
+
+    class Test(Model):
+        row_id: int
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Level': 1}},
+                {'row_id': 2, 'fields': {'Level': 2}},
+                {'row_id': 3, 'fields': {'Level': 'three'}},
+                {'row_id': 4, 'fields': {'Level': 4}},
+            ]
+        }
+    )
+
+    seen = []
+    async with Client() as client:
+        with pytest.raises(ModelValidationError) as exc_info:
+            async for item in client.sheet(Test, rows=[1, 2, 3, 4]):
+                seen.append(item.row_id)
+
+    assert seen == [1, 2]
+    assert exc_info.value.index == 2
+    assert exc_info.value.raw_data is not None
+    assert exc_info.value.raw_data['row_id'] == 3
+    assert exc_info.value.model_class is Test
+
+
+@pytest.mark.integration
+async def test_search_mixed_page_validation_error_index(httpx_mock: HTTPXMock):
+    """Test that the error index for a multi-model page is the position in the page."""
+
+    class TestSheet(Model):
+        row_id: int
+        Name: str
+
+    class OtherSheet(Model):
+        row_id: int
+        Name: str
+        Description: str
+
+    httpx_mock.add_response(json=MULTI_MODEL_SEARCH_RESPONSE_BROKEN)
+
+    async with Client() as client:
+        results = []
+        with pytest.raises(ModelValidationError) as exc_info:
+            async for result in client.search(
+                (TestSheet, OtherSheet), query='Name~"Item"'
+            ):
+                results.append(result)
+
+    assert [result.row_id for result in results] == [1]
+    assert exc_info.value.index == 1
+    assert exc_info.value.model_class is OtherSheet
+
+
+@pytest.mark.integration
+async def test_sheet_rows_validate_json(httpx_mock: HTTPXMock):
+    """Test validating sheet batches straight from the response bytes."""
+
+    class Test(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(json=SHEET_ROWS_RESPONSE)
+
+    async with Client(validate_json=True) as client:
+        results = [item async for item in client.sheet(Test, rows=[1, 2, 3])]
+
+    assert [(item.id, item.name, item.level) for item in results] == [
+        (1, 'Test Item', 50),
+        (2, 'Second Item', 44),
+        (3, 'Final Item', 999),
+    ]
+
+
+@pytest.mark.integration
+async def test_sheet_rows_validate_json_error(httpx_mock: HTTPXMock):
+    """Test that validation errors from the JSON path still point at the bad row."""
+
+    class Test(Model):
+        row_id: int
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Level': 1}},
+                {'row_id': 2, 'fields': {'Level': 'two'}},
+            ]
+        }
+    )
+
+    seen = []
+    async with Client(validate_json=True) as client:
+        with pytest.raises(ModelValidationError) as exc_info:
+            async for item in client.sheet(Test, rows=[1, 2]):
+                seen.append(item.row_id)
+
+    assert seen == [1]
+    assert exc_info.value.index == 1
+
+
+@pytest.mark.integration
+async def test_sheet_rows_validate_json_languages(httpx_mock: HTTPXMock):
+    """Test that models whose fields need mapping in Python still work with validate_json."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[LangDict, FieldMapping('Name', languages=['en', 'de'])]
+
+    httpx_mock.add_response(
+        json={
+            'rows': [
+                {
+                    'row_id': 1,
+                    'fields': {'Name@lang(en)': 'One', 'Name@lang(de)': 'Eins'},
+                }
+            ]
+        }
+    )
+
+    async with Client(validate_json=True) as client:
+        results = [item async for item in client.sheet(Test, rows=[1])]
+
+    assert results[0].name == {'en': 'One', 'de': 'Eins'}
+
+
+@pytest.mark.integration
+async def test_sheet_rows_validate_json_skips_decoding(
+    httpx_mock: HTTPXMock, monkeypatch
+):
+    """Test that a good page is validated from the response bytes without decoding it first."""
+
+    class Test(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: Annotated[int, FieldMapping('Level')]
+
+    def fail(*args, **kwargs):
+        raise AssertionError('the page was decoded in Python')
+
+    monkeypatch.setattr(Client, '_parse_rows', fail)
+    monkeypatch.setattr(Client, '_flatten_item_data', fail)
+    monkeypatch.setattr(Test, 'model_validate', fail)
+    httpx_mock.add_response(json=SHEET_ROWS_RESPONSE)
+
+    async with Client(validate_json=True) as client:
+        results = [item async for item in client.sheet(Test, rows=[1, 2, 3])]
+
+    assert [(item.id, item.name, item.level) for item in results] == [
+        (1, 'Test Item', 50),
+        (2, 'Second Item', 44),
+        (3, 'Final Item', 999),
+    ]
+
+
+@pytest.mark.integration
+async def test_paginated_search_validate_json(httpx_mock: HTTPXMock):
+    """Test validating search pages straight from the response bytes, following cursors."""
+
+    class TestSheet(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/search',
+        match_params={
+            'sheets': 'TestSheet',
+            'query': 'Name~"Test Item"',
+            'fields': TestSheet.get_fields_str(),
+            'version': 'latest',
+        },
+        json=SEARCH_RESPONSE_PAGE_1,
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/search',
+        match_params={
+            'sheets': 'TestSheet',
+            'cursor': '28433b5b-7860-4395-88df-17c75c173a7c',
+            'fields': TestSheet.get_fields_str(),
+            'version': 'latest',
+        },
+        json=SEARCH_RESPONSE_PAGE_2,
+    )
+
+    async with Client(validate_json=True) as client:
+        results = [
+            result
+            async for result in client.search(TestSheet, query='Name~"Test Item"')
+        ]
+
+    assert [(result.data.name, result.data.level) for result in results] == [
+        ('Test Item', 89),
+        ('Another Test Item', 50),
+    ]
+    assert all(isinstance(result, SearchResult) for result in results)
+
+
+class _GatedStream(httpx.AsyncByteStream):
+    """A response body that holds back everything after `first` until `gate` is set."""
+
+    def __init__(self, first: bytes, rest: bytes, gate: asyncio.Event) -> None:
+        self.first = first
+        self.rest = rest
+        self.gate = gate
+
+    async def __aiter__(self):
+        yield self.first
+        await self.gate.wait()
+        yield self.rest
+
+
+@pytest.mark.integration
+async def test_sheet_rows_stream_yields_before_body_completes(httpx_mock: HTTPXMock):
+    """Test that streamed rows are handed out before the rest of the body arrives."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    gate = asyncio.Event()
+    httpx_mock.add_response(
+        stream=_GatedStream(
+            b'{"schema": "exdschema@2", "rows": [{"row_id": 1, "fields": {"Name": "A"}},',
+            b' {"row_id": 2, "fields": {"Name": "B"}}]}',
+            gate,
+        )
+    )
+
+    seen = []
+    async with Client(stream=True) as client, asyncio.timeout(5):
+        async for item in client.sheet(Test, rows=[1, 2]):
+            seen.append(item.name)
+            # Only release the rest of the body once the first row is out
+            gate.set()
+
+    assert seen == ['A', 'B']
+
+
+@pytest.mark.integration
+async def test_sheet_rows_stream_validation_error_index(httpx_mock: HTTPXMock):
+    """Test that a streamed row failing validation raises with its index."""
+
+    class Test(Model):
+        row_id: int
+        level: Annotated[int, FieldMapping('Level')]
+
+    httpx_mock.add_response(
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Level': 1}},
+                {'row_id': 2, 'fields': {'Level': 'two'}},
+            ]
+        }
+    )
+
+    seen = []
+    async with Client(stream=True) as client:
+        with pytest.raises(ModelValidationError) as exc_info:
+            async for item in client.sheet(Test, rows=[1, 2]):
+                seen.append(item.row_id)
+
+    assert seen == [1]
+    assert exc_info.value.index == 1
+
+
+@pytest.mark.integration
+async def test_sheet_rows_stream_http_error(httpx_mock: HTTPXMock):
+    """Test that a failed streamed batch raises XIVAPIHTTPError."""
+
+    class Test(Model):
+        row_id: int
+
+    httpx_mock.add_response(status_code=500)
+
+    async with Client(stream=True) as client:
+        with pytest.raises(XIVAPIHTTPError) as exc_info:
+            [item async for item in client.sheet(Test, rows=[1])]
+
+    assert exc_info.value.status_code == 500
+
+
+@pytest.mark.integration
+async def test_paginated_search_stream(httpx_mock: HTTPXMock):
+    """Test streaming search pages, following the cursor found after the results."""
+
+    class TestSheet(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/search',
+        match_params={
+            'sheets': 'TestSheet',
+            'query': 'Name~"Test Item"',
+            'fields': TestSheet.get_fields_str(),
+            'version': 'latest',
+        },
+        json={
+            'schema': 'exdschema@2',
+            'results': SEARCH_RESPONSE_PAGE_1['results'],
+            'next': SEARCH_RESPONSE_PAGE_1['next'],
+        },
+    )
+    httpx_mock.add_response(
+        url='https://v2.xivapi.com/api/search',
+        match_params={
+            'sheets': 'TestSheet',
+            'cursor': '28433b5b-7860-4395-88df-17c75c173a7c',
+            'fields': TestSheet.get_fields_str(),
+            'version': 'latest',
+        },
+        json=SEARCH_RESPONSE_PAGE_2,
+    )
+
+    async with Client(stream=True) as client:
+        results = [
+            result
+            async for result in client.search(TestSheet, query='Name~"Test Item"')
+        ]
+
+    assert [result.data.name for result in results] == [
+        'Test Item',
+        'Another Test Item',
+    ]
+
+
+@pytest.mark.integration
+async def test_sheet_all_pages_until_empty_page(httpx_mock: HTTPXMock):
+    """Test that sheet_all pages through a sheet with after/limit until an empty page."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    url = 'https://v2.xivapi.com/api/sheet/Test'
+    base = {'fields': Test.get_fields_str(), 'version': 'latest', 'limit': '2'}
+    httpx_mock.add_response(
+        url=url,
+        match_params=base,
+        json={
+            'rows': [
+                {'row_id': 1, 'fields': {'Name': 'A'}},
+                {'row_id': 5, 'fields': {'Name': 'B'}},
+            ]
+        },
+    )
+    httpx_mock.add_response(
+        url=url,
+        match_params={**base, 'after': '5'},
+        json={'rows': [{'row_id': 9, 'fields': {'Name': 'C'}}]},
+    )
+    httpx_mock.add_response(
+        url=url, match_params={**base, 'after': '9'}, json={'rows': []}
+    )
+
+    async with Client(batch_size=2) as client:
+        results = [item async for item in client.sheet_all(Test)]
+
+    assert [(item.row_id, item.name) for item in results] == [
+        (1, 'A'),
+        (5, 'B'),
+        (9, 'C'),
+    ]
+
+
+@pytest.mark.regression
+async def test_sheet_all_capped_limit(httpx_mock: HTTPXMock):
+    """Test that a server capping `limit` below batch_size doesn't end the dump early."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = list(range(1, 24))
+
+    async def capped(request: httpx.Request) -> httpx.Response:
+        after = int(request.url.params.get('after', -1))
+        limit = min(int(request.url.params['limit']), 5)
+        rows = [row for row in row_ids if row > after][:limit]
+        return httpx.Response(
+            200, json={'rows': [{'row_id': row, 'fields': {}} for row in rows]}
+        )
+
+    httpx_mock.add_callback(capped, is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [item.row_id async for item in client.sheet_all(Test)]
+
+    assert results == row_ids
+
+
+@pytest.mark.integration
+async def test_sheet_all_resumes_after_row(httpx_mock: HTTPXMock):
+    """Test resuming a dump from a row id, stopping on an empty page."""
+
+    class Test(Model):
+        row_id: int
+
+    url = 'https://v2.xivapi.com/api/sheet/Test'
+    base = {'fields': Test.get_fields_str(), 'version': 'latest', 'limit': '2'}
+    httpx_mock.add_response(
+        url=url,
+        match_params={**base, 'after': '10'},
+        json={'rows': [{'row_id': 11, 'fields': {}}, {'row_id': 12, 'fields': {}}]},
+    )
+    httpx_mock.add_response(
+        url=url, match_params={**base, 'after': '12'}, json={'rows': []}
+    )
+
+    async with Client(batch_size=2) as client:
+        results = [item.row_id async for item in client.sheet_all(Test, after=10)]
+
+    assert results == [11, 12]
+
+
+@pytest.mark.integration
+async def test_sheet_all_pages_by_subrow(httpx_mock: HTTPXMock):
+    """Test that sheets with subrows page after the last row:subrow."""
+
+    class Test(Model):
+        row_id: int
+
+    url = 'https://v2.xivapi.com/api/sheet/Test'
+    base = {'fields': Test.get_fields_str(), 'version': 'latest', 'limit': '2'}
+    httpx_mock.add_response(
+        url=url,
+        match_params=base,
+        json={
+            'rows': [
+                {'row_id': 1, 'subrow_id': 0, 'fields': {}},
+                {'row_id': 1, 'subrow_id': 1, 'fields': {}},
+            ]
+        },
+    )
+    httpx_mock.add_response(
+        url=url,
+        match_params={**base, 'after': '1:1'},
+        json={'rows': [{'row_id': 2, 'subrow_id': 0, 'fields': {}}]},
+    )
+    httpx_mock.add_response(
+        url=url, match_params={**base, 'after': '2:0'}, json={'rows': []}
+    )
+
+    async with Client(batch_size=2) as client:
+        results = [item.row_id async for item in client.sheet_all(Test)]
+
+    assert results == [1, 1, 2]
+
+
+@pytest.mark.integration
+async def test_sheet_all_http_error(httpx_mock: HTTPXMock):
+    """Test that a failed page raises XIVAPIHTTPError."""
+
+    class Test(Model):
+        row_id: int
+
+    httpx_mock.add_response(status_code=500)
+
+    async with Client() as client:
+        with pytest.raises(XIVAPIHTTPError) as exc_info:
+            [item async for item in client.sheet_all(Test)]
+
+    assert exc_info.value.status_code == 500
+
+
+def _listing_callback(row_ids: list[int], in_flight: list[int] | None = None):
+    """Build an httpx_mock callback that lists a sheet with the given row ids."""
+    active = 0
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        nonlocal active
+        active += 1
+        if in_flight is not None:
+            in_flight.append(active)
+        await asyncio.sleep(0.001)
+        after = int(request.url.params.get('after', -1))
+        limit = int(request.url.params['limit'])
+        rows = [row for row in row_ids if row > after][:limit]
+        active -= 1
+        return httpx.Response(
+            200, json={'rows': [{'row_id': row, 'fields': {}} for row in rows]}
+        )
+
+    return callback
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_ordered(httpx_mock: HTTPXMock):
+    """Test that a partitioned dump yields every row once, in row id order."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = [*range(0, 60), *range(500, 530), 2000]
+    httpx_mock.add_callback(_listing_callback(row_ids), is_reusable=True)
+
+    async with Client(batch_size=7) as client:
+        results = [item.row_id async for item in client.sheet_all(Test, partitions=4)]
+
+    assert results == row_ids
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_ordered_overlaps(httpx_mock: HTTPXMock):
+    """Test that ordered partitions keep fetching while waiting for their turn."""
+
+    class Test(Model):
+        row_id: int
+
+    in_flight: list[int] = []
+    row_ids = list(range(1, 401))
+    httpx_mock.add_callback(_listing_callback(row_ids, in_flight), is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [item.row_id async for item in client.sheet_all(Test, partitions=4)]
+
+    assert results == row_ids
+    # Besides the few requests finding the partition bounds, nearly every page
+    # request should have had others running alongside it
+    overlapping = sum(active > 1 for active in in_flight)
+    assert overlapping >= len(row_ids) // 10 * 3 // 4
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_unordered(httpx_mock: HTTPXMock):
+    """Test that an unordered partitioned dump still yields every row once."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = list(range(1, 101))
+    httpx_mock.add_callback(_listing_callback(row_ids), is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [
+            item.row_id
+            async for item in client.sheet_all(Test, partitions=3, ordered=False)
+        ]
+
+    assert sorted(results) == row_ids
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_caps_in_flight(httpx_mock: HTTPXMock):
+    """Test that concurrency caps requests across every partition, not per partition."""
+
+    class Test(Model):
+        row_id: int
+
+    in_flight: list[int] = []
+    row_ids = list(range(1, 201))
+    httpx_mock.add_callback(_listing_callback(row_ids, in_flight), is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [
+            item.row_id
+            async for item in client.sheet_all(Test, partitions=8, concurrency=2)
+        ]
+
+    assert results == row_ids
+    assert max(in_flight) <= 2
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_resume_and_empty(httpx_mock: HTTPXMock):
+    """Test partitioned dumps resuming after a row id, and of an empty remainder."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = list(range(1, 51))
+    httpx_mock.add_callback(_listing_callback(row_ids), is_reusable=True)
+
+    async with Client(batch_size=5) as client:
+        resumed = [
+            item.row_id async for item in client.sheet_all(Test, after=20, partitions=3)
+        ]
+        empty = [
+            item.row_id async for item in client.sheet_all(Test, after=50, partitions=3)
+        ]
+
+    assert resumed == list(range(21, 51))
+    assert empty == []
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_caps_probes(httpx_mock: HTTPXMock):
+    """Test that finding the partitions takes a bounded number of requests."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = [*range(1, 31), 10**9]
+    httpx_mock.add_callback(_listing_callback(row_ids), is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [item.row_id async for item in client.sheet_all(Test, partitions=4)]
+
+    assert results == row_ids
+    probes = [
+        request
+        for request in httpx_mock.get_requests()
+        if request.url.params['limit'] == '1'
+    ]
+    # The first page of the probe is a full one; the rest fetch a single row
+    assert len(probes) <= 9
+
+
+@pytest.mark.integration
+async def test_sheet_all_partitioned_small_sheet(httpx_mock: HTTPXMock):
+    """Test that a sheet that fits in one page isn't split into partitions."""
+
+    class Test(Model):
+        row_id: int
+
+    row_ids = list(range(1, 6))
+    httpx_mock.add_callback(_listing_callback(row_ids), is_reusable=True)
+
+    async with Client(batch_size=10) as client:
+        results = [item.row_id async for item in client.sheet_all(Test, partitions=4)]
+
+    assert results == row_ids
+    # A page and a one-row probe, then the page and the empty page that ends it
+    assert len(httpx_mock.get_requests()) == 4
+
+
+@pytest.mark.unit
+def test_sheet_all_invalid_partitions():
+    """Test that fewer than one partition is rejected."""
+
+    class Test(Model):
+        row_id: int
+
+    with pytest.raises(ValueError):
+        Client().sheet_all(Test, partitions=0)
+
+
+def _cursor_callback(pages: int, per_page: int = 2, delay: float = 0):
+    """Build an httpx_mock callback serving a search `pages` pages long."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get('cursor', 0))
+        await asyncio.sleep(delay)
+        return httpx.Response(
+            200,
+            json={
+                'results': [
+                    {
+                        'score': 1.0,
+                        'sheet': 'TestSheet',
+                        'row_id': page * per_page + index,
+                        'fields': {},
+                    }
+                    for index in range(per_page)
+                ],
+                'next': str(page + 1) if page + 1 < pages else None,
+            },
+        )
+
+    return callback
+
+
+@pytest.mark.integration
+async def test_search_prefetch_fetches_ahead(httpx_mock: HTTPXMock):
+    """Test that prefetching requests later pages while the current one is consumed."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(4), is_reusable=True)
+
+    async with Client() as client:
+        results = client.search(TestSheet, 'Name~"x"', prefetch=2)
+        first = await anext(results)
+        await asyncio.sleep(0.01)
+        requested = len(httpx_mock.get_requests())
+        rest = [result.row_id async for result in results]
+
+    assert first.row_id == 0
+    # The page being read plus two ahead of it (plus possibly one more being put)
+    assert 3 <= requested <= 4
+    assert rest == [1, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.mark.integration
+async def test_search_prefetch_stops_early(httpx_mock: HTTPXMock):
+    """Test that stopping early cancels any pages still being fetched."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(50, delay=0.005), is_reusable=True)
+
+    async with Client() as client:
+        results = client.search(TestSheet, 'Name~"x"', prefetch=3)
+        assert (await anext(results)).row_id == 0
+        await results.aclose()  # type: ignore[attr-defined]
+        requested = len(httpx_mock.get_requests())
+        await asyncio.sleep(0.05)
+
+    assert len(httpx_mock.get_requests()) == requested < 50
+
+
+@pytest.mark.integration
+async def test_search_prefetch_validation_error(httpx_mock: HTTPXMock):
+    """Test that a prefetched page failing validation still yields rows before the bad one."""
+
+    class TestSheet(Model):
+        row_id: int
+        Name: str
+
+    class OtherSheet(Model):
+        row_id: int
+        Name: str
+        Description: str
+
+    httpx_mock.add_response(json=MULTI_MODEL_SEARCH_RESPONSE_BROKEN)
+
+    async with Client() as client:
+        results = []
+        with pytest.raises(ModelValidationError):
+            async for result in client.search(
+                (TestSheet, OtherSheet), query='Name~"Item"', prefetch=1
+            ):
+                results.append(result)
+
+    assert [result.row_id for result in results] == [1]
+
+
+@pytest.mark.unit
+def test_search_invalid_prefetch():
+    """Test that a negative prefetch is rejected."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    with pytest.raises(ValueError):
+        Client().search(TestSheet, 'Name~"x"', prefetch=-1)
+
+
+@pytest.mark.integration
+async def test_search_limit_pushed_down(httpx_mock: HTTPXMock):
+    """Test that limit is sent to the API and paging stops once it's reached."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(10), is_reusable=True)
+
+    async with Client() as client:
+        results = [
+            result.row_id
+            async for result in client.search(TestSheet, 'Name~"x"', limit=3)
+        ]
+
+    assert results == [0, 1, 2]
+    requests = httpx_mock.get_requests()
+    assert [request.url.params['limit'] for request in requests] == ['3', '1']
+
+
+@pytest.mark.integration
+async def test_search_limit_ignores_rows_past_it(httpx_mock: HTTPXMock):
+    """Test that rows past the limit aren't validated (or raised for)."""
+
+    class TestSheet(Model):
+        row_id: int
+        Name: str
+
+    class OtherSheet(Model):
+        row_id: int
+        Name: str
+        Description: str
+
+    httpx_mock.add_response(json=MULTI_MODEL_SEARCH_RESPONSE_BROKEN)
+
+    async with Client() as client:
+        results = [
+            result.row_id
+            async for result in client.search(
+                (TestSheet, OtherSheet), query='Name~"Item"', limit=1
+            )
+        ]
+
+    assert results == [1]
+
+
+@pytest.mark.integration
+async def test_search_limit_stream_closes_response(httpx_mock: HTTPXMock):
+    """Test that a streamed search stops reading the response once the limit is hit."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_response(
+        stream=_GatedStream(
+            b'{"results": [{"score": 1, "sheet": "TestSheet", "row_id": 1, "fields": {}},',
+            b' {"score": 1, "sheet": "TestSheet", "row_id": 2, "fields": {}}]}',
+            # never set; reading past the first result would hang
+            asyncio.Event(),
+        )
+    )
+
+    async with Client(stream=True) as client, asyncio.timeout(5):
+        results = [
+            result.row_id
+            async for result in client.search(TestSheet, 'Name~"x"', limit=1)
+        ]
+
+    assert results == [1]
+
+
+@pytest.mark.integration
+async def test_search_limit_zero(httpx_mock: HTTPXMock):
+    """Test that a limit of zero makes no requests."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    async with Client() as client:
+        results = [r async for r in client.search(TestSheet, 'Name~"x"', limit=0)]
+
+    assert results == []
+    assert httpx_mock.get_requests() == []
+
+
+@pytest.mark.unit
+def test_search_invalid_limit():
+    """Test that a negative limit is rejected."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    with pytest.raises(ValueError):
+        Client().search(TestSheet, 'Name~"x"', limit=-1)
+
+
+def _per_sheet_search_callback(
+    scores: dict[str, list[float]], delays: dict[str, float]
+):
+    """Build an httpx_mock callback answering single-sheet searches with given scores."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        sheet = request.url.params['sheets']
+        await asyncio.sleep(delays.get(sheet, 0))
+        return httpx.Response(
+            200,
+            json={
+                'results': [
+                    {
+                        'score': score,
+                        'sheet': sheet,
+                        'row_id': index,
+                        'fields': {'Name': f'{sheet} {index}'},
+                    }
+                    for index, score in enumerate(scores[sheet])
+                ],
+                'next': None,
+            },
+        )
+
+    return callback
+
+
+class FanOutA(Model):
+    """A model for fan out search tests."""
+
+    row_id: int
+    Name: str
+
+
+class FanOutB(Model):
+    """A second model for fan out search tests, with its own fields."""
+
+    row_id: int
+    Name: str
+    Level: Annotated[Optional[int], FieldMapping('Level')] = None
+
+
+@pytest.mark.integration
+async def test_search_fan_out_merges_by_score(httpx_mock: HTTPXMock):
+    """Test that fanned out searches ask each sheet for its own fields, merged by score."""
+    httpx_mock.add_callback(
+        _per_sheet_search_callback(
+            {'FanOutA': [0.9, 0.5, 0.1], 'FanOutB': [0.8, 0.7]}, {'FanOutA': 0.02}
+        ),
+        is_reusable=True,
+    )
+
+    async with Client() as client:
+        results = [
+            (result.sheet, result.score)
+            async for result in client.search(
+                (FanOutA, FanOutB), 'Name~"x"', fan_out=True
+            )
+        ]
+
+    assert results == [
+        ('FanOutA', 0.9),
+        ('FanOutB', 0.8),
+        ('FanOutB', 0.7),
+        ('FanOutA', 0.5),
+        ('FanOutA', 0.1),
+    ]
+    fields = {
+        request.url.params['sheets']: request.url.params['fields']
+        for request in httpx_mock.get_requests()
+    }
+    assert fields == {
+        'FanOutA': FanOutA.get_fields_str(),
+        'FanOutB': FanOutB.get_fields_str(),
+    }
+
+
+@pytest.mark.integration
+async def test_search_fan_out_as_completed(httpx_mock: HTTPXMock):
+    """Test that unordered fan out yields a fast sheet's results before a slow one's."""
+    httpx_mock.add_callback(
+        _per_sheet_search_callback(
+            {'FanOutA': [0.9], 'FanOutB': [0.1, 0.05]}, {'FanOutA': 0.05}
+        ),
+        is_reusable=True,
+    )
+
+    async with Client() as client:
+        results = [
+            result.sheet
+            async for result in client.search(
+                (FanOutA, FanOutB), 'Name~"x"', fan_out=True, ordered=False
+            )
+        ]
+
+    assert results == ['FanOutB', 'FanOutB', 'FanOutA']
+
+
+@pytest.mark.integration
+async def test_search_fan_out_limit(httpx_mock: HTTPXMock):
+    """Test that a limit applies to the merged results, and is sent to each sheet."""
+    httpx_mock.add_callback(
+        _per_sheet_search_callback({'FanOutA': [0.9, 0.5], 'FanOutB': [0.8, 0.7]}, {}),
+        is_reusable=True,
+    )
+
+    async with Client() as client:
+        results = [
+            result.score
+            async for result in client.search(
+                (FanOutA, FanOutB), 'Name~"x"', fan_out=True, limit=2
+            )
+        ]
+
+    assert results == [0.9, 0.8]
+    assert {request.url.params['limit'] for request in httpx_mock.get_requests()} == {
+        '2'
+    }
+
+
+@pytest.mark.integration
+async def test_search_cache_serves_equivalent_queries(httpx_mock: HTTPXMock):
+    """Test that a cached search answers an equivalent query without any requests."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(3), is_reusable=True)
+    first = QueryBuilder().where(Level=50).contains(Name='x')
+    second = QueryBuilder().contains(Name='x').where(Level=50)
+
+    async with Client(cache=MemoryCache()) as client:
+        results = [r.row_id async for r in client.search(TestSheet, first, cache=True)]
+        requested = len(httpx_mock.get_requests())
+        repeat = [r.row_id async for r in client.search(TestSheet, second, cache=True)]
+
+    assert results == repeat == [0, 1, 2, 3, 4, 5]
+    assert requested == 3
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.integration
+async def test_search_cache_skips_partial_chains(httpx_mock: HTTPXMock):
+    """Test that a search stopped before its last page isn't cached."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(2), is_reusable=True)
+
+    async with Client(cache=MemoryCache()) as client:
+        limited = [
+            r.row_id
+            async for r in client.search(TestSheet, 'Name~"x"', limit=1, cache=True)
+        ]
+        full = [
+            r.row_id async for r in client.search(TestSheet, 'Name~"x"', cache=True)
+        ]
+        again = [
+            r.row_id
+            async for r in client.search(TestSheet, 'Name~"x"', limit=3, cache=True)
+        ]
+
+    assert limited == [0]
+    assert full == [0, 1, 2, 3]
+    # served (and cut short) from the cached full chain
+    assert again == [0, 1, 2]
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.integration
+async def test_search_without_cache_flag_is_not_cached(httpx_mock: HTTPXMock):
+    """Test that searches are only cached when asked to be."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    httpx_mock.add_callback(_cursor_callback(1), is_reusable=True)
+
+    async with Client(cache=MemoryCache()) as client:
+        for _ in range(2):
+            [r async for r in client.search(TestSheet, 'Name~"x"')]
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.unit
+def test_search_cache_needs_client_cache():
+    """Test that cache=True is rejected when the client has no cache."""
+
+    class TestSheet(Model):
+        row_id: int
+
+    with pytest.raises(ValueError):
+        Client().search(TestSheet, 'Name~"x"', cache=True)
+
+
+def _version_listing_callback(
+    sheets: dict[str, dict[int, dict]], in_flight: list[int] | None = None
+):
+    """Build an httpx_mock callback that lists a sheet's rows for each version."""
+    active = 0
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        nonlocal active
+        active += 1
+        if in_flight is not None:
+            in_flight.append(active)
+        await asyncio.sleep(0.005)
+        rows = sheets[request.url.params['version']]
+        after = int(request.url.params.get('after', -1))
+        limit = int(request.url.params['limit'])
+        page = sorted(row for row in rows if row > after)[:limit]
+        active -= 1
+        return httpx.Response(
+            200,
+            json={'rows': [{'row_id': row, 'fields': rows[row]} for row in page]},
+        )
+
+    return callback
+
+
+class DiffItem(Model):
+    """Item model used by the diff tests."""
+
+    row_id: int
+    name: Annotated[str, FieldMapping('Name')]
+    level: Annotated[int, FieldMapping('Level')] = 0
+
+
+DIFF_SHEETS = {
+    '7.0': {
+        1: {'Name': 'Iron Sword', 'Level': 10, 'Icon': 1},
+        2: {'Name': 'Steel Sword', 'Level': 30, 'Icon': 2},
+        3: {'Name': 'Bronze Shield', 'Level': 5, 'Icon': 3},
+        5: {'Name': 'Old Ring', 'Level': 1, 'Icon': 5},
+    },
+    '7.1': {
+        1: {'Name': 'Iron Sword', 'Level': 10, 'Icon': 1},
+        2: {'Name': 'Steel Sword', 'Level': 35, 'Icon': 2},
+        3: {'Name': 'Bronze Shield', 'Level': 5, 'Icon': 99},
+        4: {'Name': 'Mythril Sword', 'Level': 50, 'Icon': 4},
+        6: {'Name': 'New Ring', 'Level': 1, 'Icon': 6},
+    },
+}
+
+
+@pytest.mark.integration
+async def test_diff_versions(httpx_mock: HTTPXMock):
+    """Test that diff yields added, removed and changed rows in row id order."""
+    httpx_mock.add_callback(_version_listing_callback(DIFF_SHEETS), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        diffs = [diff async for diff in client.diff(DiffItem, '7.0', '7.1')]
+
+    assert [(diff.row_id, diff.kind) for diff in diffs] == [
+        (2, 'changed'),
+        (4, 'added'),
+        (5, 'removed'),
+        (6, 'added'),
+    ]
+    changed = diffs[0]
+    assert changed.changes == {'level': (30, 35)}
+    assert changed.before is not None and changed.before.level == 30
+    assert changed.after is not None and changed.after.level == 35
+    assert diffs[1] == RowDiff(
+        4, 'added', None, DiffItem(row_id=4, name='Mythril Sword', level=50), {}
+    )
+    assert diffs[2].before == DiffItem(row_id=5, name='Old Ring', level=1)
+    assert diffs[2].after is None
+    # Icon isn't a model field, so row 3 didn't change as far as the model goes
+    assert all(diff.row_id != 3 for diff in diffs)
+    versions = {request.url.params['version'] for request in httpx_mock.get_requests()}
+    assert versions == {'7.0', '7.1'}
+
+
+@pytest.mark.integration
+async def test_diff_fetches_versions_concurrently(httpx_mock: HTTPXMock):
+    """Test that both versions are paged through at the same time."""
+    in_flight: list[int] = []
+    httpx_mock.add_callback(
+        _version_listing_callback(DIFF_SHEETS, in_flight), is_reusable=True
+    )
+
+    async with Client(batch_size=1) as client:
+        [diff async for diff in client.diff(DiffItem, '7.0', '7.1')]
+
+    assert max(in_flight) == 2
+
+
+@pytest.mark.integration
+async def test_diff_stopped_early(httpx_mock: HTTPXMock):
+    """Test that stopping a diff part way doesn't page through the rest."""
+    sheets = {
+        version: {row: {'Name': f'{version} {row}', 'Level': row} for row in range(50)}
+        for version in ('7.0', '7.1')
+    }
+    httpx_mock.add_callback(_version_listing_callback(sheets), is_reusable=True)
+
+    async with Client(batch_size=5) as client:
+        diffs = client.diff(DiffItem, '7.0', '7.1')
+        first = await anext(diffs)
+        await diffs.aclose()  # type: ignore[attr-defined]
+
+    assert first.row_id == 0 and first.changes == {'name': ('7.0 0', '7.1 0')}
+    # A page ahead at most, rather than all ten pages of each version
+    assert len(httpx_mock.get_requests()) <= 6
+
+
+@pytest.mark.regression
+async def test_diff_subrows(httpx_mock: HTTPXMock):
+    """Test that subrows sharing a row id are compared with their own counterpart."""
+    sheets = {
+        '7.0': {(1, 0): 'a', (1, 1): 'b', (2, 0): 'c', (2, 2): 'd'},
+        '7.1': {(1, 0): 'a', (1, 1): 'B', (1, 2): 'e', (2, 0): 'c'},
+    }
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        rows = sheets[request.url.params['version']]
+        after = tuple(map(int, request.url.params.get('after', '0:-1').split(':')))
+        limit = int(request.url.params['limit'])
+        page = sorted(key for key in rows if key > after)[:limit]
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {
+                        'row_id': row,
+                        'subrow_id': subrow,
+                        'fields': {'Name': rows[row, subrow]},
+                    }
+                    for row, subrow in page
+                ]
+            },
+        )
+
+    httpx_mock.add_callback(callback, is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        diffs = [diff async for diff in client.diff(DiffItem, '7.0', '7.1')]
+
+    assert [(diff.row_id, diff.subrow_id, diff.kind) for diff in diffs] == [
+        (1, 1, 'changed'),
+        (1, 2, 'added'),
+        (2, 2, 'removed'),
+    ]
+    assert diffs[0].changes == {'name': ('b', 'B')}
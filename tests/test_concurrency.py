@@ -0,0 +1,330 @@
+"""Tests for xivapy.concurrency helpers."""
+
+import asyncio
+
+import pytest
+
+from xivapy.concurrency import (
+    BatchLoader,
+    SingleFlight,
+    buffered,
+    merge,
+    merge_sorted,
+    windowed,
+)
+
+
+async def _jobs(delays: list[float], started: list[int]):
+    for index, delay in enumerate(delays):
+
+        async def job(index=index, delay=delay):
+            started.append(index)
+            await asyncio.sleep(delay)
+            return index
+
+        yield job()
+
+
+@pytest.mark.unit
+async def test_windowed_ordered():
+    """Test that ordered windows yield in submission order."""
+    started: list[int] = []
+    results = [r async for r in windowed(_jobs([0.03, 0, 0.01], started), 3)]
+    assert results == [0, 1, 2]
+
+
+@pytest.mark.unit
+async def test_windowed_unordered():
+    """Test that unordered windows yield in completion order."""
+    started: list[int] = []
+    results = [
+        r async for r in windowed(_jobs([0.03, 0, 0.01], started), 3, ordered=False)
+    ]
+    assert results == [1, 2, 0]
+
+
+@pytest.mark.unit
+async def test_windowed_bounds_in_flight():
+    """Test that no more than `size` jobs are started ahead of the consumer."""
+    started: list[int] = []
+    stream = windowed(_jobs([0, 0, 0, 0, 0], started), 2)
+    assert await anext(stream) == 0
+    assert len(started) <= 3
+    await stream.aclose()
+
+
+@pytest.mark.unit
+async def test_windowed_invalid_size():
+    """Test that a window size below 1 is rejected."""
+    with pytest.raises(ValueError):
+        async for _ in windowed(_jobs([], []), 0):
+            pass
+
+
+class _Recorder:
+    def __init__(self, fail: bool = False):
+        self.calls: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, keys: list[int]) -> dict[int, str]:
+        self.calls.append(keys)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError('nope')
+        return {key: f'value {key}' for key in keys if key != 404}
+
+
+@pytest.mark.unit
+async def test_batch_loader_coalesces():
+    """Test that loads inside the window become a single batch call."""
+    recorder = _Recorder()
+    loader = BatchLoader(recorder, max_batch=10, window=0.01)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(404), loader.load(1)
+    )
+    assert results == ['value 1', 'value 2', None, 'value 1']
+    assert recorder.calls == [[1, 2, 404]]
+
+
+@pytest.mark.unit
+async def test_batch_loader_max_batch():
+    """Test that a full batch is sent without waiting for the window."""
+    recorder = _Recorder()
+    loader = BatchLoader(recorder, max_batch=2, window=10)
+    results = await asyncio.wait_for(
+        asyncio.gather(loader.load(1), loader.load(2)), timeout=1
+    )
+    assert results == ['value 1', 'value 2']
+    assert recorder.calls == [[1, 2]]
+
+
+@pytest.mark.unit
+async def test_batch_loader_error_reaches_every_caller():
+    """Test that a failing batch raises for every waiting caller."""
+    loader = BatchLoader(_Recorder(fail=True), max_batch=10, window=0)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.unit
+async def test_batch_loader_cancelled_caller():
+    """Test that cancelling one caller doesn't cancel others waiting on the same key."""
+    loader = BatchLoader(_Recorder(), max_batch=10, window=0.01)
+    cancelled = asyncio.create_task(loader.load(1))
+    kept = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await kept == 'value 1'
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+@pytest.mark.unit
+async def test_single_flight_shares_calls():
+    """Test that identical concurrent calls only run once."""
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    flight: SingleFlight[str, int] = SingleFlight()
+    results = await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+    assert results == [1] * 5
+    # Once finished, the next call starts fresh
+    assert await flight.do('key', fetch) == 2
+
+
+@pytest.mark.unit
+async def test_single_flight_cancel_one_waiter():
+    """Test that cancelling one waiter leaves the shared call running for others."""
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    flight: SingleFlight[str, str] = SingleFlight()
+    cancelled = asyncio.create_task(flight.do('key', fetch))
+    kept = asyncio.create_task(flight.do('key', fetch))
+    await started.wait()
+    cancelled.cancel()
+    assert await kept == 'done'
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+@pytest.mark.unit
+async def test_single_flight_cancel_all_waiters():
+    """Test that the shared call is cancelled once nobody is waiting on it."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    flight: SingleFlight[str, None] = SingleFlight()
+    waiter = asyncio.create_task(flight.do('key', fetch))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def _source(items: list[int], delay: float, produced: list[int] | None = None):
+    for item in items:
+        await asyncio.sleep(delay)
+        if produced is not None:
+            produced.append(item)
+        yield item
+
+
+@pytest.mark.unit
+async def test_merge_ordered():
+    """Test that ordered merges yield each source in turn, however fast they run."""
+    results = [
+        item
+        async for item in merge(
+            [_source([1, 2], 0.02), _source([3, 4], 0), _source([5], 0.01)]
+        )
+    ]
+    assert results == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.unit
+async def test_merge_unordered():
+    """Test that unordered merges yield items as they're produced."""
+    results = [
+        item
+        async for item in merge(
+            [_source([1, 2], 0.03), _source([3, 4], 0.001)], ordered=False, buffer=2
+        )
+    ]
+    assert results == [3, 4, 1, 2]
+
+
+@pytest.mark.unit
+async def test_merge_bounds_buffer():
+    """Test that a source can't run more than `buffer` items ahead of the consumer."""
+    produced: list[int] = []
+    stream = merge([_source([1], 0.01), _source([2, 3, 4, 5, 6], 0, produced)])
+    assert await anext(stream) == 1
+    # one item buffered, plus one waiting to be put
+    assert len(produced) <= 2
+    await stream.aclose()
+
+
+@pytest.mark.unit
+async def test_merge_ordered_lookahead():
+    """Test that waiting sources share the lookahead, and the current one is never held up."""
+    produced: list[int] = []
+    stream = merge(
+        [
+            _source([1], 0.01),
+            _source([2, 3, 4, 5], 0, produced),
+            _source([6, 7, 8, 9], 0, produced),
+        ],
+        lookahead=5,
+    )
+    assert await anext(stream) == 1
+    # Five held between the waiting sources, plus one each waiting to be put
+    assert 5 <= len(produced) <= 7
+    assert [item async for item in stream] == [2, 3, 4, 5, 6, 7, 8, 9]
+
+
+@pytest.mark.unit
+async def test_merge_error_cancels_sources():
+    """Test that a failing source raises, and the others are cancelled."""
+    cancelled = asyncio.Event()
+
+    async def failing():
+        yield 1
+        raise RuntimeError('boom')
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+            yield 2
+        finally:
+            cancelled.set()
+
+    with pytest.raises(RuntimeError, match='boom'):
+        async for _ in merge([failing(), slow()]):
+            pass
+    assert cancelled.is_set()
+
+
+@pytest.mark.unit
+async def test_merge_invalid_buffer():
+    """Test that a buffer size or lookahead below 1 is rejected."""
+    with pytest.raises(ValueError):
+        async for _ in merge([_source([1], 0)], buffer=0):
+            pass
+    with pytest.raises(ValueError):
+        async for _ in merge([_source([1], 0)], lookahead=0):
+            pass
+
+
+@pytest.mark.unit
+async def test_buffered_runs_ahead_and_cancels():
+    """Test that buffered sources run ahead of the consumer and stop when it does."""
+    produced: list[int] = []
+    stream = buffered(_source([1, 2, 3, 4, 5, 6], 0, produced), 2)
+    assert await anext(stream) == 1
+    await asyncio.sleep(0.01)
+    # Ran ahead while we weren't looking, but only as far as the buffer allows
+    assert 3 <= len(produced) <= 4
+    await stream.aclose()
+    count = len(produced)
+    await asyncio.sleep(0.01)
+    assert len(produced) == count
+
+
+@pytest.mark.unit
+async def test_merge_sorted():
+    """Test that sorted sources are merged into one sorted stream."""
+    results = [
+        item
+        async for item in merge_sorted(
+            [_source([1, 4, 9], 0.01), _source([2, 3, 10], 0), _source([], 0)],
+            key=lambda item: item,
+        )
+    ]
+    assert results == [1, 2, 3, 4, 9, 10]
+
+
+@pytest.mark.unit
+async def test_merge_sorted_ties_keep_source_order():
+    """Test that equal keys come out in the order of their sources."""
+    results = [
+        item
+        async for item in merge_sorted(
+            [_source(['b1', 'b2'], 0), _source(['a1', 'a2'], 0)],
+            key=lambda item: item[1],
+        )
+    ]
+    assert results == ['b1', 'a1', 'b2', 'a2']
+
+
+@pytest.mark.unit
+async def test_merge_sorted_error():
+    """Test that a source failing while the first items are fetched is raised."""
+
+    async def failing():
+        raise RuntimeError('boom')
+        yield 1
+
+    with pytest.raises(RuntimeError, match='boom'):
+        async for _ in merge_sorted(
+            [_source([1], 0.01), failing()], key=lambda item: item
+        ):
+            pass
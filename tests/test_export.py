@@ -0,0 +1,206 @@
+"""Tests for export.py."""
+
+from typing import Annotated, Optional
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from xivapy.client import Client
+from xivapy.model import FieldMapping, Model, QueryField
+from xivapy.types import LangDict
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from xivapy.export import (  # noqa: E402
+    arrow_schema,
+    search_batches,
+    sheet_batches,
+    write_parquet,
+)
+
+
+class ExportedItem(Model):
+    """Item model used by the export tests."""
+
+    name: QueryField[str] = QueryField(FieldMapping('Name'))
+    level: Annotated[int, FieldMapping('LevelItem')] = 0
+    names: Optional[LangDict] = None
+    tags: list[str] = []
+    extra: Optional[dict] = None
+    __sheetname__ = 'Item'
+
+
+ROWS = {
+    1: {'Name': 'Iron Sword', 'LevelItem': 10, 'tags': ['a'], 'extra': {'x': 1}},
+    2: {'Name': 'Steel Sword', 'LevelItem': 30, 'tags': []},
+    3: {'Name': 'Bronze Shield', 'LevelItem': 5, 'tags': ['b', 'c']},
+}
+
+
+def _sheet_callback(requests: list[httpx.URL]):
+    """Build an httpx_mock callback serving ROWS by id or page by page."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        if 'rows' in request.url.params:
+            ids = [int(row) for row in request.url.params['rows'].split(',')]
+        else:
+            after = int(request.url.params.get('after', -1))
+            limit = int(request.url.params['limit'])
+            ids = sorted(row for row in ROWS if row > after)[:limit]
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {'row_id': row, 'fields': dict(ROWS[row])}
+                    for row in ids
+                    if row in ROWS
+                ]
+            },
+        )
+
+    return callback
+
+
+@pytest.mark.unit
+def test_arrow_schema():
+    """Test that the schema is typed from the model's annotations."""
+    schema = arrow_schema(ExportedItem)
+    assert schema.names == ['row_id', 'name', 'level', 'names', 'tags', 'extra']
+    assert schema.field('row_id').type == pa.int64()
+    assert schema.field('name').type == pa.string()
+    assert schema.field('level').type == pa.int64()
+    assert pa.types.is_struct(schema.field('names').type)
+    assert schema.field('names').type.field('en').type == pa.string()
+    assert schema.field('tags').type == pa.list_(pa.string())
+    # Values with no Arrow type of their own are kept as JSON
+    assert schema.field('extra').type == pa.string()
+
+    search_schema = arrow_schema(ExportedItem, search=True)
+    assert search_schema.names[:3] == ['score', 'sheet', 'row_id']
+
+
+@pytest.mark.unit
+def test_arrow_schema_mapped_row_id():
+    """Test that no extra row_id column is added when the model maps one."""
+
+    class IdItem(Model):
+        """Item model with its own row id field."""
+
+        id: Annotated[int, FieldMapping('row_id')]
+        Name: str
+
+    assert arrow_schema(IdItem).names == ['id', 'Name']
+
+
+@pytest.mark.integration
+async def test_sheet_batches_all_rows(httpx_mock: HTTPXMock):
+    """Test that every row of a sheet is exported, a batch per page."""
+    requests: list[httpx.URL] = []
+    httpx_mock.add_callback(_sheet_callback(requests), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        batches = [batch async for batch in sheet_batches(client, ExportedItem)]
+
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.column('row_id').to_pylist() == [1, 2, 3]
+    assert table.column('name').to_pylist() == [
+        'Iron Sword',
+        'Steel Sword',
+        'Bronze Shield',
+    ]
+    assert table.column('level').to_pylist() == [10, 30, 5]
+    assert table.column('tags').to_pylist() == [['a'], [], ['b', 'c']]
+    assert table.column('extra').to_pylist() == ['{"x": 1}', None, None]
+    assert requests[0].params['fields'] == ExportedItem.get_fields_str()
+
+
+@pytest.mark.integration
+async def test_sheet_batches_rows(httpx_mock: HTTPXMock):
+    """Test exporting chosen rows."""
+    httpx_mock.add_callback(_sheet_callback([]), is_reusable=True)
+
+    async with Client() as client:
+        batches = [
+            batch async for batch in sheet_batches(client, ExportedItem, rows=[3, 1])
+        ]
+
+    table = pa.Table.from_batches(batches)
+    assert table.column('row_id').to_pylist() == [3, 1]
+
+
+@pytest.mark.integration
+async def test_search_batches(httpx_mock: HTTPXMock):
+    """Test that search results are exported with their score and sheet."""
+    results = [
+        {
+            'score': 1.0 - row / 10,
+            'sheet': 'Item',
+            'row_id': row,
+            'fields': dict(ROWS[row]),
+        }
+        for row in ROWS
+    ]
+    httpx_mock.add_response(
+        url=httpx.URL(
+            'https://v2.xivapi.com/api/search',
+            params={
+                'sheets': 'Item',
+                'query': 'Name~"Sword"',
+                'fields': ExportedItem.get_fields_str(),
+                'version': 'latest',
+                'limit': 2,
+            },
+        ),
+        json={'results': results[:2], 'next': 'cursor'},
+    )
+
+    async with Client() as client:
+        batches = [
+            batch
+            async for batch in search_batches(
+                client, ExportedItem, 'Name~"Sword"', limit=2
+            )
+        ]
+
+    table = pa.Table.from_batches(batches)
+    assert table.schema == arrow_schema(ExportedItem, search=True)
+    assert table.column('score').to_pylist() == pytest.approx([0.9, 0.8])
+    assert table.column('sheet').to_pylist() == ['Item', 'Item']
+    assert table.column('row_id').to_pylist() == [1, 2]
+    assert table.column('name').to_pylist() == ['Iron Sword', 'Steel Sword']
+
+
+@pytest.mark.integration
+async def test_write_parquet(httpx_mock: HTTPXMock, tmp_path):
+    """Test writing exported rows to a Parquet file and reading them back."""
+    httpx_mock.add_callback(_sheet_callback([]), is_reusable=True)
+    path = tmp_path / 'items.parquet'
+
+    async with Client(batch_size=2) as client:
+        written = await write_parquet(sheet_batches(client, ExportedItem), path)
+
+    assert written == 3
+    table = pq.read_table(path)
+    assert table.schema == arrow_schema(ExportedItem)
+    assert table.column('level').to_pylist() == [10, 30, 5]
+
+
+@pytest.mark.unit
+async def test_write_parquet_empty(tmp_path):
+    """Test that an empty file is only written when a schema is given."""
+
+    async def no_batches():
+        return
+        yield
+
+    path = tmp_path / 'empty.parquet'
+    assert await write_parquet(no_batches(), path) == 0
+    assert not path.exists()
+    assert (
+        await write_parquet(no_batches(), path, schema=arrow_schema(ExportedItem)) == 0
+    )
+    assert pq.read_table(path).num_rows == 0
@@ -0,0 +1,133 @@
+"""Tests for index.py."""
+
+import pytest
+
+from xivapy.index import HashIndex, NgramIndex, SortedIndex
+from xivapy.model import FieldMapping, Model, QueryField
+from xivapy.query import Query
+
+
+class IndexedItem(Model):
+    """Item model whose QueryFields are used as index probes."""
+
+    row_id: int
+    name: QueryField[str] = QueryField(FieldMapping('Name'))
+    level: QueryField[int] = QueryField(FieldMapping('LevelItem'))
+
+
+@pytest.mark.unit
+def test_hash_index_equality():
+    """Test that a hash index finds equal values, ignoring case for strings."""
+    index = HashIndex(IndexedItem.name)
+    index.add(1, 'Iron Sword')
+    index.add(2, 'iron sword')
+    index.add(3, 'Steel Sword')
+    assert index.field == 'Name'
+    assert index.probe(IndexedItem.name == 'IRON SWORD') == {1, 2}
+    assert index.probe(IndexedItem.name == 'Bronze') == set()
+    assert len(index) == 3
+
+
+@pytest.mark.unit
+def test_hash_index_replace_and_remove():
+    """Test that re-adding a row replaces its value, and removing drops it."""
+    index = HashIndex('LevelItem')
+    index.add(1, 10)
+    index.add(1, 20)
+    assert index.probe(Query('LevelItem', '=', 10)) == set()
+    assert index.probe(Query('LevelItem', '=', 20)) == {1}
+    index.remove(1)
+    index.remove(1)
+    assert index.probe(Query('LevelItem', '=', 20)) == set()
+    assert len(index) == 0
+
+
+@pytest.mark.unit
+def test_hash_index_lang_dict():
+    """Test that a LangDict value is indexed in every language."""
+    index = HashIndex('Name')
+    index.add(1, {'en': 'Iron Sword', 'ja': '鉄の剣'})
+    assert index.probe(Query('Name', '=', '鉄の剣')) == {1}
+    assert index.probe(Query('Name', '=', 'iron sword')) == {1}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    'query,expected',
+    [
+        (IndexedItem.level < 30, {1}),
+        (IndexedItem.level <= 30, {1, 2, 4}),
+        (IndexedItem.level > 30, {3}),
+        (IndexedItem.level >= 30, {2, 3, 4}),
+        (IndexedItem.level > 50, set()),
+    ],
+)
+def test_sorted_index_ranges(query, expected):
+    """Test each range operator against a sorted index."""
+    index = SortedIndex(IndexedItem.level)
+    for row_id, level in [(1, 10), (2, 30), (3, 50), (4, 30)]:
+        index.add(row_id, level)
+    assert index.probe(query) == expected
+
+
+@pytest.mark.unit
+def test_sorted_index_updates():
+    """Test that a sorted index sees rows changed after it was first probed."""
+    index = SortedIndex('LevelItem')
+    index.add(1, 10)
+    index.add(2, 'not a number')
+    assert index.probe(Query('LevelItem', '>', 5)) == {1}
+    index.add(2, 20)
+    index.remove(1)
+    assert index.probe(Query('LevelItem', '>', 5)) == {2}
+    assert index.probe(Query('LevelItem', '>', 'a')) is None
+
+
+@pytest.mark.unit
+def test_ngram_index_contains():
+    """Test that an n-gram index finds strings containing the text, ignoring case."""
+    index = NgramIndex(IndexedItem.name)
+    index.add(1, 'Iron Sword')
+    index.add(2, 'Iron Shield')
+    index.add(3, 'Sword')
+    assert index.probe(IndexedItem.name.contains('SWOR')) == {1, 3}
+    assert index.probe(IndexedItem.name.contains('iron s')) == {1, 2}
+    # Has every trigram of the text, but not the text itself
+    index.add(4, 'abcd bcde')
+    assert index.probe(IndexedItem.name.contains('abcde')) == set()
+
+
+@pytest.mark.unit
+def test_ngram_index_short_text():
+    """Test contains queries shorter than the n-grams."""
+    index = NgramIndex('Name')
+    index.add(1, 'Iron Sword')
+    index.add(2, 'Ax')
+    assert index.probe(Query('Name', '~', 'x')) == {2}
+    assert index.probe(Query('Name', '~', 'wo')) == {1}
+    assert index.probe(Query('Name', '~', '')) == {1, 2}
+
+
+@pytest.mark.unit
+def test_ngram_index_lang_dict_and_remove():
+    """Test that an n-gram index covers every language, and forgets removed rows."""
+    index = NgramIndex('Name', n=2)
+    index.add(1, {'en': 'Iron Sword', 'ja': '鉄の剣'})
+    index.add(2, {'en': 'Steel Sword', 'ja': '鋼の剣'})
+    assert index.probe(Query('Name', '~', 'の剣')) == {1, 2}
+    index.remove(1)
+    assert index.probe(Query('Name', '~', 'の剣')) == {2}
+    with pytest.raises(ValueError):
+        NgramIndex('Name', n=0)
+
+
+@pytest.mark.unit
+def test_index_rejects_other_queries():
+    """Test that probing with another field or operation raises ValueError."""
+    index = HashIndex('Name')
+    with pytest.raises(ValueError):
+        index.probe(Query('LevelItem', '=', 1))
+    with pytest.raises(ValueError):
+        index.probe(Query('Name', '~', 'Sword'))
+    assert not index.supports(Query('Name', '~', 'Sword'))
+    assert index.supports(Query('Name', '=', 'Sword'))
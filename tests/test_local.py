@@ -0,0 +1,273 @@
+"""Tests for local.py."""
+
+from typing import Annotated, Optional
+
+import pytest
+
+from xivapy.client import SearchResult
+from xivapy.exceptions import QueryBuildError
+from xivapy.local import LocalSheet
+from xivapy.model import FieldMapping, Model, QueryField
+from xivapy.query import Group, Query, QueryBuilder
+from xivapy.types import LangDict
+
+
+class LocalItem(Model):
+    """Item model used by the local search tests."""
+
+    id: Annotated[int, FieldMapping('row_id')]
+    name: QueryField[str] = QueryField(FieldMapping('Name'))
+    level: QueryField[int] = QueryField(FieldMapping('LevelItem'))
+    category: Optional[str] = QueryField(FieldMapping('ItemUICategory.Name'))
+    names: Optional[LangDict] = QueryField(FieldMapping('Name', languages=['en', 'ja']))
+    untradable: bool = False
+    __sheetname__ = 'Item'
+
+
+def _items() -> LocalSheet[LocalItem]:
+    """Builds a small local Item sheet."""
+    rows = [
+        (1, 'Iron Sword', 10, 'Sword', {'en': 'Iron Sword', 'ja': '鉄の剣'}, False),
+        (2, 'Steel Sword', 30, 'Sword', {'en': 'Steel Sword', 'ja': '鋼の剣'}, True),
+        (3, 'Bronze Shield', 5, 'Shield', {'en': 'Bronze Shield'}, False),
+        (4, 'Mythril Sword', 50, 'Sword', None, False),
+    ]
+    return LocalSheet(
+        LocalItem,
+        [
+            LocalItem(
+                id=row_id,
+                name=name,
+                level=level,
+                category=category,
+                names=names,
+                untradable=untradable,
+            )
+            for row_id, name, level, category, names, untradable in rows
+        ],
+    )
+
+
+def _ids(results: list[SearchResult[LocalItem]]) -> list[int]:
+    """Returns the row ids of some results, in order."""
+    return [result.row_id for result in results]
+
+
+@pytest.mark.unit
+def test_local_equality_ignores_case():
+    """Test that = matches whole strings, ignoring case."""
+    results = _items().search(QueryBuilder().where(Name='iron sword'))
+    assert _ids(results) == [1]
+    assert results[0].sheet == 'Item'
+    assert results[0].data.name == 'Iron Sword'
+    assert results[0].score == 1.0
+
+
+@pytest.mark.unit
+def test_local_contains():
+    """Test that ~ matches anywhere in a string."""
+    results = _items().search(QueryBuilder().contains(Name='SWORD'))
+    assert _ids(results) == [1, 2, 4]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    'query,expected',
+    [
+        (QueryBuilder().gt(LevelItem=10), [2, 4]),
+        (QueryBuilder().gte(LevelItem=10), [1, 2, 4]),
+        (QueryBuilder().lt(LevelItem=10), [3]),
+        (QueryBuilder().lte(LevelItem=10), [1, 3]),
+    ],
+)
+def test_local_comparisons(query, expected):
+    """Test the numeric comparison operators."""
+    assert _ids(_items().search(query)) == expected
+
+
+@pytest.mark.unit
+def test_local_required_and_excluded():
+    """Test that required clauses must match and excluded clauses must not."""
+    query = (
+        QueryBuilder()
+        .contains(Name='Sword')
+        .required()
+        .where(untradable=True)
+        .excluded()
+    )
+    assert _ids(_items().search(query)) == [1, 4]
+
+
+@pytest.mark.unit
+def test_local_optional_clauses_score():
+    """Test that optional clauses only need one match, and rank by how many matched."""
+    query = QueryBuilder().contains(Name='Sword').gte(LevelItem=30)
+    results = _items().search(query)
+    assert _ids(results) == [2, 4, 1]
+    assert [result.score for result in results] == [1.0, 1.0, 0.5]
+
+
+@pytest.mark.unit
+def test_local_required_with_optional():
+    """Test that optional clauses don't need to match alongside a required one."""
+    query = QueryBuilder().contains(Name='Sword').required().lt(LevelItem=20)
+    results = _items().search(query)
+    assert _ids(results) == [1, 2, 4]
+    assert results[0].score == 1.0
+    assert results[1].score == 0.5
+
+
+@pytest.mark.unit
+def test_local_only_excluded_matches_nothing():
+    """Test that a query with only excluded clauses matches no rows, as in xivapi."""
+    query = QueryBuilder().where(Name='Iron Sword').excluded()
+    assert _items().search(query) == []
+
+
+@pytest.mark.unit
+def test_local_nested_field():
+    """Test querying a dotted field mapped to a model field."""
+    query = QueryBuilder().where(**{'ItemUICategory.Name': 'shield'})
+    assert _ids(_items().search(query)) == [3]
+
+
+@pytest.mark.unit
+def test_local_group():
+    """Test that a group matches when any of its items do."""
+    query = (
+        QueryBuilder()
+        .or_any(
+            Query('LevelItem', '<', 6),
+            QueryBuilder().where(Name='Mythril Sword'),
+        )
+        .required()
+    )
+    assert _ids(_items().search(query)) == [3, 4]
+    assert _ids(_items().search(Group([Query('LevelItem', '>', 40)]))) == [4]
+
+
+@pytest.mark.unit
+def test_local_excluded_group():
+    """Test that an excluded group removes rows matching any of its items."""
+    query = (
+        QueryBuilder()
+        .gt(LevelItem=0)
+        .required()
+        .or_any(Query('LevelItem', '<', 6), Query('LevelItem', '>', 40))
+        .excluded()
+    )
+    assert _ids(_items().search(query)) == [1, 2]
+
+
+@pytest.mark.unit
+def test_local_language_field():
+    """Test that language dicts match on any language, or the one asked for."""
+    items = _items()
+    assert _ids(items.search(Query('Name', '~', '剣'))) == [1, 2]
+    assert _ids(items.search(Query('Name@lang(ja)', '=', '鉄の剣'))) == [1]
+    assert _ids(items.search(Query('Name@lang(en)', '=', '鉄の剣'))) == []
+
+
+@pytest.mark.unit
+def test_local_query_descriptors():
+    """Test that QueryField comparisons can be searched with directly."""
+    items = _items()
+    assert _ids(items.search(LocalItem.level >= 30)) == [2, 4]
+    assert _ids(items.search(LocalItem.name.contains('shield'))) == [3]
+
+
+@pytest.mark.unit
+def test_local_row_id_and_limit():
+    """Test querying row_id and limiting the results."""
+    items = _items()
+    assert _ids(items.search(QueryBuilder().gt(row_id=1), limit=2)) == [2, 3]
+    with pytest.raises(ValueError):
+        items.search(QueryBuilder().gt(row_id=1), limit=-1)
+
+
+@pytest.mark.unit
+def test_local_unknown_field():
+    """Test that querying a field the model doesn't have raises QueryBuildError."""
+    with pytest.raises(QueryBuildError):
+        _items().search(QueryBuilder().where(Rarity=1))
+
+
+@pytest.mark.unit
+def test_local_rows_without_row_id():
+    """Test rows without a row_id field, given by row id instead."""
+
+    class Plain(Model):
+        """A model without a row id field."""
+
+        Name: str
+
+    sheet = LocalSheet(Plain, {7: Plain(Name='Seven'), 3: Plain(Name='Three')})
+    assert len(sheet) == 2
+    assert 7 in sheet
+    assert [row.Name for row in sheet] == ['Three', 'Seven']
+    assert _ids(sheet.search(QueryBuilder().where(row_id=7))) == [7]
+    with pytest.raises(ValueError):
+        sheet.add(Plain(Name='Unknown'))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    'query',
+    [
+        QueryBuilder().where(Name='iron sword'),
+        QueryBuilder().contains(Name='Sword').required().gte(LevelItem=30),
+        QueryBuilder().contains(Name='sword').gte(LevelItem=30),
+        QueryBuilder().gt(LevelItem=5).required().where(untradable=True).excluded(),
+        QueryBuilder()
+        .or_any(Query('LevelItem', '<', 6), Query('Name', '~', 'myth'))
+        .required(),
+        QueryBuilder().contains(Name='剣').lt(LevelItem=20),
+        QueryBuilder().contains(Name='Sword').where(untradable=True),
+    ],
+)
+def test_local_indexed_search_matches_scan(query):
+    """Test that searches using indexes find the same results as a full scan."""
+    indexed = _items()
+    indexed.create_index('Name')
+    indexed.create_index(LocalItem.name, 'ngram')
+    indexed.create_index(LocalItem.level, 'sorted')
+    assert indexed.search(query) == _items().search(query)
+
+
+@pytest.mark.unit
+def test_local_index_narrows_rows():
+    """Test that an indexed required clause only checks the rows it found."""
+    items = _items()
+    index = items.create_index(LocalItem.level, 'sorted')
+    assert index.probe(LocalItem.level >= 30) == {2, 4}
+
+    checked = []
+    compile_score = items._compile
+
+    def spy(clauses):
+        score = compile_score(clauses)
+
+        def wrapped(row):
+            checked.append(row[0])
+            return score(row)
+
+        return wrapped
+
+    items._compile = spy  # type: ignore[method-assign]
+    results = items.search(QueryBuilder().gte(LevelItem=30).required())
+    assert _ids(results) == [2, 4]
+    assert sorted(checked) == [2, 4]
+
+
+@pytest.mark.unit
+def test_local_index_follows_added_rows():
+    """Test that indexes pick up rows added after they were made."""
+    items = _items()
+    items.create_index(LocalItem.name)
+    items.add(LocalItem(id=5, name='Iron Sword', level=1, category=None, names=None))
+    items.add(LocalItem(id=1, name='Renamed', level=10, category=None, names=None))
+    assert _ids(items.search(LocalItem.name == 'iron sword')) == [5]
+    with pytest.raises(QueryBuildError):
+        items.create_index('Rarity')
+    with pytest.raises(ValueError):
+        items.create_index('Name', 'btree')  # type: ignore[arg-type]
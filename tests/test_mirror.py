@@ -0,0 +1,281 @@
+"""Tests for mirror.py."""
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from xivapy.client import Client
+from xivapy.exceptions import XIVAPIError
+from xivapy.mirror import SheetMirror, SyncResult
+from xivapy.model import Model
+from xivapy.query import QueryBuilder
+
+
+class MirroredItem(Model):
+    """Item model used by the mirror tests."""
+
+    row_id: int
+    Name: str
+    Level: int = 0
+    __sheetname__ = 'Item'
+
+
+def _versioned_sheet(
+    sheets: dict[str, dict[int, dict]], versions: list[str], requests: list[str]
+):
+    """Build an httpx_mock callback serving a sheet (and the version list) per version."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/api/version':
+            return httpx.Response(200, json={'versions': [{'names': list(versions)}]})
+        version = request.url.params['version']
+        requests.append(version)
+        after = int(request.url.params.get('after', -1))
+        limit = int(request.url.params['limit'])
+        rows = sorted(row for row in sheets[version] if row > after)[:limit]
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {'row_id': row, 'fields': dict(sheets[version][row])}
+                    for row in rows
+                ]
+            },
+        )
+
+    return callback
+
+
+SHEETS = {
+    '7.0': {
+        1: {'Name': 'Iron Sword', 'Level': 10},
+        2: {'Name': 'Steel Sword', 'Level': 30},
+        3: {'Name': 'Bronze Shield', 'Level': 5},
+    },
+    '7.1': {
+        1: {'Name': 'Iron Sword', 'Level': 10},
+        2: {'Name': 'Steel Sword', 'Level': 35},
+        4: {'Name': 'Mythril Sword', 'Level': 50},
+    },
+}
+
+
+def _row_data_count(mirror: SheetMirror) -> int:
+    """Returns how many distinct rows' data the mirror is storing."""
+    return mirror._db.execute('SELECT COUNT(*) FROM row_data').fetchone()[0]
+
+
+@pytest.mark.integration
+async def test_mirror_sync_and_read(httpx_mock: HTTPXMock):
+    """Test that synced rows are read back like Client.sheet, without requests."""
+    requests: list[str] = []
+    httpx_mock.add_callback(
+        _versioned_sheet(SHEETS, ['7.0'], requests), is_reusable=True
+    )
+
+    async with Client(game_version='7.0', batch_size=2) as client:
+        mirror = SheetMirror(client)
+        result = await mirror.sync(MirroredItem)
+        assert result == SyncResult('Item', '7.0', added=3)
+        # Two pages of rows, then an empty page to show it's the end
+        assert requests == ['7.0', '7.0', '7.0']
+
+        item = await mirror.sheet(MirroredItem, row=2)
+        assert item == MirroredItem(row_id=2, Name='Steel Sword', Level=30)
+        assert await mirror.sheet(MirroredItem, row=99) is None
+        rows = [row.row_id async for row in mirror.sheet(MirroredItem, rows=[3, 99, 1])]
+        assert rows == [3, 1]
+        every = [row.Name async for row in mirror.sheet_all(MirroredItem)]
+        assert every == ['Iron Sword', 'Steel Sword', 'Bronze Shield']
+        assert mirror.versions(MirroredItem) == ['7.0']
+        assert len(requests) == 3
+
+
+@pytest.mark.integration
+async def test_mirror_sync_new_version(httpx_mock: HTTPXMock):
+    """Test that syncing a new version only stores the rows that changed."""
+    requests: list[str] = []
+    httpx_mock.add_callback(
+        _versioned_sheet(SHEETS, ['7.0', '7.1'], requests), is_reusable=True
+    )
+
+    async with Client(game_version='7.0') as client:
+        mirror = SheetMirror(client)
+        await mirror.sync(MirroredItem)
+        assert _row_data_count(mirror) == 3
+
+        result = await mirror.sync(MirroredItem, '7.1')
+        assert result == SyncResult(
+            'Item', '7.1', added=1, changed=1, removed=1, unchanged=1
+        )
+        # Only the changed and added rows were stored
+        assert _row_data_count(mirror) == 5
+
+        old = await mirror.sheet(MirroredItem, row=2)
+        new = await mirror.sheet(MirroredItem, row=2, version='7.1')
+        assert old is not None and old.Level == 30
+        assert new is not None and new.Level == 35
+        assert await mirror.sheet(MirroredItem, row=3, version='7.1') is None
+        assert mirror.versions(MirroredItem) == ['7.0', '7.1']
+
+        # Pinned versions never change, so they aren't fetched again
+        assert (await mirror.sync(MirroredItem, '7.1')).skipped
+        assert requests == ['7.0', '7.0', '7.1', '7.1']
+
+
+@pytest.mark.integration
+async def test_mirror_resync_latest(httpx_mock: HTTPXMock):
+    """Test that resyncing latest replaces its rows, dropping data nothing uses."""
+    sheets = {'latest': dict(SHEETS['7.0'])}
+    requests: list[str] = []
+    httpx_mock.add_callback(
+        _versioned_sheet(sheets, ['7.0'], requests), is_reusable=True
+    )
+
+    async with Client() as client:
+        mirror = SheetMirror(client)
+        await mirror.sync(MirroredItem)
+        sheets['latest'] = dict(SHEETS['7.1'])
+        result = await mirror.sync(MirroredItem)
+
+        assert result == SyncResult(
+            'Item', 'latest', added=1, changed=1, removed=1, unchanged=1
+        )
+        assert _row_data_count(mirror) == 3
+        assert mirror.versions(MirroredItem) == ['latest']
+        names = [row.Name async for row in mirror.sheet_all(MirroredItem)]
+        assert names == ['Iron Sword', 'Steel Sword', 'Mythril Sword']
+
+
+@pytest.mark.integration
+async def test_mirror_failed_sync_keeps_old_rows(httpx_mock: HTTPXMock):
+    """Test that a sync that fails part way leaves the old rows readable."""
+    sheets = {'latest': dict(SHEETS['7.0'])}
+    httpx_mock.add_callback(_versioned_sheet(sheets, [], []), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        mirror = SheetMirror(client)
+        await mirror.sync(MirroredItem)
+
+        httpx_mock.reset()
+        httpx_mock.add_response(status_code=500, is_reusable=True)
+        with pytest.raises(XIVAPIError):
+            await mirror.sync(MirroredItem)
+
+        assert [row.row_id async for row in mirror.sheet_all(MirroredItem)] == [1, 2, 3]
+
+
+@pytest.mark.integration
+async def test_mirror_update_on_new_version(httpx_mock: HTTPXMock):
+    """Test that update only syncs when xivapi lists a version it hasn't seen."""
+    sheets = {'latest': dict(SHEETS['7.0'])}
+    versions = ['7.0']
+    requests: list[str] = []
+    httpx_mock.add_callback(
+        _versioned_sheet(sheets, versions, requests), is_reusable=True
+    )
+
+    async with Client() as client:
+        mirror = SheetMirror(client)
+        assert [result.added for result in await mirror.update(MirroredItem)] == [3]
+        assert await mirror.update(MirroredItem) == []
+        assert requests == ['latest', 'latest']
+
+        versions.append('7.1')
+        sheets['latest'] = dict(SHEETS['7.1'])
+        [result] = await mirror.update(MirroredItem)
+        assert result.changed == 1
+        assert requests == ['latest'] * 4
+
+
+@pytest.mark.integration
+async def test_mirror_persists(httpx_mock: HTTPXMock, tmp_path):
+    """Test that a mirror in a file can be read after reopening it."""
+    httpx_mock.add_callback(_versioned_sheet(SHEETS, [], []), is_reusable=True)
+
+    async with Client(game_version='7.0') as client:
+        mirror = SheetMirror(client, tmp_path / 'mirror.db')
+        await mirror.sync(MirroredItem)
+        mirror.close()
+
+        reopened = SheetMirror(client, tmp_path / 'mirror.db')
+        item = await reopened.sheet(MirroredItem, row=3)
+        assert item is not None and item.Name == 'Bronze Shield'
+        reopened.close()
+
+
+@pytest.mark.integration
+async def test_mirror_local(httpx_mock: HTTPXMock):
+    """Test loading mirrored rows into a LocalSheet."""
+    httpx_mock.add_callback(_versioned_sheet(SHEETS, [], []), is_reusable=True)
+
+    async with Client(game_version='7.0') as client:
+        mirror = SheetMirror(client)
+        await mirror.sync(MirroredItem)
+        local = mirror.local(MirroredItem)
+
+    results = local.search(QueryBuilder().contains(Name='sword'))
+    assert [result.row_id for result in results] == [1, 2]
+
+
+class MirroredSubrow(Model):
+    """Subrow model used by the mirror tests."""
+
+    row_id: int
+    subrow_id: int
+    Name: str
+    __sheetname__ = 'Quest'
+
+
+@pytest.mark.regression
+async def test_mirror_keeps_subrows(httpx_mock: HTTPXMock):
+    """Test that every subrow of a row is mirrored, not just the last one read."""
+    rows = [(row, subrow) for row in range(1, 4) for subrow in range(3)]
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        after = tuple(map(int, request.url.params.get('after', '0:-1').split(':')))
+        limit = int(request.url.params['limit'])
+        page = [key for key in rows if key > after][:limit]
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {
+                        'row_id': row,
+                        'subrow_id': subrow,
+                        'fields': {'Name': f'{row}.{subrow}'},
+                    }
+                    for row, subrow in page
+                ]
+            },
+        )
+
+    httpx_mock.add_callback(callback, is_reusable=True)
+
+    async with Client(game_version='7.0', batch_size=4) as client:
+        mirror = SheetMirror(client)
+        result = await mirror.sync(MirroredSubrow)
+        assert result == SyncResult('Quest', '7.0', added=9)
+
+        every = [
+            (row.row_id, row.subrow_id)
+            async for row in mirror.sheet_all(MirroredSubrow)
+        ]
+        assert every == rows
+        picked = [row.Name async for row in mirror.sheet(MirroredSubrow, rows=[3, 1])]
+        assert picked == ['3.0', '3.1', '3.2', '1.0', '1.1', '1.2']
+        first = await mirror.sheet(MirroredSubrow, row=2)
+        assert first is not None and first.Name == '2.0'
+
+
+@pytest.mark.unit
+async def test_mirror_not_synced():
+    """Test that reading a sheet that hasn't been mirrored raises XIVAPIError."""
+    async with Client(game_version='7.0') as client:
+        mirror = SheetMirror(client)
+        with pytest.raises(XIVAPIError):
+            await mirror.sheet(MirroredItem, row=1)
+        with pytest.raises(XIVAPIError):
+            mirror.local(MirroredItem)
+        with pytest.raises(ValueError):
+            mirror.sheet(MirroredItem)
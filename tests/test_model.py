@@ -323,3 +323,209 @@ def test_queryfield_mappings_private():
     assert not hasattr(Test, '_queryfield_mappings')  # old name
     assert hasattr(Test, '__queryfield_mappings__')
     assert hasattr(Test, '__querydescriptor_mappings__')
+
+
+@pytest.mark.unit
+def test_mapping_plan_compiled_per_class(monkeypatch):
+    """Test that field mappings are worked out once per class, not per row."""
+
+    class Test(Model):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[LangDict, FieldMapping('Name', languages=['en'])]
+        content: Annotated[str, FieldMapping('Content.Name')]
+
+    assert '__xivapi_mapping_plan__' in Test.__dict__
+
+    def fail(*args, **kwargs):
+        raise AssertionError('field mapping looked up while validating')
+
+    monkeypatch.setattr(Test, '_get_field_mapping', fail)
+    result = Test.model_validate(
+        {
+            'row_id': 3,
+            'Name@lang(en)': 'Three',
+            'Content': {'fields': {'Name': 'Nested'}},
+        }
+    )
+    assert result.id == 3
+    assert result.name == {'en': 'Three'}
+    assert result.content == 'Nested'
+
+
+@pytest.mark.unit
+def test_inherited_optional_queryfield_defaults_to_none():
+    """Test that optional QueryFields from a parent model default to None when missing."""
+
+    class Base(Model):
+        row_id: QueryField[int]
+        icon: QueryField[int | None] = QueryField(FieldMapping('Icon'))
+
+    class Derived(Base):
+        name: QueryField[str] = QueryField(FieldMapping('Name'))
+
+    result = Derived.model_validate({'row_id': 1, 'Name': 'Foo'})
+    assert result.icon is None
+    assert result.name == 'Foo'
+
+
+@pytest.mark.unit
+def test_fields_str_sorted_and_cached():
+    """Test that the fields string is deterministic and only built once per class."""
+
+    class Test(Model):
+        zed: int
+        alpha: Annotated[str, FieldMapping('Name')]
+        mid: Annotated[int, FieldMapping('Level', raw=True)]
+
+    fields_str = Test.get_fields_str()
+    assert fields_str == 'Level@as(raw),Name,zed'
+    assert Test.get_fields_str() is fields_str
+
+
+@pytest.mark.unit
+def test_fields_cache_not_shared_with_subclass():
+    """Test that a subclass works out its own fields instead of reusing its parent's."""
+
+    class Base(Model):
+        row_id: int
+
+    assert Base.get_fields_str() == 'row_id'
+
+    class Derived(Base):
+        Name: str
+
+    assert Derived.get_fields_str() == 'Name,row_id'
+    assert Base.get_fields_str() == 'row_id'
+
+
+@pytest.mark.unit
+def test_model_rebuild_clears_field_cache():
+    """Test that rebuilding a model works its fields out again."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    Test.get_fields_str()
+    Test.model_validate({'row_id': 1, 'Name': 'Foo'})
+    assert '__xivapi_fields_str__' in Test.__dict__
+
+    Test.model_rebuild(force=True)
+    assert '__xivapi_fields_str__' not in Test.__dict__
+    assert '__xivapi_mapping_plan__' not in Test.__dict__
+    assert Test.get_fields_str() == 'Name,row_id'
+    assert Test.model_validate({'row_id': 1, 'Name': 'Foo'}).name == 'Foo'
+
+
+@pytest.mark.unit
+def test_list_adapter_cached():
+    """Test that the page validation adapter is built once per class."""
+
+    class Test(Model):
+        row_id: int
+        name: Annotated[str, FieldMapping('Name')]
+
+    adapter = Test._get_list_adapter()
+    assert Test._get_list_adapter() is adapter
+    rows = adapter.validate_python([{'row_id': 1, 'Name': 'Foo'}])
+    assert rows == [Test(row_id=1, name='Foo')]
+
+
+@pytest.mark.unit
+def test_construct_matches_validation():
+    """Test that building without validation gives the same model as validating good data."""
+
+    class Base(Model):
+        row_id: QueryField[int]
+        icon: QueryField[int | None] = QueryField(FieldMapping('Icon'))
+
+    class Test(Base):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[LangDict, FieldMapping('Name', languages=['en', 'de'])]
+        content: Annotated[str, FieldMapping('Content.Name')]
+        level: Annotated[int, FieldMapping('Level')] = 1
+        tags: list[str] = []
+
+    rows = [
+        {
+            'row_id': 3,
+            'Name@lang(en)': 'Three',
+            'Name@lang(de)': 'Drei',
+            'Content': {'fields': {'Name': 'Nested'}},
+            'Level': 7,
+            'Icon': 12,
+        },
+        {
+            'row_id': 4,
+            'Name@lang(en)': 'Four',
+            'Content': {'fields': {'Name': 'Other'}},
+        },
+    ]
+
+    built = Test._construct_many_from_xivapi([dict(row) for row in rows])
+    validated = [Test.model_validate(dict(row)) for row in rows]
+    assert built == validated
+    assert [model.model_fields_set for model in built] == [
+        model.model_fields_set for model in validated
+    ]
+    assert built[1].icon is None and built[1].level == 1
+    # Defaults aren't shared between instances
+    assert built[0].tags is not built[1].tags
+
+
+@pytest.mark.unit
+def test_construct_falls_back_for_unsupported_models():
+    """Test that models with extra fields allowed are still built with model_construct."""
+
+    class Test(Model):
+        model_config = {'populate_by_name': True, 'extra': 'allow'}
+        name: Annotated[str, FieldMapping('Name')]
+
+    assert Test._get_construct_plan() is None
+    model = Test._construct_from_xivapi({'row_id': 1, 'Name': 'Foo'})
+    assert model.name == 'Foo'
+    assert model.model_extra == {'row_id': 1, 'Name': 'Foo'}
+
+
+@pytest.mark.unit
+def test_rows_envelope_reads_raw_rows():
+    """Test that the rows envelope maps fields from the raw response like validation does."""
+
+    class Base(Model):
+        row_id: QueryField[int]
+        icon: QueryField[int | None] = QueryField(FieldMapping('Icon'))
+
+    class Test(Base):
+        id: Annotated[int, FieldMapping('row_id')]
+        name: Annotated[str, FieldMapping('Name')]
+        level: int = 1
+
+    body = (
+        b'{"rows": [{"row_id": 1, "fields": {"Name": "One", "Icon": 5, "level": "3"}},'
+        b' {"row_id": 2, "fields": {"Name": "Two"}}]}'
+    )
+    envelope = Test._get_rows_envelope()
+    assert envelope is not None
+    models = Test._from_validated_rows(envelope.validate_json(body)['rows'])
+
+    assert models == [
+        Test.model_validate({'row_id': 1, 'Name': 'One', 'Icon': 5, 'level': '3'}),
+        Test.model_validate({'row_id': 2, 'Name': 'Two'}),
+    ]
+    assert models[1].icon is None
+    assert Test._get_rows_envelope() is envelope
+
+
+@pytest.mark.unit
+def test_envelopes_need_plain_fields():
+    """Test that models with language or nested mappings don't get an envelope."""
+
+    class Languages(Model):
+        name: Annotated[LangDict, FieldMapping('Name', languages=['en'])]
+
+    class Nested(Model):
+        content: Annotated[str, FieldMapping('Content.Name')]
+
+    for model in (Languages, Nested):
+        assert model._get_rows_envelope() is None
+        assert model._get_search_envelope() is None
@@ -339,3 +339,77 @@ def test_queryfield_mapping_preservation():
     assert Test.name.xivapi_field == 'Name'
     assert Test.nested_field.xivapi_field == 'Content.BGM.File'
     assert Test.lang_field.xivapi_field == 'Title'
+
+
+@pytest.mark.unit
+def test_string_values_are_escaped():
+    """Test that quotes and backslashes in string values are escaped."""
+    query = QueryBuilder().where(Name='Say "hi"').contains(Path='a\\b')
+    assert query.build() == 'Name="Say \\"hi\\"" Path~"a\\\\b"'
+
+
+@pytest.mark.regression
+def test_build_sees_changes_to_nested_builders():
+    """Test that changing a builder after nesting it changes the outer query too."""
+    inner = QueryBuilder().where(A=1)
+    outer = QueryBuilder().or_any(inner)
+    assert outer.build() == '(A=1)'
+    assert outer.canonical() == '(A=1)'
+
+    inner.where(B=2)
+    assert outer.build() == '(A=1 B=2)'
+    assert outer.canonical() == '(A=1 B=2)'
+
+
+@pytest.mark.regression
+def test_build_sees_clauses_added_directly():
+    """Test that clauses appended straight to `clauses` are built."""
+    query = QueryBuilder().where(A=1)
+    assert query.build() == 'A=1'
+    first = query.compile()
+
+    query.clauses.append(Query('B', '=', 2))
+    assert query.build() == 'A=1 B=2'
+    assert query.compile() != first
+
+
+@pytest.mark.unit
+def test_compiled_query_ignores_order_and_repeats():
+    """Test that reordered or repeated clauses compile to equal, equally hashed queries."""
+    a = QueryBuilder().where(Level=50).contains(Name='Sword').required()
+    b = QueryBuilder().contains(Name='Sword').required().where(Level=50).where(Level=50)
+
+    assert a.build() != b.build()
+    assert a.compile() == b.compile()
+    assert hash(a.compile()) == hash(b.compile())
+    assert a.canonical() == '+Name~"Sword" Level=50'
+
+
+@pytest.mark.unit
+def test_compiled_query_sorts_groups():
+    """Test that group items (including nested builders) are put in canonical order."""
+    a = QueryBuilder().or_any(
+        Query('Name', '=', 'B'), QueryBuilder().where(Name='A').where(Level=1)
+    )
+    b = QueryBuilder().or_any(
+        QueryBuilder().where(Level=1), Query('Name', '=', 'A'), Query('Name', '=', 'B')
+    )
+
+    assert a.compile() == b.compile()
+    assert a.canonical() == '(Level=1 Name="A" Name="B")'
+
+
+@pytest.mark.unit
+def test_build_and_compile_follow_changes():
+    """Test that build() and compile() reflect the query as it is when called."""
+    query = QueryBuilder().where(Level=50)
+    compiled = query.compile()
+    assert query.compile() == compiled
+
+    query.required()
+    assert query.build() == '+Level=50'
+    assert query.compile() != compiled
+    assert query.canonical() == '+Level=50'
+
+    query.or_any(Query('Name', '=', 'A'))
+    assert query.build() == '+Level=50 (Name="A")'
@@ -0,0 +1,88 @@
+"""Tests related to xivapy.streaming."""
+
+import json
+
+import pytest
+
+from xivapy.streaming import JSONArrayStream
+
+
+def _feed_all(stream: JSONArrayStream, body: bytes, size: int) -> list:
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(stream.feed(body[start : start + size]))
+    items.extend(stream.close())
+    return items
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('size', [1, 2, 7, 1000])
+def test_array_stream_any_chunking(size: int):
+    """Test that items and the envelope come out the same however the body is split."""
+    document = {
+        'schema': 'exdschema@2',
+        'rows': [
+            {'row_id': 1, 'fields': {'Name': 'A "quoted" [name]', 'Level': 1234}},
+            {'row_id': 2, 'fields': {'Name': 'Ünïcödé ☃', 'Tags': [1, [2, 3]]}},
+            {'row_id': 3, 'fields': {'Name': 'back\\slash }{', 'Value': -1.5e3}},
+        ],
+        'next': 'abc',
+    }
+    stream = JSONArrayStream('rows')
+
+    items = _feed_all(stream, json.dumps(document).encode(), size)
+
+    assert items == document['rows']
+    assert stream.envelope == {'schema': 'exdschema@2', 'rows': [], 'next': 'abc'}
+    assert stream.done
+
+
+@pytest.mark.unit
+def test_array_stream_yields_items_as_they_complete():
+    """Test that an item is returned by the feed that completes it."""
+    stream = JSONArrayStream('results')
+
+    assert stream.feed(b'{"results": [{"row_id": 1}, {"row_') == [{'row_id': 1}]
+    assert stream.feed(b'id": 2') == []
+    assert stream.feed(b'}]}') == [{'row_id': 2}]
+    assert stream.close() == []
+
+
+@pytest.mark.unit
+def test_array_stream_number_at_chunk_boundary():
+    """Test that a number split across chunks isn't cut short."""
+    stream = JSONArrayStream('rows')
+
+    assert stream.feed(b'{"rows": [12') == []
+    assert stream.feed(b'34]}') == [1234]
+
+
+@pytest.mark.unit
+def test_array_stream_empty_and_missing_array():
+    """Test documents with an empty array, or without the array at all."""
+    empty = JSONArrayStream('rows')
+    assert _feed_all(empty, b'{"rows": []}', 3) == []
+    assert empty.envelope == {'rows': []}
+
+    missing = JSONArrayStream('rows')
+    assert _feed_all(missing, b'{"schema": "x"}', 3) == []
+    assert missing.envelope == {'schema': 'x'}
+
+
+@pytest.mark.unit
+def test_array_stream_incomplete_document():
+    """Test that closing a truncated document raises."""
+    stream = JSONArrayStream('rows')
+    stream.feed(b'{"rows": [{"row_id": 1}, {"row_id"')
+
+    with pytest.raises(json.JSONDecodeError):
+        stream.close()
+
+
+@pytest.mark.unit
+def test_array_stream_malformed_document():
+    """Test that structurally invalid documents raise straight away."""
+    with pytest.raises(json.JSONDecodeError):
+        JSONArrayStream('rows').feed(b'[1, 2]')
+    with pytest.raises(json.JSONDecodeError):
+        JSONArrayStream('rows').feed(b'{"rows": [1 2]}')
@@ -0,0 +1,193 @@
+"""Tests for table.py."""
+
+from array import array
+from typing import Annotated, Optional
+import sys
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from xivapy.client import Client
+from xivapy.exceptions import QueryBuildError, ModelValidationError
+from xivapy.model import FieldMapping, Model, QueryField
+from xivapy.query import Query
+from xivapy.table import SheetTable, TableRow
+from xivapy.types import LangDict
+
+
+class TabledItem(Model):
+    """Item model used by the table tests."""
+
+    row_id: int
+    name: QueryField[str] = QueryField(FieldMapping('Name'))
+    level: QueryField[int] = QueryField(FieldMapping('LevelItem'))
+    price: Annotated[float, FieldMapping('PriceMid')] = 0.0
+    unique: Annotated[bool, FieldMapping('IsUnique')] = False
+    names: Optional[LangDict] = None
+    __sheetname__ = 'Item'
+
+
+def _items() -> list[TabledItem]:
+    """Returns a few items to fill tables with."""
+    return [
+        TabledItem(row_id=1, name='Iron Sword', level=10, price=5.5, unique=True),
+        TabledItem(row_id=2, name='Steel Sword', level=30, price=12),
+        TabledItem(row_id=3, name='Bronze Shield', level=5, names={'en': 'Shield'}),
+    ]
+
+
+@pytest.mark.unit
+def test_table_typed_columns():
+    """Test that numeric fields are stored in typed arrays and text is interned."""
+    table = SheetTable(TabledItem, _items())
+    assert len(table) == 3
+    assert table.row_ids == array('q', [1, 2, 3])
+    assert table.column('level') == array('q', [10, 30, 5])
+    assert table.column('price') == array('d', [5.5, 12.0, 0.0])
+    assert table.column('unique') == array('b', [1, 0, 0])
+    assert table.column('name') == ['Iron Sword', 'Steel Sword', 'Bronze Shield']
+    assert table.column('name')[0] is sys.intern('Iron Sword')
+    assert table.column('names') == [None, None, {'en': 'Shield'}]
+    with pytest.raises(KeyError):
+        table.column('Name')
+
+
+@pytest.mark.unit
+def test_table_row_views():
+    """Test that rows read fields from the columns and build models on request."""
+    items = _items()
+    table = SheetTable(TabledItem, items)
+
+    row = table[0]
+    assert isinstance(row, TableRow)
+    assert row.row_id == 1
+    assert row.level == 10
+    assert row.unique is True
+    assert table[-1].name == 'Bronze Shield'
+    with pytest.raises(AttributeError):
+        row.Name
+    with pytest.raises(IndexError):
+        table[3]
+
+    assert [row.as_model() for row in table] == items
+    found = table.get(2)
+    assert found is not None and found.price == 12.0
+    assert table.get(99) is None
+    assert 3 in table and 99 not in table
+
+
+@pytest.mark.unit
+def test_table_unfit_values():
+    """Test that a column falls back to a list for values its array can't hold."""
+
+    class MaybeLevel(Model):
+        """Item model whose level can be missing."""
+
+        level: Optional[int] = None
+        flag: bool = False
+
+    table = SheetTable(MaybeLevel, {1: MaybeLevel(level=5, flag=True)})
+    assert isinstance(table.column('level'), array)
+    table.append(MaybeLevel(), row_id=2)
+    table.append(MaybeLevel(level=2**70), row_id=3)
+    assert table.column('level') == [5, None, 2**70]
+    assert table.column('flag') == array('b', [1, 0, 0])
+    assert table.get(1).as_model() == MaybeLevel(level=5, flag=True)
+
+    with pytest.raises(ValueError):
+        table.append(MaybeLevel())
+
+
+@pytest.mark.unit
+def test_table_filter():
+    """Test filtering with masks, queries and slices."""
+    table = SheetTable(TabledItem, _items())
+
+    by_mask = table.filter([True, False, True])
+    assert by_mask.row_ids == array('q', [1, 3])
+    assert by_mask.column('level') == array('q', [10, 5])
+    assert by_mask.get(3).name == 'Bronze Shield'
+
+    assert table.filter(TabledItem.level >= 10).row_ids == array('q', [1, 2])
+    assert table.filter(TabledItem.name.contains('SWORD')).row_ids == array('q', [1, 2])
+    assert table.filter(Query('IsUnique', '=', True)).row_ids == array('q', [1])
+    assert table.filter(Query('row_id', '>', 1)).row_ids == array('q', [2, 3])
+    assert table[1:].row_ids == array('q', [2, 3])
+
+    with pytest.raises(ValueError):
+        table.filter([True])
+    with pytest.raises(QueryBuildError):
+        table.filter(Query('Description', '~', 'sword'))
+
+
+@pytest.mark.unit
+def test_table_numpy_masks():
+    """Test that typed columns can be wrapped by NumPy, and its masks filter the table."""
+    numpy = pytest.importorskip('numpy')
+    table = SheetTable(TabledItem, _items())
+    levels = numpy.frombuffer(table.column('level'), dtype=numpy.int64)
+    assert table.filter(levels > 5).row_ids == array('q', [1, 2])
+
+
+def _sheet_callback(rows: dict[int, dict]):
+    """Build an httpx_mock callback serving rows by id or page by page."""
+
+    async def callback(request: httpx.Request) -> httpx.Response:
+        if 'rows' in request.url.params:
+            ids = [int(row) for row in request.url.params['rows'].split(',')]
+        else:
+            after = int(request.url.params.get('after', -1))
+            limit = int(request.url.params['limit'])
+            ids = sorted(row for row in rows if row > after)[:limit]
+        return httpx.Response(
+            200,
+            json={
+                'rows': [
+                    {'row_id': row, 'fields': dict(rows[row])}
+                    for row in ids
+                    if row in rows
+                ]
+            },
+        )
+
+    return callback
+
+
+ROWS = {
+    1: {'Name': 'Iron Sword', 'LevelItem': 10, 'PriceMid': 5.5, 'IsUnique': True},
+    2: {'Name': 'Steel Sword', 'LevelItem': 30, 'PriceMid': 12},
+    3: {'Name': 'Bronze Shield', 'LevelItem': '5'},
+}
+
+
+@pytest.mark.integration
+async def test_client_sheet_table(httpx_mock: HTTPXMock):
+    """Test fetching every row of a sheet into a table."""
+    httpx_mock.add_callback(_sheet_callback(ROWS), is_reusable=True)
+
+    async with Client(batch_size=2) as client:
+        table = await client.sheet_table(TabledItem)
+        # Validation coerced the string level, so it still fits the int column
+        assert table.column('level') == array('q', [10, 30, 5])
+        assert table.column('price') == array('d', [5.5, 12.0, 0.0])
+        assert table.get(1).as_model() == TabledItem(
+            row_id=1, name='Iron Sword', level=10, price=5.5, unique=True
+        )
+
+        some = await client.sheet_table(TabledItem, rows=[3, 1])
+        assert some.row_ids == array('q', [3, 1])
+
+
+@pytest.mark.integration
+async def test_client_sheet_table_validation(httpx_mock: HTTPXMock):
+    """Test that sheet_table validates rows like sheet does."""
+    rows = {1: {'Name': 'Iron Sword', 'LevelItem': 'not a level'}}
+    httpx_mock.add_callback(_sheet_callback(rows), is_reusable=True)
+
+    async with Client() as client:
+        with pytest.raises(ModelValidationError):
+            await client.sheet_table(TabledItem)
+
+        table = await client.sheet_table(TabledItem, validate='trusted')
+        assert table.column('level') == ['not a level']